@@ -0,0 +1,78 @@
+"""
+Накладні витрати auth-залежності на один запит: `JWTAuth.decode_token`
+з повною перевіркою підпису проти LRU перевірених токенів, а також
+`get_current_user` цілком (користувач уже в L1 UserCache, тож різниця —
+саме JWT).
+
+Запуск (з кореня репозиторію, з налаштованим .env):
+    python benchmarks/auth_dependency.py
+"""
+
+import asyncio
+import os
+import sys
+import time
+import uuid
+from types import SimpleNamespace
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from api.v1 import dependencies  # noqa: E402
+from core.security import JWTAuth  # noqa: E402
+from core.token_cache import VerifiedTokenCache  # noqa: E402
+from services import user_cache  # noqa: E402
+from utils.cache_manager import AbstractCache  # noqa: E402
+
+NUMBER = 20_000
+
+
+class DictCache(AbstractCache):
+    def __init__(self):
+        self.data = {}
+
+    async def set(self, token, data, exp):
+        self.data[token] = data
+        return token
+
+    async def get(self, token):
+        return self.data.get(token)
+
+    async def delete(self, token):
+        self.data.pop(token, None)
+
+
+async def per_call(fn) -> float:
+    await fn()  # прогрів
+    started = time.perf_counter()
+    for _ in range(NUMBER):
+        await fn()
+    return (time.perf_counter() - started) / NUMBER * 1e6
+
+
+async def main() -> None:
+    user = {"id": uuid.uuid4(), "email": "bench@example.com", "username": "bench"}
+    user_cache._user_cache = user_cache.UserCache(l2=DictCache(), bus=None)
+
+    async def load_user(**kwargs):
+        return dict(user)
+
+    for enabled in (False, True):
+        JWTAuth.token_cache = VerifiedTokenCache(enabled=enabled)
+        auth = JWTAuth()
+        service = SimpleNamespace(
+            security_layer=auth, user_repo=SimpleNamespace(get=load_user)
+        )
+        token = await auth.create_access_token({"id": str(user["id"])})
+
+        decode = await per_call(lambda: auth.decode_token(token))
+        dependency = await per_call(
+            lambda: dependencies.get_current_user(token, service)
+        )
+        label = "LRU" if enabled else "no cache"
+        print(
+            f"{label:<9} decode_token {decode:7.2f} µs/req   get_current_user {dependency:7.2f} µs/req"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+"""
+Час серіалізації однієї сторінки каталогу: побудова карток з ORM-об'єктів
+проти склеювання готових JSON-фрагментів з read model `product_card`.
+
+Запуск (з кореня репозиторію, з налаштованим .env):
+    python benchmarks/catalog_cards.py
+"""
+
+import json
+import os
+import sys
+import timeit
+from types import SimpleNamespace
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from services.product_card_service import ProductCardService  # noqa: E402
+
+
+def make_product(i: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        product_id=i,
+        name=f"Товар {i}",
+        price=199.99 + i,
+        small_description="Короткий опис товару " * 5,
+        product_image=f"https://cdn.example.com/products/{i}.webp",
+        category=SimpleNamespace(name="Догляд"),
+        brand=SimpleNamespace(name="Nuviora"),
+        is_certified=True,
+        in_stock=True,
+        reviews=[SimpleNamespace(rating=r % 5 + 1) for r in range(20)],
+        features=[
+            SimpleNamespace(
+                feature_id=f, feature_name=f"Ознака {f}", feature_text="Опис " * 10
+            )
+            for f in range(6)
+        ],
+        images=[
+            SimpleNamespace(
+                image_url={
+                    "small": f"s{n}.webp",
+                    "medium": f"m{n}.webp",
+                    "large": f"l{n}.webp",
+                },
+                image_description="Фото",
+                is_main=n == 0,
+                sort_order=n,
+            )
+            for n in range(4)
+        ],
+    )
+
+
+def main(per_page: int = 12, number: int = 2000) -> None:
+    products = [make_product(i) for i in range(per_page)]
+    fragments = [
+        ProductCardService.dump_card(ProductCardService.build_card(p)) for p in products
+    ]
+    meta = {
+        "page": 1,
+        "per_page": per_page,
+        "total_count": 1000,
+        "total_pages": 84,
+        "has_next": True,
+        "has_prev": False,
+    }
+
+    def before() -> str:
+        cards = [ProductCardService.build_card(p) for p in products]
+        return json.dumps({"products": cards, **meta})
+
+    def after() -> str:
+        return ProductCardService.render_page(fragments, meta)
+
+    assert json.loads(before())["products"] == json.loads(after())["products"]
+
+    for name, fn in (("build + json.dumps", before), ("splice fragments", after)):
+        per_page_us = timeit.timeit(fn, number=number) / number * 1e6
+        print(f"{name:<20} per_page={per_page:<4} {per_page_us:8.1f} us/page")
+
+
+if __name__ == "__main__":
+    for size in (12, 100):
+        main(per_page=size)
@@ -0,0 +1,126 @@
+"""
+Мікробенчмарк серіалізації відповідей product-ендпоінтів:
+`Schema.from_orm` + повторна валідація `response_model` + stdlib json
+проти скомпільованого `SchemaSerializer` (одна валідація, JSON з pydantic-core).
+
+Запуск (з кореня репозиторію, з налаштованим .env):
+    python benchmarks/fast_response.py
+"""
+
+import asyncio
+import json
+import os
+import sys
+import timeit
+from types import SimpleNamespace
+from typing import List
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+
+from schemas.product_schema import (  # noqa: E402
+    ProductComparisonSchema,
+    ProductDetailSchema,
+    ProductRecommendationSchema,
+)
+from utils.fast_response import SchemaSerializer  # noqa: E402
+
+
+def make_product(i: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        product_id=i,
+        name=f"Товар {i}",
+        description="Опис " * 50,
+        small_description="Короткий опис",
+        traits_id=None,
+        price=199.99,
+        currency="UAH",
+        availability=True,
+        in_stock=True,
+        stock_quantity=5,
+        is_certified=True,
+        certification_info=None,
+        benefits="Користь " * 10,
+        usage_instructions=None,
+        average_rating=4.5,
+        review_count=20,
+        category=None,
+        subcategory=None,
+        brand=None,
+        traits=None,
+        brand_name="Nuviora",
+        image_url=f"{i}.webp",
+        main_image_url=f"{i}.webp",
+        images=[
+            SimpleNamespace(
+                product_image_id=n,
+                image_description="Фото",
+                image_url=f"{i}-{n}.webp",
+                is_main=n == 0,
+                sort_order=n,
+            )
+            for n in range(4)
+        ],
+        features=[
+            SimpleNamespace(
+                feature_id=f,
+                feature_name=f"Ознака {f}",
+                feature_text="Опис " * 10,
+                feature_value=None,
+            )
+            for f in range(6)
+        ],
+        reviews=[
+            SimpleNamespace(
+                review_id=r,
+                rating=5,
+                review_text="Відгук " * 10,
+                reviewer_name="Анна",
+                created_at=None,
+                user_id=None,
+            )
+            for r in range(20)
+        ],
+        variations=[],
+    )
+
+
+def bench(name: str, schema, payload, many: bool, number: int = 2000) -> None:
+    field = create_model_field(
+        name="Response", type_=List[schema] if many else schema, mode="serialization"
+    )
+    serializer = SchemaSerializer(schema, many=many)
+    loop = asyncio.new_event_loop()
+
+    def before() -> bytes:
+        content = (
+            [schema.model_validate(p, from_attributes=True) for p in payload]
+            if many
+            else schema.model_validate(payload, from_attributes=True)
+        )
+        data = loop.run_until_complete(
+            serialize_response(field=field, response_content=content)
+        )
+        return json.dumps(jsonable_encoder(data), ensure_ascii=False).encode()
+
+    def after() -> bytes:
+        return serializer.dump(payload)
+
+    assert json.loads(before()) == json.loads(after())
+    for label, fn in (
+        ("from_orm + response_model", before),
+        ("SchemaSerializer", after),
+    ):
+        us = timeit.timeit(fn, number=number) / number * 1e6
+        print(f"{name:<22} {label:<26} {us:8.1f} us")
+    loop.close()
+
+
+if __name__ == "__main__":
+    products = [make_product(i) for i in range(5)]
+    bench("get_product_detail", ProductDetailSchema, products[0], many=False)
+    bench("compare_products", ProductComparisonSchema, products, many=True)
+    bench("get_recommended", ProductRecommendationSchema, products, many=True)
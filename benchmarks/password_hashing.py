@@ -0,0 +1,93 @@
+"""
+Латентність «сторонніх» запитів під час сплеску логінів: bcrypt прямо
+в `async def` (як було) проти PasswordHasher у пулі потоків.
+Під час сплеску з `LOGINS` паралельних логінів /ping запитується кожні
+10 мс; друкуються p50/p99/max латентності /ping і час самого сплеску.
+
+Запуск (з кореня репозиторію, з налаштованим .env):
+    python benchmarks/password_hashing.py
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+from passlib.context import CryptContext  # noqa: E402
+
+from core.password_hasher import PasswordHasher  # noqa: E402
+
+LOGINS = 20
+PASSWORD = "correct horse battery staple"
+
+inline_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+HASHED = inline_context.hash(PASSWORD)
+
+
+def make_app(verify) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/login")
+    async def login() -> dict:
+        return {"ok": await verify(PASSWORD, HASHED)}
+
+    @app.get("/ping")
+    async def ping() -> dict:
+        return {}
+
+    return app
+
+
+async def run(name: str, verify) -> None:
+    transport = httpx.ASGITransport(app=make_app(verify))
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        latencies = []
+        done = asyncio.Event()
+
+        async def poll():
+            # латентність рахуємо від запланованого моменту запиту, тож
+            # заблокований event loop теж потрапляє у вимір
+            due = time.perf_counter()
+            while not done.is_set():
+                await asyncio.sleep(max(0.0, due - time.perf_counter()))
+                await client.get("/ping")
+                finished = time.perf_counter()
+                latencies.append((finished - due) * 1000)
+                due = max(due + 0.01, finished)
+
+        poller = asyncio.create_task(poll())
+        started = time.perf_counter()
+        await asyncio.gather(*(client.post("/login") for _ in range(LOGINS)))
+        burst = time.perf_counter() - started
+        done.set()
+        await poller
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(
+        f"{name:<24} burst {burst:6.2f}s  /ping n={len(latencies):<4} "
+        f"p50 {statistics.median(latencies):8.1f}ms  p99 {p99:8.1f}ms  max {latencies[-1]:8.1f}ms"
+    )
+
+
+async def main() -> None:
+    async def inline_verify(password, hashed):
+        return inline_context.verify(password, hashed)
+
+    await run("inline (event loop)", inline_verify)
+    for workers in (1, 2, 4):
+        hasher = PasswordHasher(workers=workers, queue_limit=LOGINS, mode="thread")
+        await run(f"thread pool, {workers} workers", hasher.verify)
+        print(f"{'':<24} {hasher.stats()}")
+        hasher.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,87 @@
+"""
+Конкурентні перевірки кодів підтвердження (GET code -> data) у Redis:
+як раніше — синхронний клієнт, новий на кожен запит, всередині async def
+(блокує event loop) — проти спільного пулу redis.asyncio.
+
+Запуск (з кореня репозиторію, з налаштованим .env і доступним Redis):
+    python benchmarks/redis_client.py [requests] [concurrency]
+"""
+
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from redis import Redis  # noqa: E402
+
+from config import config_setting  # noqa: E402
+from utils.cache_manager import RedisManager, close_redis  # noqa: E402
+
+KEYS = 100
+
+
+def sync_client() -> Redis:
+    return Redis(
+        host=config_setting.REDIS_HOST,
+        port=config_setting.REDIS_PORT,
+        password=config_setting.REDIS_PASSWORD,
+        decode_responses=True,
+    )
+
+
+async def old_lookup(code: str) -> dict:
+    # так працював RedisManager до переходу на redis.asyncio
+    data = sync_client().get(code)
+    return json.loads(data) if data else None
+
+
+async def new_lookup(code: str) -> dict:
+    return await RedisManager().get(token=code)
+
+
+async def run(lookup, total: int, concurrency: int) -> tuple[float, list[float]]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one(i: int) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            assert await lookup(f"bench:code:{i % KEYS}")
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(total)))
+    return time.perf_counter() - start, latencies
+
+
+async def main() -> None:
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    client = sync_client()
+    for i in range(KEYS):
+        client.set(f"bench:code:{i}", json.dumps({"id": str(i), "count": 0}), ex=300)
+
+    print(f"{total} lookups, concurrency {concurrency}")
+    for name, lookup in [
+        ("sync per request", old_lookup),
+        ("async shared pool", new_lookup),
+    ]:
+        elapsed, latencies = await run(lookup, total, concurrency)
+        latencies.sort()
+        print(
+            f"{name:<18} {total / elapsed:>8.0f} ops/s  "
+            f"p50 {statistics.median(latencies) * 1000:>6.2f} ms  "
+            f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:>6.2f} ms"
+        )
+
+    client.delete(*[f"bench:code:{i}" for i in range(KEYS)])
+    await close_redis()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+"""
+Конвертація 100k ORM-рядків у dict: рукописний `async def to_dict()`
+(корутина на кожен рядок) проти скомпільованого row mapper-а.
+
+Запуск (з кореня репозиторію, з налаштованим .env):
+    python benchmarks/row_mapper.py
+"""
+
+import asyncio
+import gc
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+
+sys.path.append(os.path.join(os.path.dirname(__file__), "..", "src"))
+
+from models.user_model import UserModel  # noqa: E402
+from utils.row_mapper import get_mapper  # noqa: E402
+
+
+ROWS = 100_000
+
+
+async def legacy_to_dict(self) -> dict:
+    # колишній UserModel.to_dict
+    return {
+        "id": self.id,
+        "username": self.username,
+        "email": self.email,
+        "first_name": self.first_name,
+        "last_name": self.last_name,
+        "about": self.about,
+        "avatar": self.avatar,
+        "phone": self.phone,
+        "birth_date": self.birth_date,
+        "created_at": self.created_at,
+        "update_at": self.updated_at,
+        "is_activate": self.is_activate,
+        "is_locked": self.is_locked,
+        "hash_password": self.hash_password,
+    }
+
+
+async def before(rows) -> list[dict]:
+    return [await legacy_to_dict(row) for row in rows]
+
+
+def after(rows) -> list[dict]:
+    to_dict = get_mapper(UserModel)
+    return [to_dict(row) for row in rows]
+
+
+def main() -> None:
+    now = datetime.now()
+    rows = [
+        UserModel(
+            id=uuid.uuid4(),
+            username=f"user{i}",
+            email=f"user{i}@example.com",
+            first_name="Ім'я",
+            last_name="Прізвище",
+            about=None,
+            avatar=None,
+            phone=None,
+            birth_date=now,
+            created_at=now,
+            updated_at=now,
+            is_activate=True,
+            is_locked=False,
+            role_id=2,
+            auth_type="local",
+            hash_password="x" * 60,
+        )
+        for i in range(ROWS)
+    ]
+
+    gc.collect()
+    start = time.perf_counter()
+    asyncio.run(before(rows))
+    legacy = time.perf_counter() - start
+
+    gc.collect()
+    start = time.perf_counter()
+    after(rows)
+    compiled = time.perf_counter() - start
+
+    print(f"async to_dict()   {ROWS} rows: {legacy * 1000:8.1f} ms")
+    print(f"compiled mapper   {ROWS} rows: {compiled * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Час холодного старту: від запуску процесу до завершення `import main`
+і до першої успішної відповіді uvicorn, для кожного DB_STARTUP_MODE.
+
+Запуск (з кореня репозиторію, з налаштованим .env і доступною БД):
+    python benchmarks/startup_time.py [create_all verify skip]
+"""
+
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+RUNS = 5
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def import_time(env: dict) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import main"], cwd=SRC, env=env, check=True)
+    return time.perf_counter() - start
+
+
+def first_request_time(env: dict, timeout: float = 60.0) -> float:
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/openapi.json"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "main:app",
+            "--port",
+            str(port),
+            "--log-level",
+            "warning",
+        ],
+        cwd=SRC,
+        env=env,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError(f"uvicorn exited with code {proc.returncode}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError(url)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main() -> None:
+    modes = sys.argv[1:] or ["create_all", "verify", "skip"]
+    print(f"{'mode':<12}{'import, ms':>14}{'first request, ms':>20}")
+    for mode in modes:
+        env = {**os.environ, "DB_STARTUP_MODE": mode}
+        imports = [import_time(env) for _ in range(RUNS)]
+        requests = [first_request_time(env) for _ in range(RUNS)]
+        print(
+            f"{mode:<12}{statistics.median(imports) * 1000:>14.0f}"
+            f"{statistics.median(requests) * 1000:>20.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -6,11 +6,16 @@ from services.auth_service import AuthService
 from services.user_service import UserService
 from repositories.user_repo import UserRepository, TokenRepository
 from core.security import JWTAuth
+from core.token_revocation import token_revocations
 from utils.cache_manager import RedisManager
 from utils.template_render import get_template
 
 from utils.email_manager import MetaUaSender
 from services.load_service import LoadService
+from services.image_pipeline import ImagePipeline
+from services.s3_avatar_uploader import S3AvatarUploader
+from services.user_cache import get_user_cache
+from services.session_store import get_session_store
 
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
@@ -26,6 +31,9 @@ async def auth_dep() -> AuthService:
             security_layer=JWTAuth,
             error_handler=HTTPException,
             template_handler=get_template,
+            user_cache=get_user_cache(),
+            token_revocations=token_revocations,
+            session_store=get_session_store(),
         )
         # print("✅ auth_dep: успішно створено")
         return service
@@ -53,6 +61,9 @@ async def user_dep() -> UserService:
         user_repo=UserRepository(),
         error_handler=HTTPException,
         token_repo=TokenRepository(),
+        user_cache=get_user_cache(),
+        token_revocations=token_revocations,
+        session_store=get_session_store(),
     )
 
 
@@ -60,21 +71,51 @@ async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
     service=Depends(auth_dep),
 ):
+    """
+    Для claims-токена (AUTH_TOKEN_MODE="claims") користувач береться з самого
+    токена без запиту до БД; відкликання вже перевірено в decode_token.
+    Ендпоінтам, яким потрібен повний профіль, — get_current_user_profile.
+    """
     try:
         payload = await service.security_layer.decode_token(token=token)
         if not payload:
             raise HTTPException(status_code=401, detail="Несанкціонований доступ")
 
-        user_id = payload.get("id")
+        user = service.security_layer.user_from_claims(payload)
+        if user is not None:
+            return user
+        return await _load_user(service, payload.get("id"))
+    except ValueError:
+        raise HTTPException(status_code=401, detail="Несанкціонований доступ")
 
-        user = await service.user_repo.get(id=user_id)
-        if user is None or user is False:
-            raise HTTPException(status_code=404, detail="Користувача не знайдено")
-        return user
+
+async def get_current_user_profile(
+    token: Annotated[str, Depends(oauth2_scheme)],
+    service=Depends(auth_dep),
+):
+    try:
+        payload = await service.security_layer.decode_token(token=token)
+        if not payload:
+            raise HTTPException(status_code=401, detail="Несанкціонований доступ")
+        return await _load_user(service, payload.get("id"))
     except ValueError:
         raise HTTPException(status_code=401, detail="Несанкціонований доступ")
 
+
+async def _load_user(service, user_id) -> dict:
+    user = await get_user_cache().get_or_load(
+        user_id, lambda: service.user_repo.get(id=user_id)
+    )
+    if user is None or user is False:
+        raise HTTPException(status_code=404, detail="Користувача не знайдено")
+    return user
+
+
 async def get_load_service() -> LoadService:
     return LoadService()
 
 
+async def get_image_pipeline() -> ImagePipeline:
+    return ImagePipeline(storage=S3AvatarUploader())
+
+
@@ -11,11 +11,13 @@ from schemas.auth_schema import (
     ChangePassword,
 )
 from services.auth_service import AuthService
-from api.v1.dependencies import auth_dep
+from api.v1.dependencies import auth_dep, get_current_user
 from config import config_setting
+from utils.db_budget import budgeted_route
+from utils.rate_limiter import rate_limit
 
 
-router = APIRouter(prefix="/auth", tags=["Auth"])
+router = APIRouter(prefix="/auth", tags=["Auth"], route_class=budgeted_route("auth"))
 
 auth_depends = Annotated[AuthService, Depends(auth_dep)]
 
@@ -28,8 +30,10 @@ auth_depends = Annotated[AuthService, Depends(auth_dep)]
         400: {"description": "Паролі не збігаються"},
         405: {"description": "Метод заборонено"},
         409: {"description": "Електронна пошта вже існує"},
+        429: {"description": "Забагато запитів"},
         500: {"description": "Упс! Щось пішло не так. Спробуйте пізніше"},
     },
+    dependencies=[Depends(rate_limit("register"))],
 )
 async def register(service: auth_depends, data: RegisterSchema) -> dict:
     data = data.model_dump()
@@ -74,8 +78,10 @@ async def verify_email(
     responses={
         400: {"description": "Недійсне ім'я користувача або пароль"},
         405: {"description": "Метод заборонено"},
+        429: {"description": "Забагато запитів"},
         500: {"description": "Упс! Щось пішло не так. Спробуйте пізніше"},
     },
+    dependencies=[Depends(rate_limit("login"))],
 )
 async def login(
     service: auth_depends, data: LoginSchema, request: Request, response: Response
@@ -108,6 +114,7 @@ async def login(
         429: {"description": "Забагато запитів"},
         500: {"description": "Упс! Щось пішло не так. Спробуйте пізніше"},
     },
+    dependencies=[Depends(rate_limit("resend_email"))],
 )
 async def resend_email(user_id: uuid.UUID, service: auth_depends):
     service_action = await service.resend_email(user_id=user_id)
@@ -223,8 +230,10 @@ async def refresh_access(
     responses={
         404: {"description": "Користувача не знайдено"},
         405: {"description": "Метод заборонено"},
+        429: {"description": "Забагато запитів"},
         500: {"description": "Упс! Щось пішло не так. Спробуйте пізніше"},
     },
+    dependencies=[Depends(rate_limit("forgot_password"))],
 )
 async def forgot_password(data: ChechEmailSchema, service: auth_depends) -> dict:
     data = data.model_dump()
@@ -272,7 +281,10 @@ async def change_password(
         max_age=7*24*60*60,
         domain="nuviora.click"
     )
-    return service_action
+    return {
+        "message": service_action.get("message"),
+        "access_token": service_action.get("access_token"),
+    }
 
 
 @router.get(
@@ -285,7 +297,34 @@ async def change_password(
 )
 async def logout(request: Request, response: Response, service: auth_depends):
     refresh_token = request.cookies.get("refresh_token")
-    service_action = await service.logout_handler(refresh_token=refresh_token)
+    # access token необов'язковий: якщо переданий, відкликаємо і його
+    authorization = request.headers.get("Authorization", "")
+    access_token = authorization.removeprefix("Bearer ").strip() or None
+    service_action = await service.logout_handler(
+        refresh_token=refresh_token, access_token=access_token
+    )
+    response.delete_cookie(
+        key="refresh_token",
+        path="/",
+        domain="nuviora.click",
+        samesite="none",
+        secure=True
+    )
+    return service_action
+
+
+@router.post(
+    "/logout_all",
+    status_code=status.HTTP_200_OK,
+    responses={
+        401: {"description": "Несанкціонований доступ"},
+        405: {"description": "Метод заборонено"},
+        500: {"description": "Упс! Щось пішло не так. Спробуйте пізніше"},
+    },
+)
+async def logout_all(response: Response, service: auth_depends, user=Depends(get_current_user)):
+    # завершує всі refresh-сесії користувача на всіх пристроях
+    service_action = await service.logout_all_handler(user_id=user.get("id"))
     response.delete_cookie(
         key="refresh_token",
         path="/",
@@ -1,8 +1,13 @@
 from typing import Annotated
 
 from fastapi.routing import APIRouter
-from fastapi import status, Depends
+from fastapi import status, Depends, Request, Response
 
+from database import engine
+from utils.db_pool import pool_status
+from services.user_cache import get_user_cache
+from core.password_hasher import password_hasher
+from core.token_cache import verified_tokens
 from schemas.user_schema import (
     UserBaseSchema,
 )
@@ -20,8 +25,41 @@ current_user = Annotated[
 ]
 
 
+@router.get("/ready", status_code=status.HTTP_200_OK)
+async def ready(request: Request, response: Response) -> dict:
+    # readiness для балансувальника: true лише після прогріву і до початку зупинки
+    is_ready = getattr(request.app.state, "ready", False)
+    if not is_ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {"ready": is_ready}
+
+
 @router.get("/", status_code=status.HTTP_200_OK)
 async def health(
     user: current_user,
 ) -> str:
     return "OK"
+
+
+@router.get("/pool", status_code=status.HTTP_200_OK)
+async def pool(
+    user: current_user,
+) -> dict:
+    return pool_status(engine)
+
+
+@router.get("/cache", status_code=status.HTTP_200_OK)
+async def cache(
+    user: current_user,
+) -> dict:
+    return {
+        "user_cache": get_user_cache().stats(),
+        "jwt_cache": verified_tokens.stats(),
+    }
+
+
+@router.get("/password_hasher", status_code=status.HTTP_200_OK)
+async def password_hasher_stats(
+    user: current_user,
+) -> dict:
+    return password_hasher.stats()
@@ -1,15 +1,28 @@
 from __future__ import annotations
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Query, HTTPException, status
+from fastapi import APIRouter, Depends, Query, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 from sqlalchemy import select, func, and_, or_
 
-from database import get_db
+from database import get_db, get_read_db
+from api.v1.dependencies import get_image_pipeline
 from schemas.product_schema import *
 from models.product_model import *
+from services.product_card_service import ProductCardService
+from services.dimension_cache import dimension_cache
+from services.image_pipeline import ImagePipeline, pick_variant
+from utils.fast_response import SchemaSerializer
+from utils.db_budget import budgeted_route, db_budget
 
-router = APIRouter(prefix="/product", tags=["Product"])
+router = APIRouter(prefix="/product", tags=["Product"], route_class=budgeted_route("catalog"))
+
+product_detail_serializer = SchemaSerializer(ProductDetailSchema)
+product_detail_list_serializer = SchemaSerializer(ProductDetailSchema, many=True)
+product_suggestion_serializer = SchemaSerializer(ProductSearchSuggestionSchema, many=True)
+product_comparison_serializer = SchemaSerializer(ProductComparisonSchema, many=True)
+product_recommendation_serializer = SchemaSerializer(ProductRecommendationSchema, many=True)
+variation_price_serializer = SchemaSerializer(ProductVariationPriceSchema, many=True)
 
 
 @router.post("/import", response_model=List[ProductDetailSchema],
@@ -18,12 +31,25 @@ router = APIRouter(prefix="/product", tags=["Product"])
         400: {"description": "Невірні дані"},
         500: {"description": "Упс! Щось пішло не так. Спробуйте пізніше"},
 })
+@db_budget(None)
 async def import_products(
     products_data: List[ProductImportSchema],
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db),
+    image_pipeline: ImagePipeline = Depends(get_image_pipeline),
 ):
     try:
         imported_products = []
+
+        image_ids = [i.product_image_id for p in products_data for i in p.images]
+        existing_images = set((await db.execute(
+            select(ProductImage.product_image_id).where(ProductImage.product_image_id.in_(image_ids))
+        )).scalars().all())
+        image_variants = await image_pipeline.process_many({
+            i.product_image_id: i.image_url
+            for p in products_data for i in p.images
+            if i.product_image_id not in existing_images and isinstance(i.image_url, str)
+        })
+
         for product_data in products_data:
             category_result = await db.execute(
                 select(Category).where(Category.category_id == product_data.category.category_id)
@@ -84,6 +110,13 @@ async def import_products(
                 product.subcategory_id = subcategory.subcategory_id
                 product.brand_id = brand.brand_id
             else:
+                # у рядку товару — URL обробленої мініатюри, а не оригіналу
+                main_image_url = None
+                if product_data.images:
+                    first = product_data.images[0]
+                    main_image_url = pick_variant(
+                        image_variants.get(first.product_image_id, first.image_url), "thumb"
+                    )
                 product = Product(
                     product_id=product_data.product_id,
                     name=product_data.name,
@@ -101,35 +134,33 @@ async def import_products(
                     category_id=category.category_id,
                     subcategory_id=subcategory.subcategory_id,
                     brand_id=brand.brand_id,
-                    product_image=product_data.images[0].image_url if product_data.images else None
+                    product_image=main_image_url
                 )
                 db.add(product)
                 await db.flush()
             
             for image_data in product_data.images:
-                image_result = await db.execute(
-                    select(ProductImage).where(ProductImage.product_image_id == image_data.product_image_id)
+                if image_data.product_image_id in existing_images:
+                    continue
+                image = ProductImage(
+                    product_image_id=image_data.product_image_id,
+                    product_id=product.product_id,
+                    image_description=image_data.image_description,
+                    image_url=image_variants.get(image_data.product_image_id, image_data.image_url),
+                    is_main=image_data.is_main,
+                    sort_order=image_data.sort_order
                 )
-                image = image_result.scalar_one_or_none()
-                if not image:
-                    image = ProductImage(
-                        product_image=image_data.product_image_id,
-                        product_id=product.product_id,
-                        image_description=image_data.image_description,
-                        image_url={
-                            "small": image_data.image_url,
-                            "medium": image_data.image_url,
-                            "large": image_data.image_url
-                        },
-                        is_main=image_data.is_main,
-                        sort_order=image_data.sort_order
-                    )
-                    db.add(image)
-                    await db.flush()
+                db.add(image)
+                await db.flush()
 
             imported_products.append(product)
 
         await db.commit()
+        # товари збережено — завантажені варіанти тепер на них посилаються
+        image_pipeline.keep_uploads()
+
+        await ProductCardService(db).rebuild(p.product_id for p in imported_products)
+        await db.commit()
 
         result = await db.execute(
             select(Product).options(
@@ -143,14 +174,16 @@ async def import_products(
             ).where(Product.product_id.in_([p.product_id for p in imported_products]))
         )
         products = result.scalars().all()
-        return [ProductDetailSchema.from_orm(p) for p in products]
+        return product_detail_list_serializer.response(products)
     
     except ValueError as e:
         await db.rollback()
+        await image_pipeline.discard_uploads()
         raise HTTPException(400, detail=f"Некоректні дані: {str(e)}")
     
     except Exception as e:
         await db.rollback()
+        await image_pipeline.discard_uploads()
         raise HTTPException(500, detail="Упс! Щось пішло не так. Спробуйте пізніше")
 
 
@@ -253,16 +286,17 @@ async def get_product_catalog(
     is_certified: Optional[bool] = None,
     in_stock: Optional[bool] = None,
     search: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db),
+    write_db: AsyncSession = Depends(get_db),
 ):
     try:
         filters = []
 
         if category:
-            filters.append(Product.category.has(name=category))
+            filters.append(Product.category_id.in_(await dimension_cache.category_ids(db, category)))
 
         if brand:
-            filters.append(Product.brand.has(name=brand))
+            filters.append(Product.brand_id.in_(await dimension_cache.brand_ids(db, brand)))
 
         if min_price is not None:
             filters.append(Product.price >= min_price)
@@ -282,14 +316,6 @@ async def get_product_catalog(
                 Product.small_description.ilike(f"%{search}%")
             ))
 
-        query = select(Product).options(
-            joinedload(Product.reviews),
-            joinedload(Product.features),
-            joinedload(Product.images)
-        )
-        if filters:
-            query = query.where(and_(*filters))
-
         count_query = select(func.count(Product.product_id))
         if filters:
             count_query = count_query.where(and_(*filters))
@@ -304,54 +330,25 @@ async def get_product_catalog(
             )
 
         offset = (page - 1) * per_page
-        query = query.offset(offset).limit(per_page)
+        ids_query = select(Product.product_id)
+        if filters:
+            ids_query = ids_query.where(and_(*filters))
+        ids_query = ids_query.order_by(Product.product_id).offset(offset).limit(per_page)
 
-        result = await db.execute(query)
-        products = result.scalars().all()
+        result = await db.execute(ids_query)
+        product_ids = list(result.scalars().all())
 
-        product_cards = []
-        for p in products:
-            avg_rating = round(sum(r.rating for r in p.reviews) / len(p.reviews), 1) if p.reviews else 0.0
-            product_cards.append({
-                "product_id": p.product_id,
-                "name": p.name,
-                "price": float(p.price),
-                "currency": "UAH",
-                "average_rating": avg_rating,
-                "small_description": p.small_description,
-                "main_image_url": p.main_image_url,
-                "category_name": p.category,
-                "brand_name": p.brand,
-                "is_certified": p.is_certified,
-                "in_stock": p.in_stock,
-
-            "features": [
-                {
-                    "feature_id": f.feature_id,
-                    "feature_name": f.feature_name,
-                    "feature_text": f.feature_text,
-                }
-                for f in p.features
-            ],
-
-            "images": [
-                {
-                    "image_url": i.image_url,
-                    "image_description": i.image_description,
-                }
-                for i in p.images
-            ]
-            })
+        cards = await ProductCardService(write_db, read_session=db).get_cards(product_ids)
 
-        return {
-            "products": product_cards,
+        content = ProductCardService.render_page(cards, {
             "page": page,
             "per_page": per_page,
             "total_count": total_count,
             "total_pages": (total_count + per_page - 1) // per_page,
             "has_next": page * per_page < total_count,
             "has_prev": page > 1
-        }
+        })
+        return Response(content=content, media_type="application/json")
     
     except HTTPException:
         raise
@@ -374,26 +371,33 @@ async def get_product_catalog(
 async def get_search_suggestions(
     query: str = Query(..., min_length=2, description="Пошукова фраза"),
     limit: int = Query(10, ge=1, le=20, description="Максимальна кількість результатів"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     try:
-        stmt = select(Product).where(
-            or_(
-                Product.name.ilike(f"%{query}%"),
-                Product.description.ilike(f"%{query}%")
+        # назви категорії та бренду беремо join-ом в тому ж запиті,
+        # а не лінивим p.category / p.brand на кожен товар (N+1)
+        stmt = (
+            select(
+                Product.product_id,
+                Product.name,
+                Category.name.label("category_name"),
+                Brand.name.label("brand_name"),
             )
-        ).limit(limit)
+            .outerjoin(Category, Product.category_id == Category.category_id)
+            .outerjoin(Brand, Product.brand_id == Brand.brand_id)
+            .where(
+                or_(
+                    Product.name.ilike(f"%{query}%"),
+                    Product.description.ilike(f"%{query}%")
+                )
+            )
+            .limit(limit)
+        )
         result = await db.execute(stmt)
-        products = result.scalars().all()
 
-        return[
-            ProductSearchSuggestionSchema(
-                product_id=p.product_id,
-                name=p.name,
-                category_name=p.category,
-                brand_name=p.brand
-            ) for p in products
-        ]
+        return product_suggestion_serializer.response(
+            [dict(row) for row in result.mappings().all()]
+        )
     
     except Exception:
         raise HTTPException(500, detail="Упс! Щось пішло не так. Спробуйте пізніше")
@@ -409,7 +413,7 @@ async def get_search_suggestions(
              )
 async def compare_products(
     product_id: list[int],
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     try:
         if len(product_id) < 2:
@@ -425,7 +429,7 @@ async def compare_products(
         if len(products) != len(product_id):
             raise HTTPException(404, "Деякі товари не знайдено")
 
-        return [ProductComparisonSchema.from_orm(p) for p in products]
+        return product_comparison_serializer.response(products)
     
     except Exception:
         raise
@@ -473,7 +477,7 @@ async def subscribe(
                 500: {"description": "Упс! Щось пішло не так. Спробуйте пізніше"},
 }
 )
-async def get_product_detail(product_id: int, db: AsyncSession = Depends(get_db)):
+async def get_product_detail(product_id: int, db: AsyncSession = Depends(get_read_db)):
     try:
         stmt = select(Product).options(
             joinedload(Product.images),
@@ -488,7 +492,7 @@ async def get_product_detail(product_id: int, db: AsyncSession = Depends(get_db)
         if not product:
             raise HTTPException(404, detail="Товар не знайдено")
 
-        return ProductDetailSchema.from_orm(product)
+        return product_detail_serializer.response(product)
     
     except Exception:
         raise
@@ -503,7 +507,7 @@ async def get_product_detail(product_id: int, db: AsyncSession = Depends(get_db)
                 404: {"description": "Товар не знайдено"},
                 500: {"description": "Упс! Щось пішло не так. Спробуйте пізніше"},
 })
-async def get_recommended(product_id: int, db: AsyncSession = Depends(get_db)):
+async def get_recommended(product_id: int, db: AsyncSession = Depends(get_read_db)):
     try:
         product = await db.get(Product, product_id)
         if not product:
@@ -511,7 +515,7 @@ async def get_recommended(product_id: int, db: AsyncSession = Depends(get_db)):
         
         stmt = select(Product).where(Product.product_id != product_id).limit(5)
         result = await db.execute(stmt)
-        return [ProductRecommendationSchema.from_orm(p) for p in result.scalars().all()]
+        return product_recommendation_serializer.response(result.scalars().all())
     
     except Exception:
         raise
@@ -530,7 +534,7 @@ async def get_price_with_variations(
     product_id: int, 
     variation_type: Optional[str] = None,
     variation_value: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)):
+    db: AsyncSession = Depends(get_read_db)):
     try:
         stmt = select(ProductVariation).where(ProductVariation.product_id == product_id)
 
@@ -545,7 +549,7 @@ async def get_price_with_variations(
         if not variation:
             raise HTTPException(404, detail="Варіацію не знайдено")
     
-        return [ProductVariationPriceSchema.from_orm(v) for v in variation]
+        return variation_price_serializer.response(variation)
     
     except Exception:
         raise
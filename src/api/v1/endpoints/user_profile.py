@@ -4,7 +4,7 @@ from fastapi import status, Depends, Request, Response, HTTPException
 from repositories.user_repo import UserRepository
 from services.user_service import UserService
 from schemas.user_schema import UserBaseSchema, UserUpdateSchema
-from api.v1.dependencies import get_current_user, user_dep
+from api.v1.dependencies import get_current_user, get_current_user_profile, user_dep
 
 
 router = APIRouter(prefix="/profile", tags=["User Profile"])
@@ -12,6 +12,8 @@ router = APIRouter(prefix="/profile", tags=["User Profile"])
 
 user_service_dep = Annotated[UserService, Depends(user_dep)]
 user_base_schema_dep = Annotated[UserBaseSchema, Depends(get_current_user)]
+# повний рядок користувача — claims-токен несе лише частину полів профілю
+user_profile_dep = Annotated[UserBaseSchema, Depends(get_current_user_profile)]
 
 
 @router.get(
@@ -22,7 +24,7 @@ user_base_schema_dep = Annotated[UserBaseSchema, Depends(get_current_user)]
         500: {"description": "Internal Server Error"},
     },
 )
-async def profile(user: user_base_schema_dep) -> UserBaseSchema:
+async def profile(user: user_profile_dep) -> UserBaseSchema:
     return user
 
 
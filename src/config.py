@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Dict, List, Literal, Optional
 
 from pydantic import (
     Field,
@@ -36,9 +36,95 @@ class ConfigSettings(BaseSettings):
             )
         return self
 
+    # create_all — як раніше створювати таблиці на старті;
+    # verify — лише перевірити, що БД на alembic head і має всі таблиці моделей;
+    # skip — нічого не робити
+    DB_STARTUP_MODE: Literal["create_all", "verify", "skip"] = Field(default="create_all")
+    # дерево міграцій, яке застосовує `alembic upgrade head` з кореня репозиторію
+    # (alembic.ini -> migrations/); src/migrations — порожня заготовка
+    ALEMBIC_SCRIPT_LOCATION: str = Field(
+        default=os.path.join(
+            os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations"
+        )
+    )
+
+    DB_REPLICA_URI: Optional[str] = Field(default=None)
+    DB_STICKY_PRIMARY_SECONDS: float = Field(default=5.0)
+
+    DB_POOL_SIZE: int = Field(default=10)
+    DB_MAX_OVERFLOW: int = Field(default=20)
+    DB_POOL_TIMEOUT: float = Field(default=10.0)
+    DB_POOL_RECYCLE: int = Field(default=1800)
+    DB_POOL_PRE_PING: bool = Field(default=True)
+    DB_WARMUP_CONNECTIONS: int = Field(default=2)
+    DB_STATEMENT_CACHE_SIZE: int = Field(default=256)
+    DB_STATEMENT_TIMEOUT_MS: Optional[int] = Field(default=None)
+    DB_SERVER_SETTINGS: Dict[str, str] = Field(default_factory=dict)
+
+    # бюджети БД за класом маршруту (db_budget / budgeted_route):
+    # statement_timeout на транзакцію, загальний дедлайн запиту, ліміт паралельних запитів
+    DB_STATEMENT_TIMEOUTS_MS: Dict[str, int] = Field(
+        default_factory=lambda: {"catalog": 2000, "auth": 2000}
+    )
+    DB_ROUTE_DEADLINES_MS: Dict[str, int] = Field(default_factory=lambda: {"catalog": 5000})
+    DB_ROUTE_CONCURRENCY: Dict[str, int] = Field(default_factory=lambda: {"catalog": 12})
+    DB_BUDGET_RETRY_AFTER: int = Field(default=2)
+
+    # лічильник запитів, Server-Timing і попередження про N+1 — для розробки (docker-compose, dev)
+    QUERY_STATS_ENABLED: bool = Field(default=False)
+    QUERY_REPEAT_WARN_THRESHOLD: int = Field(default=10)
+
     REDIS_HOST: str
     REDIS_PORT: int
     REDIS_PASSWORD: str
+    REDIS_MAX_CONNECTIONS: int = Field(default=50)
+    # скільки секунд чекати вільного з'єднання, коли всі REDIS_MAX_CONNECTIONS зайняті
+    REDIS_POOL_TIMEOUT: float = Field(default=2.0)
+    REDIS_SOCKET_TIMEOUT: float = Field(default=2.0)
+    REDIS_CONNECT_TIMEOUT: float = Field(default=2.0)
+    REDIS_HEALTH_CHECK_INTERVAL: int = Field(default=30)
+
+    # кодек значень у Redis за префіксом ключа (msgpack | orjson), решта — CACHE_DEFAULT_CODEC
+    CACHE_CODECS: Dict[str, str] = Field(
+        default_factory=lambda: {"user:": "msgpack", "catalog:": "msgpack", "product:": "msgpack"}
+    )
+    CACHE_DEFAULT_CODEC: str = Field(default="msgpack")
+    CACHE_COMPRESSION: Optional[str] = Field(default=None)  # zstd | lz4, якщо встановлені
+    CACHE_COMPRESS_MIN_BYTES: int = Field(default=1024)
+
+    CACHE_L1_TTL: float = Field(default=30.0)
+    CACHE_L1_MAXSIZE: int = Field(default=4096)
+    CACHE_INVALIDATION_CHANNEL: str = Field(default="cache:invalidate")
+
+    RATE_LIMIT_ENABLED: bool = Field(default=True)
+    # скільки секунд після збою Redis рахувати ліміти лише в пам'яті воркера
+    RATE_LIMIT_BREAKER_SECONDS: float = Field(default=10.0)
+    # адреси/мережі проксі (nginx, fly.io), яким довіряємо X-Forwarded-For / X-Real-IP;
+    # для решти клієнтів ліміт рахується за адресою TCP-з'єднання
+    TRUSTED_PROXIES: List[str] = Field(
+        default_factory=lambda: [
+            "127.0.0.0/8",
+            "::1/128",
+            "10.0.0.0/8",
+            "172.16.0.0/12",
+            "192.168.0.0/16",
+            "fc00::/7",
+        ]
+    )
+    # політика -> "запитів/секунд"
+    RATE_LIMITS: Dict[str, str] = Field(
+        default_factory=lambda: {
+            "login": "10/60",
+            "register": "5/300",
+            "resend_email": "3/300",
+            "forgot_password": "3/300",
+        }
+    )
+
+    USER_CACHE_ENABLED: bool = Field(default=True)
+    USER_CACHE_TTL: int = Field(default=300)
+    USER_CACHE_LOCAL_TTL: float = Field(default=10.0)
+    USER_CACHE_LOCAL_MAXSIZE: int = Field(default=1024)
 
     SECRET_KEY: str
     ALGORITHM: str
@@ -53,6 +139,51 @@ class ConfigSettings(BaseSettings):
     ACCESS_KEY: str
     SECRET_ACCESS_KEY: str
 
+    IMAGE_PIPELINE_WORKERS: int = Field(default=2)
+    # скільки зображень імпорту завантажується/обробляється одночасно
+    IMAGE_PIPELINE_CONCURRENCY: int = Field(default=8)
+    IMAGE_VARIANT_QUALITY: int = Field(default=80)
+    IMAGE_DOWNLOAD_TIMEOUT: float = Field(default=10.0)
+
+    # bcrypt у пулі: "thread" (bcrypt відпускає GIL) або "process"
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = Field(default="thread")
+    PASSWORD_HASH_WORKERS: int = Field(default=2)
+    PASSWORD_HASH_QUEUE_LIMIT: int = Field(default=32)
+    PASSWORD_HASH_RETRY_AFTER: int = Field(default=1)
+
+    # LRU перевірених JWT (core.token_cache), запис живе до exp токена
+    JWT_CACHE_ENABLED: bool = Field(default=True)
+    JWT_CACHE_MAXSIZE: int = Field(default=10_000)
+
+    # "id" — access token несе лише id, користувач читається з БД/кешу;
+    # "claims" — короткоживучий токен з полями профілю + відкликання в Redis
+    AUTH_TOKEN_MODE: Literal["id", "claims"] = Field(default="id")
+    CLAIMS_ACCESS_TOKEN_EXPIRE_MINUTES: int = Field(default=5)
+    TOKEN_REVOCATION_KEY: str = Field(default="auth:revoked")
+    # не менше за найдовший строк життя access token; None — рівно стільки
+    TOKEN_REVOCATION_RETENTION_MINUTES: Optional[int] = Field(default=None)
+
+    @model_validator(mode="after")
+    def check_revocation_retention(self):
+        # відкликання, прибране раніше за exp токена, знову зробило б його дійсним
+        longest = max(self.ACCESS_TOKEN_EXPIRE_MINUTES, self.CLAIMS_ACCESS_TOKEN_EXPIRE_MINUTES)
+        if self.TOKEN_REVOCATION_RETENTION_MINUTES is None:
+            self.TOKEN_REVOCATION_RETENTION_MINUTES = longest
+        elif self.TOKEN_REVOCATION_RETENTION_MINUTES < longest:
+            raise ValueError(
+                f"TOKEN_REVOCATION_RETENTION_MINUTES ({self.TOKEN_REVOCATION_RETENTION_MINUTES}) "
+                f"must be at least the longest access token lifetime ({longest})"
+            )
+        return self
+
+    # сховище refresh-сесій (services.session_store): "sql" — таблиця tokens, "redis" — Redis з TTL
+    REFRESH_SESSION_STORE: Literal["sql", "redis"] = Field(default="sql")
+    # у режимі redis приймати ще не перенесені токени з таблиці (одноразово, з переносом у Redis)
+    REFRESH_SESSION_SQL_FALLBACK: bool = Field(default=True)
+    REFRESH_SESSION_PREFIX: str = Field(default="session:")
+    # як часто кожен воркер видаляє протерміновані рядки tokens, секунд; 0 — не видаляти
+    REFRESH_SESSION_CLEANUP_INTERVAL: int = Field(default=3600)
+
     MAIL_USERNAME: str
     MAIL_PASSWORD: str
     MAIL_FROM: str
@@ -0,0 +1,124 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Optional
+
+from fastapi import HTTPException, status
+from passlib.context import CryptContext
+
+from config import config_setting
+
+
+_pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+# функції рівня модуля — щоб їх можна було передати в ProcessPoolExecutor
+def _hash(password: str) -> str:
+    return _pwd_context.hash(password)
+
+
+def _verify(password: str, hash_password: str) -> bool:
+    return _pwd_context.verify(password, hash_password)
+
+
+class PasswordHasherBusy(HTTPException):
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Сервіс тимчасово перевантажений. Спробуйте пізніше",
+            headers={"Retry-After": str(config_setting.PASSWORD_HASH_RETRY_AFTER)},
+        )
+
+
+class PasswordHasher:
+    """
+    bcrypt поза event loop: у пулі з `workers` потоків (bcrypt відпускає GIL)
+    або процесів. Не більше `queue_limit` викликів чекають на вільного
+    воркера — решта одразу отримує 503, а не росте черга з секунд очікування.
+    """
+
+    def __init__(
+        self,
+        workers: int = config_setting.PASSWORD_HASH_WORKERS,
+        queue_limit: int = config_setting.PASSWORD_HASH_QUEUE_LIMIT,
+        mode: str = config_setting.PASSWORD_HASH_EXECUTOR,
+    ) -> None:
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.mode = mode
+        self._executor: Optional[Executor] = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_time = 0.0
+        self.run_time = 0.0
+
+    @property
+    def executor(self) -> Executor:
+        if self._executor is None:
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    async def _run(self, fn: Callable, *args):
+        if self.in_flight >= self.workers + self.queue_limit:
+            self.rejected += 1
+            raise PasswordHasherBusy()
+
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        submitted = time.perf_counter()
+        try:
+            # час у черзі пулу рахуємо як різницю між загальним і часом самого bcrypt
+            result, elapsed = await asyncio.get_running_loop().run_in_executor(
+                self.executor, _timed, fn, *args
+            )
+            self.run_time += elapsed
+            self.wait_time += time.perf_counter() - submitted - elapsed
+            self.completed += 1
+            return result
+        finally:
+            self.in_flight -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(_hash, password)
+
+    async def verify(self, password: str, hash_password: str) -> bool:
+        return await self._run(_verify, password, hash_password)
+
+    def stats(self) -> dict:
+        return {
+            "mode": self.mode,
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "in_flight": self.in_flight,
+            "queued": max(self.in_flight - self.workers, 0),
+            "peak_in_flight": self.peak_in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": (
+                self.wait_time / self.completed * 1000 if self.completed else 0.0
+            ),
+            "avg_run_ms": (
+                self.run_time / self.completed * 1000 if self.completed else 0.0
+            ),
+        }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+def _timed(fn: Callable, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - started
+
+
+password_hasher = PasswordHasher()
@@ -1,41 +1,86 @@
+import uuid
 from datetime import timedelta, datetime, timezone
-from passlib.context import CryptContext
+from typing import Optional
 import jwt
 from config import config_setting
+from core.password_hasher import password_hasher
+from core.token_cache import verified_tokens
+from core.token_revocation import TokenRevoked
 
 
 class SecurityBase:
     def __init__(self):
-        self.pwd_context = CryptContext(
-            schemes=["bcrypt"],
-            deprecated="auto",
-        )
+        # bcrypt виконується в пулі, а не в event loop
+        self.password_hasher = password_hasher
 
     async def hash_password(self, password: str) -> str:
-        return self.pwd_context.hash(password)
+        return await self.password_hasher.hash(password)
 
     async def verify_password(
         self,
         password: str,
         hash_password: str,
     ) -> bool:
-        return self.pwd_context.verify(password, hash_password)
+        return await self.password_hasher.verify(password, hash_password)
+
+
+# поля профілю, які в режимі AUTH_TOKEN_MODE="claims" несе access token
+PROFILE_CLAIMS = (
+    "email",
+    "username",
+    "first_name",
+    "last_name",
+    "avatar",
+    "role_id",
+    "is_activate",
+    "is_locked",
+)
 
 
 class JWTAuth(SecurityBase):
     SECRET_KEY = config_setting.SECRET_KEY
     ALGORITHM = config_setting.ALGORITHM
+    # спільний на воркер: JWTAuth створюється на кожен запит
+    token_cache = verified_tokens
 
-    def __init__(self):
+    def __init__(self, mode: Optional[str] = None):
         super().__init__()
+        self.mode = mode or config_setting.AUTH_TOKEN_MODE
+
+    def access_claims(self, user: dict) -> dict:
+        claims = {"id": str(user.get("id"))}
+        if self.mode == "claims":
+            claims.update({field: user.get(field) for field in PROFILE_CLAIMS})
+            claims["prf"] = True
+        return claims
+
+    @staticmethod
+    def user_from_claims(payload: dict) -> Optional[dict]:
+        """Користувач з claims-токена без запиту до БД; None для токена лише з id."""
+        if not payload.get("prf"):
+            return None
+        user = {field: payload.get(field) for field in PROFILE_CLAIMS}
+        user["id"] = uuid.UUID(payload["id"])
+        return user
+
+    @staticmethod
+    def _issued_claims() -> dict:
+        # iat — для відкликання всіх токенів користувача, jti — для одного токена
+        return {
+            "iat": int(datetime.now(timezone.utc).timestamp()),
+            "jti": uuid.uuid4().hex,
+        }
 
     async def create_access_token(self, data: dict) -> str:
         try:
             to_encode = data.copy()
-            expire = datetime.now(timezone.utc) + timedelta(
-                minutes=config_setting.ACCESS_TOKEN_EXPIRE_MINUTES
+            lifetime = (
+                config_setting.CLAIMS_ACCESS_TOKEN_EXPIRE_MINUTES
+                if to_encode.get("prf")
+                else config_setting.ACCESS_TOKEN_EXPIRE_MINUTES
             )
-            to_encode.update({"exp": expire})
+            expire = datetime.now(timezone.utc) + timedelta(minutes=lifetime)
+            to_encode.update({"exp": expire, **self._issued_claims()})
             encoded_jwt = jwt.encode(
                 to_encode,
                 self.SECRET_KEY,
@@ -53,7 +98,7 @@ class JWTAuth(SecurityBase):
             expire = datetime.now(timezone.utc) + timedelta(
                 days=config_setting.REFRESH_TOKEN_EXPIRE_DAYS
             )
-            to_encode.update({"exp": expire})
+            to_encode.update({"exp": expire, **self._issued_claims()})
             encoded_jwt = jwt.encode(
                 to_encode,
                 self.SECRET_KEY,
@@ -70,11 +115,18 @@ class JWTAuth(SecurityBase):
 
     async def decode_token(self, token: str) -> dict:
         try:
-            payload = jwt.decode(
-                token,
-                self.SECRET_KEY,
-                algorithms=self.ALGORITHM,
-            )
+            payload = self.token_cache.get(token)
+            if payload is None:
+                payload = jwt.decode(
+                    token,
+                    self.SECRET_KEY,
+                    algorithms=self.ALGORITHM,
+                )
+                self.token_cache.set(token, payload)
+            if await self.token_cache.is_revoked(payload):
+                raise TokenRevoked("token revoked")
             return payload
+        except TokenRevoked:
+            raise
         except Exception as e:
             raise ValueError(f"Decode Token Error in {self.decode_token.__name__}: {e}")
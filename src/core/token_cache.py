@@ -0,0 +1,87 @@
+import hashlib
+import inspect
+import time
+from typing import Awaitable, Callable, Optional, Union
+
+from config import config_setting
+from core.token_revocation import token_revocations
+from utils.cache_manager import TTLCache
+
+
+RevocationCheck = Callable[[dict], Union[bool, Awaitable[bool]]]
+
+
+class VerifiedTokenCache:
+    """
+    LRU вже перевірених JWT: sha256 токена -> claims, до `exp` токена.
+    SPA надсилає той самий access token весь його строк життя, тож підпис
+    достатньо перевірити один раз на воркер. Сам токен у пам'яті не тримаємо.
+
+    `revocation_check(claims)` викликається на кожен запит — і для
+    закешованих, і для щойно перевірених токенів; True означає «відкликано».
+    """
+
+    def __init__(
+        self,
+        maxsize: int = config_setting.JWT_CACHE_MAXSIZE,
+        enabled: bool = config_setting.JWT_CACHE_ENABLED,
+        revocation_check: Optional[RevocationCheck] = None,
+    ) -> None:
+        self.enabled = enabled
+        self.revocation_check = revocation_check
+        self._claims = TTLCache(maxsize=maxsize, ttl=0)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[dict]:
+        if not self.enabled:
+            return None
+        claims = self._claims.get(self.digest(token))
+        if claims is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return dict(claims)
+
+    def set(self, token: str, claims: dict) -> None:
+        exp = claims.get("exp")
+        if not self.enabled or exp is None:
+            return
+        ttl = exp - time.time()
+        if ttl > 0:
+            self._claims.set(self.digest(token), dict(claims), ttl=ttl)
+
+    def evict(self, token: str) -> None:
+        self._claims.pop(self.digest(token))
+
+    async def is_revoked(self, claims: dict) -> bool:
+        if self.revocation_check is None:
+            return False
+        revoked = self.revocation_check(claims)
+        if inspect.isawaitable(revoked):
+            revoked = await revoked
+        return bool(revoked)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._claims),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+
+verified_tokens = VerifiedTokenCache(
+    # у режимі claims користувача з БД не читаємо, тож відкликання перевіряємо тут
+    revocation_check=(
+        token_revocations.is_revoked
+        if config_setting.AUTH_TOKEN_MODE == "claims"
+        else None
+    ),
+)
@@ -0,0 +1,70 @@
+import math
+import time
+from typing import Optional
+
+from redis.asyncio import Redis
+
+from config import config_setting
+from utils.cache_manager import get_redis
+from utils.logging import get_logger
+
+
+class TokenRevoked(ValueError):
+    """Токен коректний, але відкликаний (logout, зміна пароля, блокування)."""
+
+
+class TokenRevocations:
+    """
+    Відкликані токени в одному sorted set Redis (score — час відкликання):
+    `jti:<jti>` — конкретний access token (logout),
+    `user:<id>` — усі токени користувача, видані до цього моменту
+    (блокування, видалення, зміна пароля).
+    Перевірка — один ZMSCORE, O(1) на елемент. Записи старші за строк
+    життя access token більше не потрібні і прибираються при наступному записі.
+    """
+
+    def __init__(
+        self,
+        key: str = config_setting.TOKEN_REVOCATION_KEY,
+        retention: float = config_setting.TOKEN_REVOCATION_RETENTION_MINUTES * 60,
+        redis: Optional[Redis] = None,
+    ) -> None:
+        self.key = key
+        self.retention = retention
+        self._redis = redis
+
+    @property
+    def redis(self) -> Redis:
+        return self._redis if self._redis is not None else get_redis()
+
+    async def _add(self, member: str) -> None:
+        # цілі секунди, як і iat: токен, виданий у ту ж секунду після відкликання, лишається дійсним
+        now = math.floor(time.time())
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.zadd(self.key, {member: now})
+            pipe.zremrangebyscore(self.key, "-inf", now - self.retention)
+            await pipe.execute()
+
+    async def revoke_token(self, jti: str) -> None:
+        await self._add(f"jti:{jti}")
+
+    async def revoke_user(self, user_id) -> None:
+        await self._add(f"user:{user_id}")
+
+    async def is_revoked(self, claims: dict) -> bool:
+        members = [f"user:{claims.get('id')}"]
+        if claims.get("jti"):
+            members.append(f"jti:{claims['jti']}")
+        try:
+            scores = await self.redis.zmscore(self.key, members)
+        except Exception as e:
+            # токени короткоживучі: без Redis краще пропустити, ніж покласти всю авторизацію
+            get_logger().warning(f"TOKEN REVOCATION: {e}")
+            return False
+        user_revoked_at = scores[0]
+        if user_revoked_at is not None and claims.get("iat", 0) < user_revoked_at:
+            return True
+        return len(scores) > 1 and scores[1] is not None
+
+
+token_revocations = TokenRevocations()
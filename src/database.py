@@ -1,17 +1,148 @@
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Optional
+
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from config import config_setting
+import utils.row_mapper  # noqa: F401  реєструє компіляцію row mapper-ів для моделей
+from utils.query_stats import install_query_stats
+from utils.db_pool import engine_options
+from utils.db_routing import install_write_tracking, use_primary
+from utils.db_budget import install_db_budgets
 
 
-engine = create_async_engine(config_setting.DB_URI)
+engine = create_async_engine(config_setting.DB_URI, **engine_options(config_setting))
+if config_setting.QUERY_STATS_ENABLED:
+    install_query_stats(engine)
+install_db_budgets(engine)
 async_session_maker = async_sessionmaker(
     engine,
     expire_on_commit=False,
     class_=AsyncSession,
 )
 
+# репліка для читань, що терплять невелике відставання; без DB_REPLICA_URI — той самий engine
+if config_setting.DB_REPLICA_URI:
+    read_engine = create_async_engine(
+        config_setting.DB_REPLICA_URI,
+        **engine_options(config_setting.model_copy(update={"DB_URI": config_setting.DB_REPLICA_URI})),
+    )
+    if config_setting.QUERY_STATS_ENABLED:
+        install_query_stats(read_engine)
+    install_db_budgets(read_engine)
+    install_write_tracking(engine)
+else:
+    read_engine = engine
+async_read_session_maker = async_sessionmaker(
+    read_engine,
+    expire_on_commit=False,
+    class_=AsyncSession,
+)
+
 Base = declarative_base()
 
+
+_current_uow: ContextVar[Optional["UnitOfWork"]] = ContextVar("current_uow", default=None)
+
+
+class UnitOfWork:
+    """
+    Одна сесія і одна транзакція на запит.
+
+    Поки UnitOfWork активний, усі репозиторії (SqlLayer) працюють у його
+    сесії і лише роблять flush; commit виконується один раз на виході,
+    rollback — якщо запит завершився винятком. Сесія відкривається ліниво,
+    тож запити без звернень до БД не займають з'єднання.
+    """
+
+    def __init__(self, session_factory: Optional[async_sessionmaker] = None) -> None:
+        self.session_factory = session_factory or async_session_maker
+        self._session: Optional[AsyncSession] = None
+        self._token = None
+        self._after_commit: list[Callable[[], Awaitable[None]]] = []
+
+    @property
+    def session(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self.session_factory()
+        return self._session
+
+    async def commit(self) -> None:
+        if self._session is not None:
+            await self._session.commit()
+
+    async def rollback(self) -> None:
+        if self._session is not None:
+            await self._session.rollback()
+
+    def after_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        """Виконати callback після успішного commit (напр. інвалідація кешу)."""
+        self._after_commit.append(callback)
+
+    async def _run_after_commit(self) -> None:
+        callbacks, self._after_commit = self._after_commit, []
+        for callback in callbacks:
+            await callback()
+
+    async def __aenter__(self) -> "UnitOfWork":
+        self._token = _current_uow.set(self)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        _current_uow.reset(self._token)
+        if self._session is None:
+            if exc_type is None:
+                await self._run_after_commit()
+            return
+        try:
+            if exc_type is None:
+                await self.commit()
+            else:
+                await self.rollback()
+        finally:
+            await self._session.close()
+            self._session = None
+        if exc_type is None:
+            await self._run_after_commit()
+
+
+def current_uow() -> Optional[UnitOfWork]:
+    return _current_uow.get()
+
+
+@asynccontextmanager
+async def no_unit_of_work():
+    """Opt-out для фонових задач: кожен виклик репозиторію знову має власну сесію і commit."""
+    token = _current_uow.set(None)
+    try:
+        yield
+    finally:
+        _current_uow.reset(token)
+
+
+async def unit_of_work():
+    async with UnitOfWork() as uow:
+        yield uow
+
+
 async def get_db() -> AsyncSession:
+    uow = current_uow()
+    if uow is not None:
+        yield uow.session
+        return
     async with async_session_maker() as session:
         yield session
+
+
+async def get_read_db() -> AsyncSession:
+    """
+    Сесія для GET-ендпоінтів: репліка, якщо клієнт нещодавно нічого не писав,
+    інакше — та сама сесія, що й get_db.
+    """
+    if use_primary():
+        async for session in get_db():
+            yield session
+        return
+    async with async_read_session_maker() as session:
+        yield session
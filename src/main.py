@@ -1,7 +1,24 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
-from database import engine, Base
+from config import config_setting
+from database import engine, read_engine, async_session_maker, Base, unit_of_work
+from services.dimension_cache import dimension_cache
+from services.image_pipeline import shutdown_image_executor
+from services.session_store import purge_expired_sessions
+from core.password_hasher import password_hasher
+from utils.cache_manager import init_redis_pool, get_redis, close_redis, invalidation_bus
+from utils.db_pool import warmup_engine
+from utils.logging import get_logger
+from utils.s3 import get_s3_client
+from utils.template_render import prime_templates
+from utils.query_stats import QueryStatsMiddleware
+from utils.db_routing import ReadRoutingMiddleware
+from utils.schema_check import verify_alembic_head
 from api.routers import routers as api_routers
 
 import sys
@@ -11,13 +28,63 @@ sys.path.append(os.path.join(os.path.dirname(__file__), "src"))
 
 def get_application() -> FastAPI:
 
-    async def startup():
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+    async def prepare_schema():
+        if config_setting.DB_STARTUP_MODE == "create_all":
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+        elif config_setting.DB_STARTUP_MODE == "verify":
+            await verify_alembic_head(
+                engine, config_setting.ALEMBIC_SCRIPT_LOCATION, metadata=Base.metadata
+            )
+
+    async def warmup():
+        # кожен крок необов'язковий: недоступний Redis чи S3 не має валити старт
+        steps = {
+            "db": lambda: warmup_engine(engine, config_setting.DB_WARMUP_CONNECTIONS),
+            "redis": lambda: get_redis().ping(),
+            "s3": lambda: asyncio.to_thread(get_s3_client),
+            "templates": lambda: asyncio.to_thread(prime_templates),
+            "dimensions": prime_dimensions,
+        }
+        for name, step in steps.items():
+            try:
+                await step()
+            except Exception as e:
+                get_logger().warning(f"WARMUP {name} failed: {e}")
+
+    async def prime_dimensions():
+        async with async_session_maker() as session:
+            await dimension_cache.load(session)
 
-    application = FastAPI()
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        init_redis_pool()
+        await prepare_schema()
+        await warmup()
+        background = [asyncio.create_task(invalidation_bus.listen())]
+        if config_setting.REFRESH_SESSION_CLEANUP_INTERVAL:
+            background.append(asyncio.create_task(purge_expired_sessions()))
+        app.state.ready = True
+        try:
+            yield
+        finally:
+            # uvicorn викликає це після SIGTERM, коли запити в роботі вже завершились
+            app.state.ready = False
+            for task in background:
+                task.cancel()
+            shutdown_image_executor()
+            password_hasher.shutdown()
+            await close_redis()
+            await engine.dispose()
+            if read_engine is not engine:
+                await read_engine.dispose()
 
-    application.add_event_handler("startup", startup)
+    application = FastAPI(
+        default_response_class=ORJSONResponse,
+        dependencies=[Depends(unit_of_work)],
+        lifespan=lifespan,
+    )
+    application.state.ready = False
 
     origins = [
         "https://nuviora.vercel.app",
@@ -34,6 +101,12 @@ def get_application() -> FastAPI:
         allow_headers=["*"],
     )
 
+    if config_setting.QUERY_STATS_ENABLED:
+        application.add_middleware(QueryStatsMiddleware)
+
+    if config_setting.DB_REPLICA_URI:
+        application.add_middleware(ReadRoutingMiddleware)
+
     for router in api_routers:
         application.include_router(router=router)
 
@@ -16,12 +16,6 @@ class CountryModel(Base):
 
     city: Mapped["CityModel"] = relationship(back_populates="country")
 
-    async def to_dict(self):
-        return {
-            "id": self.id,
-            "name": self.name,
-        }
-
 
 class CityModel(Base):
     __tablename__ = "cities"
@@ -36,9 +30,3 @@ class CityModel(Base):
     name: Mapped[str] = mapped_column()
 
     country: Mapped["CountryModel"] = relationship(back_populates="city")
-
-    async def to_dict(self):
-        return {
-            "id": self.id,
-            "name": self.name,
-        }
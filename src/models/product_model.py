@@ -1,6 +1,6 @@
 from datetime import datetime
 import uuid
-from sqlalchemy import Boolean, DECIMAL, ForeignKey, Integer, String, Text
+from sqlalchemy import Boolean, DECIMAL, ForeignKey, Integer, String, Text, DateTime
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.dialects.postgresql import JSONB
 from database import Base
@@ -17,14 +17,6 @@ class Category(Base):
     subcategories = relationship("Subcategory", back_populates="category")
     products = relationship("Product", back_populates="category")
 
-    async def to_dict(self):
-        return {
-            "category_id": self.category_id,
-            "name": self.name,
-            "description": self.description,
-            #"icon": self.icon
-        }
-
 class Subcategory(Base):
     __tablename__ = "subcategory"
 
@@ -36,14 +28,6 @@ class Subcategory(Base):
 
     category: Mapped["Category"] = relationship(back_populates="subcategories")
     products = relationship("Product", back_populates="subcategory")
-
-    async def to_dict(self):
-        return {
-            "subcategory_id": self.subcategory_id,
-            "name": self.name,
-            "description": self.description,
-            "category_id": self.category_id
-        }
     
 class Brand(Base):
     __tablename__ = "brand"
@@ -54,14 +38,6 @@ class Brand(Base):
     logo_url: Mapped[str] = mapped_column(String, nullable=True)
 
     products = relationship("Product", back_populates="brand")
-
-    async def to_dict(self):
-        return {
-            "brand_id": self.brand_id,
-            "name": self.name,
-            "description": self.description,
-            "logo_url": self.logo_url
-        }
     
 class Product(Base):
     __tablename__ = "product"
@@ -95,29 +71,7 @@ class Product(Base):
     reviews = relationship("Review", back_populates="product")
     variations = relationship("ProductVariation", back_populates="product")
     subscription = relationship("ProductSubscription", back_populates="product")
-
-
-    async def to_dict(self):
-        return {
-            "product_id": self.product_id,
-            "name": self.name,
-            "description": self.description,
-            "small_description": self.small_description,
-            "traits_id": self.traits_id,
-            "price": self.price,
-            "availability": self.availability,
-            "currency": self.currency,
-            "in_stock": self.in_stock,
-            "stock_quantity": self.stock_quantity,
-            "category_id": self.category_id,
-            "subcategory_id": self.subcategory_id,
-            "product_image": self.product_image,
-            "brand_id": self.brand_id,
-            "is_certified": self.is_certified,
-            "certification_info": self.certification_info,
-            "benefits": self.benefits,
-            "usage_instructions": self.usage_instructions,
-        }
+    card = relationship("ProductCard", back_populates="product", uselist=False)
     
     @property
     def average_rating(self):
@@ -136,16 +90,6 @@ class ProductVariation(Base):
     stock_quantity: Mapped[int] = mapped_column(Integer, default=0)
 
     product: Mapped["Product"] = relationship(back_populates="variations")
-
-    async def to_dict(self):
-        return {
-            "variations_id": self.variations_id,
-            "product_id": self.product_id,
-            "variation_type": self.variation_type,
-            "variation_value": self.variation_value,
-            "price_modifier": self.price_modifier,
-            "stock_quantity": self.stock_quantity,
-        }
     
 class Traits(Base):
     __tablename__ = "traits"
@@ -157,14 +101,6 @@ class Traits(Base):
 
     product: Mapped["Product"] = relationship(back_populates="traits")
 
-    async def to_dict(self):
-        return {
-            "traits_id": self.traits_id,
-            "product_id": self.product_id,
-            "traits_name": self.traits_name,
-            "traits_text": self.traits_text,
-    }
-
 class ProductImage(Base):
     __tablename__ = "product_image"
 
@@ -177,16 +113,6 @@ class ProductImage(Base):
 
     product: Mapped["Product"] = relationship(back_populates="images")
 
-    async def to_dict(self):
-        return {
-            "product_image_id": self.product_image_id,
-            "product_id": self.product_id,
-            "image_description": self.image_description,
-            "image_urls": self.image_urls,
-            "is_main": self.is_main,
-            "sort_order": self.sort_order
-        }
-
 class Feature(Base):
     __tablename__ = "feature"
 
@@ -197,15 +123,6 @@ class Feature(Base):
     feature_value: Mapped[str] = mapped_column(String, nullable=True)
 
     product: Mapped["Product"] = relationship(back_populates="features")
-
-    async def to_dict(self):
-        return {
-            "feature_id": self.feature_id,
-            "product_id": self.product_id,
-            "feature_name": self.feature_name,
-            "feature_text": self.feature_text,
-            "feature_value": self.feature_value
-        }
     
 class Review(Base):
     __tablename__ = "review"
@@ -219,17 +136,6 @@ class Review(Base):
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id"), nullable=True)
 
     product: Mapped["Product"] = relationship(back_populates="reviews")
-
-    async def to_dict(self):
-        return {
-            "review_id": self.review_id,
-            "product_id": self.product_id,
-            "rating": self.rating,
-            "review_text": self.review_text,
-            "reviewer_name": self.reviewer_name,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "user_id": str(self.user_id) if self.user_id else None
-        }
     
 class ProductSubscription(Base):
     __tablename__ = "product_subscription"
@@ -242,11 +148,14 @@ class ProductSubscription(Base):
 
     product: Mapped["Product"] = relationship(back_populates="subscription")
 
-    async def to_dict(self):
-        return {
-            "subscription_id": self.subscription_id,
-            "product_id": self.product_id,
-            "email": self.email,
-            "is_notified": self.is_notified,
-            "created_at": self.created_at
-        }
\ No newline at end of file
+class ProductCard(Base):
+    """Read model: готова до відправки JSON-картка товару для каталогу."""
+    __tablename__ = "product_card"
+
+    product_id: Mapped[int] = mapped_column(
+        ForeignKey("product.product_id", ondelete="CASCADE"), primary_key=True
+    )
+    card: Mapped[str] = mapped_column(Text, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.now)
+
+    product: Mapped["Product"] = relationship(back_populates="card")
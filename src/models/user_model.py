@@ -47,26 +47,6 @@ class UserModel(Base):
     token: Mapped["TokenModel"] = relationship(back_populates="user")
     address: Mapped["AddressModel"] = relationship(back_populates="user")
 
-####################################################################################################
-    async def to_dict(self) -> dict:
-        return {
-            "id": self.id,
-            "username": self.username,
-            "email": self.email,
-            "first_name": self.first_name,
-            "last_name": self.last_name,
-            "about": self.about,
-            "avatar": self.avatar,
-            "phone": self.phone,
-            "birth_date": self.birth_date,
-            "created_at": self.created_at,
-            "update_at": self.updated_at,
-            "is_activate": self.is_activate,
-            "is_locked": self.is_locked,
-            "hash_password": self.hash_password,
-        }
-####################################################################################################
-
 class AddressModel(Base):
     __tablename__ = "addresses"
 
@@ -90,18 +70,6 @@ class AddressModel(Base):
 
     user: Mapped["UserModel"] = relationship(back_populates="address")
 
-    async def to_dict(self):
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "address_line": self.address_line,
-            "city": self.city,
-            "state": self.state,
-            "postal_code": self.postal_code,
-            "country": self.country,
-            "is_default": self.is_default,
-        }
-
 
 class TokenModel(Base):
     __tablename__ = "tokens"
@@ -122,16 +90,6 @@ class TokenModel(Base):
 
     user: Mapped["UserModel"] = relationship(back_populates="token")
 
-    async def to_dict(self):
-        return {
-            "id": self.id,
-            "user_id": self.user_id,
-            "refresh_token": self.refresh_token,
-            "expires_at": self.expires_at,
-            "user_agent": self.user_agent,
-            "created_at": self.created_at,
-        }
-
 
 class RoleModel(Base):
     __tablename__ = "roles"
@@ -144,6 +102,3 @@ class RoleModel(Base):
     role: Mapped[str] = mapped_column()
 
     user: Mapped["UserModel"] = relationship(back_populates="role")
-
-    async def to_dict(self):
-        pass
@@ -1,3 +1,9 @@
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import delete
+
+from utils.logging import get_logger
 from utils.repository import SqlLayer
 from models.user_model import UserModel, AddressModel, TokenModel
 
@@ -12,3 +18,46 @@ class AddressRepository(SqlLayer):
 
 class TokenRepository(SqlLayer):
     model = TokenModel
+
+    async def pop(self, refresh_token: str) -> Optional[dict]:
+        """Видаляє сесію і повертає її рядок одним DELETE ... RETURNING; None, якщо токена немає."""
+        async with self._session() as session:
+            try:
+                stmt = (
+                    delete(TokenModel)
+                    .where(TokenModel.refresh_token == refresh_token)
+                    .returning(
+                        TokenModel.user_id, TokenModel.user_agent, TokenModel.expires_at
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                row = (await session.execute(stmt)).mappings().first()
+                await self._commit(session)
+                return dict(row) if row else None
+            except Exception as e:
+                await self._rollback(session)
+                raise Exception(f"Delete Error in {self.model.__name__}: {e}")
+
+    async def delete_expired(self, now: Optional[datetime] = None, **kwargs) -> int:
+        """Протерміновані сесії (за потреби — лише з фільтром, напр. user_id)."""
+        async with self._session() as session:
+            try:
+                stmt = (
+                    delete(TokenModel)
+                    .filter_by(**kwargs)
+                    .where(
+                        TokenModel.expires_at
+                        < (now or datetime.now(timezone.utc).replace(tzinfo=None))
+                    )
+                    .execution_options(synchronize_session=False)
+                )
+                result = await session.execute(stmt)
+                await self._commit(session)
+                if result.rowcount:
+                    get_logger().info(
+                        f"DATA DELETED: {self.model.__name__} expired rows: {result.rowcount}"
+                    )
+                return result.rowcount
+            except Exception as e:
+                await self._rollback(session)
+                raise Exception(f"Delete Error in {self.model.__name__}: {e}")
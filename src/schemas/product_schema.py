@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Union
 
 
 class CategorySchema(BaseModel):
@@ -42,7 +42,7 @@ class TraitsSchema(BaseModel):
 class ProductImageSchema(BaseModel):
     product_image_id: Optional[int] = Field(default=None)
     image_description: Optional[str] = Field(default=None)
-    image_url: str
+    image_url: Union[str, Dict[str, Optional[str]]]
     is_main: Optional[bool] = Field(default=False)
     sort_order: Optional[int] = Field(default=0)
 
@@ -1,6 +1,5 @@
 import uuid
 import random
-import asyncio
 from datetime import datetime
 from typing import Protocol, Optional
 from fastapi import UploadFile
@@ -8,7 +7,10 @@ from fastapi import UploadFile
 from utils.repository import AbstractRepository
 from utils.cache_manager import AbstractCache
 from utils.email_manager import AbstractEmail
+from utils.logging import get_logger
 from services.s3_avatar_uploader import S3AvatarUploader
+from services.session_store import AbstractSessionStore, SessionReuseError, SqlSessionStore
+from core.token_revocation import TokenRevoked
 
 # class AuthService(Protocol):
 class AuthService:
@@ -21,6 +23,9 @@ class AuthService:
         security_layer,
         error_handler,
         template_handler,
+        user_cache=None,
+        token_revocations=None,
+        session_store=None,
     ) -> None:
         self.user_repo: AbstractRepository = user_repo()
         self.refresh_repo: AbstractRepository = refresh_repo()
@@ -29,6 +34,19 @@ class AuthService:
         self.security_layer = security_layer()
         self.error_handler = error_handler
         self.template_handler = template_handler
+        self.user_cache = user_cache
+        self.token_revocations = token_revocations
+        # refresh-сесії: за замовчуванням — таблиця tokens через refresh_repo
+        self.sessions: AbstractSessionStore = session_store or SqlSessionStore(self.refresh_repo)
+
+    async def _revoke_tokens(self, user_id) -> None:
+        # усі видані раніше токени користувача стають недійсними
+        if self.token_revocations is None:
+            return
+        try:
+            await self.token_revocations.revoke_user(user_id)
+        except Exception as e:
+            get_logger().warning(f"TOKEN REVOCATION: {e}")
 
     async def send_mail(self, recipient: str, subject: str, body_text: str) -> None:
         try:
@@ -54,9 +72,9 @@ class AuthService:
             )
             if not data.get("count"):
                 data["count"] = 0
-            cache_data = await self.cache_manager.set(token=token, data=data, exp=exp)
-            await self.cache_manager.set(
-                token=str(data.get("id")), data=cache_data, exp=exp
+            # код -> дані і id -> код одним MULTI
+            await self.cache_manager.set_many(
+                {token: data, str(data.get("id")): token}, exp=exp
             )
             await self.send_mail(
                 recipient=data.get("email"),
@@ -70,18 +88,14 @@ class AuthService:
     async def resend_email(self, user_id: uuid.UUID):
         try:
             token = await self.cache_manager.get(token=str(user_id))
-            data = await self.cache_manager.get(token=token)
+            # дані за кодом читаємо і видаляємо разом з обома ключами за один round trip
+            data, _ = await self.cache_manager.pop_many([token, str(user_id)]) if token else (None, None)
 
             if not data:
                 raise self.error_handler(
                     status_code=400, detail="Токен підтвердження електронної пошти протермінований"
                 )
 
-            await asyncio.gather(
-                self.cache_manager.delete(token=token),
-                self.cache_manager.delete(token=str(user_id)),
-            )
-
             if data.get("count") >= 3:
                 raise self.error_handler(status_code=429, detail="Забагато запитів")
 
@@ -139,23 +153,16 @@ class AuthService:
     async def _generate_token_pair(self, data: dict, user_agent: Optional[str]) -> dict:
         try:
             access_token = await self.security_layer.create_access_token(
-                data={"id": str(data.get("id"))}
+                data=self.security_layer.access_claims(data)
             )
 
             refresh_token, expire = await self.security_layer.create_refresh_token(
                 data={"id": str(data.get("id"))}
             )
-            refresh_token = await self.refresh_repo.insert(
-                data={
-                    "user_id": data.get("id"),
-                    "refresh_token": refresh_token,
-                    "user_agent": user_agent,
-                    "expires_at": expire,
-                }
-            )
+            await self.sessions.create(data.get("id"), refresh_token, user_agent, expire)
             return {
                 "access_token": access_token,
-                "refresh_token": refresh_token.get("refresh_token"),
+                "refresh_token": refresh_token,
             }
         except Exception as e:
             raise self.error_handler(status_code=500, detail="Упс! Щось пішло не так. Спробуйте пізніше")
@@ -186,9 +193,9 @@ class AuthService:
             if not data:
                 raise self.error_handler()
 
-            await self.cache_manager.delete(token=token)
-            await self.cache_manager.set(token=token, data=data, exp=180)
-            await self.cache_manager.set(token=str(data.get("id")), data=token, exp=180)
+            await self.cache_manager.set_many(
+                {token: data, str(data.get("id")): token}, exp=180
+            )
             return {"message": "Користувача успішно підтверджено"}
         except Exception:
             raise self.error_handler(status_code=500, detail="Упс! Щось пішло не так. Спробуйте пізніше")
@@ -222,16 +229,22 @@ class AuthService:
             user_obj = await self.user_repo.update(
                 id=user_obj.get("id"),
                 data={
-                    "update_at": datetime.now(),
+                    "updated_at": datetime.now(),
                     "hash_password": await self.security_layer.hash_password(
                         password=data.get("hash_password")
                     ),
                 },
             )
+            if self.user_cache is not None:
+                await self.user_cache.invalidate(user_obj.get("id"))
+            await self._revoke_tokens(user_obj.get("id"))
+            # після скидання пароля всі інші сесії завершуються,
+            # а поточний пристрій отримує нову пару токенів
+            await self.sessions.revoke_all(user_obj.get("id"))
             token_pair = await self._generate_token_pair(
                 data=user_obj, user_agent=data.get("user_agent")
             )
-            return {"message": "Пароль успішно змінено"}
+            return {"message": "Пароль успішно змінено", **token_pair}
         except self.error_handler as e:
             raise e
         except Exception as e:
@@ -267,36 +280,74 @@ class AuthService:
             if not payload:
                 raise self.error_handler(status_code=401, detail="Несанкціонований доступ")
 
-            user_obj = await self.user_repo.get(id=payload.get("id"))
+            user_id = payload.get("id")
+            if self.user_cache is not None:
+                user_obj = await self.user_cache.get_or_load(
+                    user_id, lambda: self.user_repo.get(id=user_id)
+                )
+            else:
+                user_obj = await self.user_repo.get(id=user_id)
             if not user_obj:
                 raise self.error_handler(status_code=404, detail="User not found")
 
-            await self.refresh_repo.delete(refresh_token=data.get("refresh_token"))
-            return await self._generate_token_pair(
-                data=payload, user_agent=data.get("user_agent")
+            # атомарна ротація: старий токен стає недійсним, новий — єдиний для цієї сесії
+            refresh_token, expire = await self.security_layer.create_refresh_token(
+                data={"id": str(user_id)}
             )
+            owner = await self.sessions.rotate(
+                data.get("refresh_token"), refresh_token, data.get("user_agent"), expire
+            )
+            if owner is None or owner != str(user_id):
+                raise self.error_handler(status_code=401, detail="Несанкціонований доступ")
+
+            # з рядка користувача, щоб claims-токен ніс актуальний профіль
+            access_token = await self.security_layer.create_access_token(
+                data=self.security_layer.access_claims(user_obj)
+            )
+            return {"access_token": access_token, "refresh_token": refresh_token}
         except self.error_handler as e:
             raise e
+        except SessionReuseError as e:
+            # сесії вже завершено в сховищі; відкликаємо й видані access-токени
+            await self._revoke_tokens(e.user_id)
+            raise self.error_handler(status_code=401, detail="Несанкціонований доступ")
+        except TokenRevoked:
+            # відкликаний, а не прострочений: клієнт має увійти знову
+            raise self.error_handler(status_code=401, detail="Несанкціонований доступ")
         except ValueError:
             raise self.error_handler(status_code=410, detail="Видалено")
         except Exception as e:
             raise self.error_handler(status_code=500, detail="Упс! Щось пішло не так. Спробуйте пізніше")
 
-    async def logout_handler(self, refresh_token: str) -> dict:
+    async def logout_handler(self, refresh_token: str, access_token: Optional[str] = None) -> dict:
+        try:
+            if refresh_token:
+                await self.sessions.revoke(refresh_token)
+            if access_token and self.token_revocations is not None:
+                try:
+                    payload = await self.security_layer.decode_token(token=access_token)
+                    await self.token_revocations.revoke_token(payload.get("jti"))
+                except ValueError:
+                    pass  # протермінований чи вже відкликаний — відкликати нічого
+            return {"message": "Вихід успішний"}
+        except Exception:
+            raise self.error_handler(status_code=500, detail="Упс! Щось пішло не так. Спробуйте пізніше")
+
+    async def logout_all_handler(self, user_id) -> dict:
         try:
-            await self.refresh_repo.delete(refresh_token=refresh_token)
+            await self.sessions.revoke_all(user_id)
+            await self._revoke_tokens(user_id)
             return {"message": "Вихід успішний"}
         except Exception:
             raise self.error_handler(status_code=500, detail="Упс! Щось пішло не так. Спробуйте пізніше")
 
     async def delete_test(self, email: str):
         user_obj = await self.user_repo.get(email=email)
-        tokens = await self.refresh_repo.get_all(user_id=user_obj["id"])
-
-        for token in tokens:
-            await self.refresh_repo.delete(id=token["id"])
-
+        await self.sessions.revoke_all(user_obj["id"])
         await self.user_repo.delete(id=user_obj["id"])
+        if self.user_cache is not None:
+            await self.user_cache.invalidate(user_obj["id"])
+        await self._revoke_tokens(user_obj["id"])
 
     # async def update_avatar_handler(self, user_id: uuid.UUID, file: UploadFile) -> dict:
     #     try:
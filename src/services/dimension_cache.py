@@ -0,0 +1,69 @@
+import time
+from typing import Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.product_model import Brand, Category
+from utils.single_flight import SingleFlight
+
+
+class DimensionCache:
+    """
+    Довідники категорій і брендів у пам'яті воркера (назва -> id).
+    Фільтр каталогу за назвою стає `category_id IN (...)` замість
+    EXISTS-підзапиту по таблиці category на кожен запит.
+    """
+
+    def __init__(self, ttl: float = 300.0, miss_reload_interval: float = 5.0) -> None:
+        self.ttl = ttl
+        self.miss_reload_interval = miss_reload_interval
+        self.categories: dict[str, list[int]] = {}
+        self.brands: dict[str, list[int]] = {}
+        self.loaded_at: Optional[float] = None
+        self.flight = SingleFlight()
+
+    @staticmethod
+    def _group(rows) -> dict[str, list[int]]:
+        # назви не унікальні — одна назва може відповідати кільком id
+        grouped: dict[str, list[int]] = {}
+        for name, id_ in rows:
+            grouped.setdefault(name, []).append(id_)
+        return grouped
+
+    async def load(self, session: AsyncSession) -> None:
+        categories = await session.execute(select(Category.name, Category.category_id))
+        brands = await session.execute(select(Brand.name, Brand.brand_id))
+        self.categories = self._group(categories.all())
+        self.brands = self._group(brands.all())
+        self.loaded_at = time.monotonic()
+
+    async def reload(self, session: AsyncSession) -> None:
+        # після expiry всі паралельні запити каталогу чекають одне перечитування
+        await self.flight.do("dimensions", lambda: self.load(session))
+
+    def expired(self) -> bool:
+        return self.loaded_at is None or time.monotonic() - self.loaded_at > self.ttl
+
+    async def _lookup(self, session: AsyncSession, table: str, name: str) -> list[int]:
+        if self.expired():
+            await self.reload(session)
+        ids = getattr(self, table).get(name)
+        if (
+            ids is None
+            and time.monotonic() - self.loaded_at > self.miss_reload_interval
+        ):
+            # можливо, довідник змінився після завантаження — перечитуємо,
+            # але не частіше за miss_reload_interval, щоб невідомі назви не били в БД
+            await self.reload(session)
+            ids = getattr(self, table).get(name)
+        return ids or []
+
+    async def category_ids(self, session: AsyncSession, name: str) -> list[int]:
+        return await self._lookup(session, "categories", name)
+
+    async def brand_ids(self, session: AsyncSession, name: str) -> list[int]:
+        return await self._lookup(session, "brands", name)
+
+
+dimension_cache = DimensionCache()
@@ -0,0 +1,157 @@
+import asyncio
+import io
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Union
+
+import httpx
+from PIL import Image
+
+from config import config_setting
+from utils.abstract_storage import AbstractStorage
+from utils.logging import get_logger
+
+
+# назва варіанту -> максимальний розмір (ширина, висота), пропорції зберігаються
+IMAGE_VARIANTS = {
+    "thumb": (160, 160),
+    "card": (480, 480),
+    "full": (1600, 1600),
+}
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+
+def get_image_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(
+            max_workers=config_setting.IMAGE_PIPELINE_WORKERS
+        )
+    return _executor
+
+
+def shutdown_image_executor() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+
+def render_variants(file_bytes: bytes, quality: int) -> dict[str, bytes]:
+    """Виконується у процесі пулу: Pillow тримає GIL під час ресайзу."""
+    original = Image.open(io.BytesIO(file_bytes)).convert("RGB")
+    variants = {}
+    for name, size in IMAGE_VARIANTS.items():
+        image = original.copy()
+        image.thumbnail(size, Image.LANCZOS)
+        buffer = io.BytesIO()
+        image.save(buffer, format="WEBP", quality=quality, method=4)
+        variants[name] = buffer.getvalue()
+    return variants
+
+
+def pick_variant(
+    image_url: Union[dict, str, None], variant: str = "thumb"
+) -> Optional[str]:
+    """URL потрібного варіанту; старі записи мають лише small/medium/large."""
+    if not image_url or isinstance(image_url, str):
+        return image_url
+    fallback = {"thumb": "small", "card": "medium", "full": "large"}.get(variant)
+    return (
+        image_url.get(variant) or image_url.get(fallback) or image_url.get("original")
+    )
+
+
+class ImagePipeline:
+    """
+    Варіанти завантажуються в сховище до запису в БД. Ключі завантажених файлів
+    запам'ятовуються: якщо транзакція імпорту не вдалася, `discard_uploads()`
+    видаляє їх, а після commit `keep_uploads()` забуває.
+    """
+
+    def __init__(
+        self,
+        storage: AbstractStorage,
+        executor: Optional[ProcessPoolExecutor] = None,
+        concurrency: int = config_setting.IMAGE_PIPELINE_CONCURRENCY,
+    ) -> None:
+        self.storage = storage
+        self.executor = executor or get_image_executor()
+        self.concurrency = concurrency
+        self.uploaded_keys: list[str] = []
+
+    async def _upload(self, data: bytes, key: str) -> str:
+        url = await asyncio.to_thread(
+            self.storage.upload_file, data, key=key, content_type="image/webp"
+        )
+        self.uploaded_keys.append(key)
+        return url
+
+    async def _download(self, client: httpx.AsyncClient, url: str) -> bytes:
+        response = await client.get(url)
+        response.raise_for_status()
+        return response.content
+
+    async def process(self, client: httpx.AsyncClient, url: str, prefix: str) -> dict:
+        try:
+            file_bytes = await self._download(client, url)
+            variants = await asyncio.get_running_loop().run_in_executor(
+                self.executor,
+                render_variants,
+                file_bytes,
+                config_setting.IMAGE_VARIANT_QUALITY,
+            )
+            key_base = f"{prefix}/{uuid.uuid4()}"
+            urls = await asyncio.gather(
+                *(
+                    self._upload(data, key=f"{key_base}-{name}.webp")
+                    for name, data in variants.items()
+                )
+            )
+            result = dict(zip(variants.keys(), urls))
+            result["original"] = url
+            return result
+        except Exception as e:
+            get_logger().error(f"IMAGE PIPELINE ERROR: {url}: {e}")
+            return {name: url for name in IMAGE_VARIANTS} | {"original": url}
+
+    async def process_many(
+        self, images: dict[int, str], prefix: str = "products"
+    ) -> dict[int, dict]:
+        """
+        Обробляє зображення імпорту паралельно, не більше `concurrency` одночасно,
+        щоб великий імпорт не вичерпав сокети і чергу пулу процесів:
+        {image_id: url} -> {image_id: variants}.
+        """
+        if not images:
+            return {}
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(client: httpx.AsyncClient, url: str) -> dict:
+            async with semaphore:
+                return await self.process(client, url, prefix)
+
+        limits = httpx.Limits(max_connections=self.concurrency)
+        async with httpx.AsyncClient(
+            timeout=config_setting.IMAGE_DOWNLOAD_TIMEOUT, limits=limits
+        ) as client:
+            results = await asyncio.gather(
+                *(bounded(client, url) for url in images.values())
+            )
+        return dict(zip(images.keys(), results))
+
+    def keep_uploads(self) -> None:
+        self.uploaded_keys = []
+
+    async def discard_uploads(self) -> None:
+        keys, self.uploaded_keys = self.uploaded_keys, []
+        if not keys:
+            return
+        try:
+            await asyncio.to_thread(self.storage.delete_files, keys)
+            get_logger().info(f"IMAGE PIPELINE: removed {len(keys)} orphaned variants")
+        except Exception as e:
+            get_logger().error(
+                f"IMAGE PIPELINE: failed to remove orphaned variants {keys}: {e}"
+            )
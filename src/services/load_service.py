@@ -1,19 +1,14 @@
-import boto3
 import uuid
 import io
 from PIL import Image
 from botocore.exceptions import BotoCoreError, ClientError
 from fastapi import UploadFile, HTTPException
 from config import config_setting
+from utils.s3 import get_s3_client
 
 class LoadService:
-    def __init__(self):
-        self.s3 = boto3.client(
-            "s3",
-            aws_access_key_id=config_setting.ACCESS_KEY,
-            aws_secret_access_key=config_setting.SECRET_ACCESS_KEY,
-            region_name=config_setting.AWS_REGION
-        )
+    def __init__(self, client=None):
+        self.s3 = client or get_s3_client()
         self.bucket = config_setting.AWS_BUCKET_NAME
 
     async def upload_image_to_s3(self, avatar: UploadFile) -> str:
@@ -0,0 +1,141 @@
+import json
+from datetime import datetime
+from typing import Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from database import current_uow
+from models.product_model import Product, ProductCard
+from services.image_pipeline import pick_variant
+from utils.logging import get_logger
+
+
+class ProductCardService:
+    """
+    Read model для каталогу: картки товарів серіалізуються один раз після
+    імпорту, а каталог лише склеює збережені JSON-фрагменти у відповідь.
+    """
+
+    def __init__(
+        self, session: AsyncSession, read_session: Optional[AsyncSession] = None
+    ) -> None:
+        self.session = session
+        # каталог читає картки з репліки; добудова відсутніх — лише через primary
+        self.read_session = read_session or session
+
+    @staticmethod
+    def build_card(product: Product) -> dict:
+        reviews = product.reviews or []
+        avg_rating = (
+            round(sum(r.rating for r in reviews) / len(reviews), 1) if reviews else 0.0
+        )
+        images = sorted(
+            product.images, key=lambda i: (not i.is_main, i.sort_order or 0)
+        )
+        main_image_url = (
+            pick_variant(images[0].image_url, "card")
+            if images
+            else product.product_image
+        )
+        return {
+            "product_id": product.product_id,
+            "name": product.name,
+            "price": float(product.price),
+            "currency": "UAH",
+            "average_rating": avg_rating,
+            "small_description": product.small_description,
+            "main_image_url": main_image_url,
+            "category_name": product.category.name if product.category else None,
+            "brand_name": product.brand.name if product.brand else None,
+            "is_certified": product.is_certified,
+            "in_stock": product.in_stock,
+            "features": [
+                {
+                    "feature_id": f.feature_id,
+                    "feature_name": f.feature_name,
+                    "feature_text": f.feature_text,
+                }
+                for f in product.features
+            ],
+            "images": [
+                {
+                    "image_url": pick_variant(i.image_url, "thumb"),
+                    "image_description": i.image_description,
+                }
+                for i in images
+            ],
+        }
+
+    @staticmethod
+    def dump_card(card: dict) -> str:
+        return json.dumps(card, ensure_ascii=False, separators=(",", ":"))
+
+    async def rebuild(self, product_ids: Iterable[int]) -> int:
+        product_ids = list(product_ids)
+        if not product_ids:
+            return 0
+
+        result = await self.session.execute(
+            select(Product)
+            .options(
+                selectinload(Product.reviews),
+                selectinload(Product.features),
+                selectinload(Product.images),
+                selectinload(Product.category),
+                selectinload(Product.brand),
+            )
+            .where(Product.product_id.in_(product_ids))
+        )
+        now = datetime.now()
+        rows = [
+            {
+                "product_id": p.product_id,
+                "card": self.dump_card(self.build_card(p)),
+                "updated_at": now,
+            }
+            for p in result.scalars().all()
+        ]
+        if not rows:
+            return 0
+
+        stmt = insert(ProductCard).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ProductCard.product_id],
+            set_={"card": stmt.excluded.card, "updated_at": stmt.excluded.updated_at},
+        )
+        await self.session.execute(stmt)
+        get_logger().info(f"PRODUCT CARDS REBUILT: {len(rows)}")
+        return len(rows)
+
+    async def get_cards(self, product_ids: list[int]) -> list[str]:
+        """
+        Повертає збережені JSON-картки у порядку `product_ids`.
+        Відсутні картки (товари, імпортовані до появи read model) добудовуються.
+        """
+        if not product_ids:
+            return []
+
+        stmt = select(ProductCard.product_id, ProductCard.card).where(
+            ProductCard.product_id.in_(product_ids)
+        )
+        cards = dict((await self.read_session.execute(stmt)).all())
+
+        missing = [pid for pid in product_ids if pid not in cards]
+        if missing and await self.rebuild(missing):
+            # у межах запиту commit робить UnitOfWork — посеред GET транзакцію не закриваємо
+            if current_uow() is None:
+                await self.session.commit()
+            stmt = select(ProductCard.product_id, ProductCard.card).where(
+                ProductCard.product_id.in_(missing)
+            )
+            cards.update((await self.session.execute(stmt)).all())
+
+        return [cards[pid] for pid in product_ids if pid in cards]
+
+    @staticmethod
+    def render_page(cards: list[str], meta: dict) -> str:
+        meta_json = json.dumps(meta, separators=(",", ":"))
+        return '{"products":[' + ",".join(cards) + "]," + meta_json[1:]
@@ -1,20 +1,15 @@
 import uuid
 import io
 from PIL import Image
-import boto3
 
 from config import config_setting
 from utils.abstract_storage import AbstractStorage
+from utils.s3 import get_s3_client
 
 
 class S3AvatarUploader(AbstractStorage):
-    def __init__(self):
-        self.s3 = boto3.client(
-            "s3",
-            aws_access_key_id=config_setting.ACCESS_KEY,
-            aws_secret_access_key=config_setting.SECRET_ACCESS_KEY,
-            region_name=config_setting.AWS_REGION
-        )
+    def __init__(self, client=None):
+        self.s3 = client or get_s3_client()
         self.bucket = config_setting.AWS_BUCKET_NAME
         self.region = config_setting.AWS_REGION
 
@@ -25,16 +20,25 @@ class S3AvatarUploader(AbstractStorage):
 
         buffer = io.BytesIO()
         image.save(buffer, format="WEBP")
-        buffer.seek(0)
 
         key = f"avatars/{uuid.uuid4()}.webp"
+        return self.upload_file(buffer.getvalue(), key=key, content_type="image/webp")
 
+    def upload_file(self, file_bytes: bytes, key: str, content_type: str) -> str:
         self.s3.put_object(
             Bucket=self.bucket,
             Key=key,
-            Body=buffer,
-            ContentType="image/webp",
+            Body=file_bytes,
+            ContentType=content_type,
         )
 
         url = f"https://{self.bucket}.s3.{self.region}.amazonaws.com/{key}"
         return url
+
+    def delete_files(self, keys: list[str]) -> None:
+        # delete_objects приймає до 1000 ключів за запит
+        for start in range(0, len(keys), 1000):
+            self.s3.delete_objects(
+                Bucket=self.bucket,
+                Delete={"Objects": [{"Key": key} for key in keys[start:start + 1000]], "Quiet": True},
+            )
@@ -0,0 +1,346 @@
+"""
+Сховища refresh-сесій для AuthService.
+
+SqlSessionStore — таблиця tokens, як і раніше; протерміновані рядки прибирає
+фонова `purge_expired_sessions` з lifespan. RedisSessionStore — sha256 токена
+в Redis з нативним TTL, множина сесій користувача для «вийти всюди» і атомарна
+ротація з виявленням повторного використання. Перехід з таблиці: REFRESH_SESSION_STORE="redis" разом із
+REFRESH_SESSION_SQL_FALLBACK — старі токени з таблиці приймаються один раз
+і переносяться в Redis при першому оновленні; або одноразово `migrate_sql_sessions`.
+
+Запуск перенесення (з каталогу src, з налаштованим .env):
+    python -m services.session_store
+"""
+
+import asyncio
+import hashlib
+import json
+import math
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Optional
+
+import jwt
+from redis.asyncio import Redis
+
+from config import config_setting
+from repositories.user_repo import TokenRepository
+from utils.cache_manager import get_redis
+from utils.logging import get_logger
+
+
+class SessionReuseError(Exception):
+    """Вже використаний refresh token пред'явлено повторно — ймовірно, його вкрали."""
+
+    def __init__(self, user_id: str) -> None:
+        super().__init__(f"Refresh token reuse for user {user_id}")
+        self.user_id = user_id
+
+
+def _utcnow() -> datetime:
+    # expires_at з create_refresh_token — naive UTC
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+class AbstractSessionStore(ABC):
+    @abstractmethod
+    async def create(
+        self,
+        user_id,
+        refresh_token: str,
+        user_agent: Optional[str],
+        expires_at: datetime,
+    ) -> None:
+        pass
+
+    @abstractmethod
+    async def rotate(
+        self,
+        old_token: str,
+        new_token: str,
+        user_agent: Optional[str],
+        expires_at: datetime,
+    ) -> Optional[str]:
+        """Замінює old_token на new_token; повертає user_id або None, якщо сесії немає."""
+        pass
+
+    @abstractmethod
+    async def revoke(self, refresh_token: str) -> None:
+        pass
+
+    @abstractmethod
+    async def revoke_all(self, user_id) -> None:
+        pass
+
+
+class SqlSessionStore(AbstractSessionStore):
+    def __init__(self, repo: Optional[TokenRepository] = None) -> None:
+        self.repo = repo or TokenRepository()
+
+    async def create(self, user_id, refresh_token, user_agent, expires_at) -> None:
+        await self.repo.insert(
+            data={
+                "user_id": user_id,
+                "refresh_token": refresh_token,
+                "user_agent": user_agent,
+                "expires_at": expires_at,
+            }
+        )
+
+    async def consume(self, refresh_token: str) -> Optional[dict]:
+        return await self.repo.pop(refresh_token)
+
+    async def rotate(
+        self, old_token, new_token, user_agent, expires_at
+    ) -> Optional[str]:
+        session = await self.consume(old_token)
+        if session is None:
+            return None
+        await self.create(session["user_id"], new_token, user_agent, expires_at)
+        return str(session["user_id"])
+
+    async def revoke(self, refresh_token) -> None:
+        await self.repo.delete_where(refresh_token=refresh_token)
+
+    async def revoke_all(self, user_id) -> None:
+        await self.repo.delete_where(user_id=user_id)
+
+
+# Скрипти торкаються лише KEYS: усі ключі користувача мають хеш-тег {<user_id>},
+# тож лежать в одному слоті Redis Cluster. Множина сесій лише продовжується —
+# коротша сесія не скорочує TTL індексу, поки в ньому є довші.
+_EXTEND_INDEX_LUA = """
+if redis.call('PTTL', KEYS[{index}]) < tonumber(ARGV[{ttl}]) then
+    redis.call('PEXPIRE', KEYS[{index}], ARGV[{ttl}])
+end
+"""
+
+# KEYS: ключ сесії, множина сесій користувача
+# ARGV: digest, ttl (мс), JSON сесії
+_CREATE_LUA = (
+    """
+redis.call('SET', KEYS[1], ARGV[3], 'PX', ARGV[2])
+redis.call('SADD', KEYS[2], ARGV[1])
+"""
+    + _EXTEND_INDEX_LUA.format(index=2, ttl=2)
+    + "return 1"
+)
+
+# KEYS: старий ключ сесії, новий ключ сесії, маркер використання старого токена,
+#       множина сесій користувача
+# ARGV: digest старого, digest нового, ttl нової сесії (мс), user_agent, created_at
+_ROTATE_LUA = (
+    """
+local data = redis.call('GET', KEYS[1])
+if not data then
+    if redis.call('EXISTS', KEYS[3]) == 1 then
+        return {'reused'}
+    end
+    return {'invalid'}
+end
+local session = cjson.decode(data)
+redis.call('DEL', KEYS[1])
+redis.call('SET', KEYS[3], session.user_id, 'PX', ARGV[3])
+session.user_agent = ARGV[4]
+session.created_at = ARGV[5]
+redis.call('SET', KEYS[2], cjson.encode(session), 'PX', ARGV[3])
+redis.call('SREM', KEYS[4], ARGV[1])
+redis.call('SADD', KEYS[4], ARGV[2])
+"""
+    + _EXTEND_INDEX_LUA.format(index=4, ttl=3)
+    + "return {'ok', session.user_id}"
+)
+
+
+class RedisSessionStore(AbstractSessionStore):
+    """
+    `<prefix>{<id>}:<sha256>` — JSON сесії з TTL до expires_at; сам токен не зберігається.
+    `<prefix>{<id>}:sessions` — digest-и активних сесій користувача.
+    `<prefix>{<id>}:used:<sha256>` — маркер уже ротованого токена: якщо його пред'являють
+    знову, ротація відхиляється і всі сесії користувача завершуються.
+    id береться з payload refresh token-а без перевірки підпису: він лише обирає
+    слот, а сесія знаходиться тільки за digest-ом саме цього токена.
+    """
+
+    def __init__(
+        self,
+        prefix: str = config_setting.REFRESH_SESSION_PREFIX,
+        legacy: Optional[SqlSessionStore] = None,
+        redis: Optional[Redis] = None,
+    ) -> None:
+        self.prefix = prefix
+        self.legacy = legacy
+        self._redis = redis
+        self._scripts: dict = {}
+
+    @property
+    def redis(self) -> Redis:
+        return self._redis if self._redis is not None else get_redis()
+
+    def _script(self, source: str):
+        if source not in self._scripts:
+            self._scripts[source] = self.redis.register_script(source)
+        return self._scripts[source]
+
+    @staticmethod
+    def digest(refresh_token: str) -> str:
+        return hashlib.sha256(refresh_token.encode()).hexdigest()
+
+    @staticmethod
+    def owner(refresh_token: str) -> Optional[str]:
+        try:
+            payload = jwt.decode(refresh_token, options={"verify_signature": False})
+        except jwt.PyJWTError:
+            return None
+        user_id = payload.get("id")
+        return str(user_id) if user_id is not None else None
+
+    def _session_key(self, user_id, digest: str) -> str:
+        return f"{self.prefix}{{{user_id}}}:{digest}"
+
+    def _used_key(self, user_id, digest: str) -> str:
+        return f"{self.prefix}{{{user_id}}}:used:{digest}"
+
+    def _user_key(self, user_id) -> str:
+        return f"{self.prefix}{{{user_id}}}:sessions"
+
+    @staticmethod
+    def _ttl_ms(expires_at: datetime) -> int:
+        return max(math.ceil((expires_at - _utcnow()).total_seconds() * 1000), 1)
+
+    async def create(self, user_id, refresh_token, user_agent, expires_at) -> None:
+        digest = self.digest(refresh_token)
+        session = {
+            "user_id": str(user_id),
+            "user_agent": user_agent,
+            "created_at": _utcnow().isoformat(),
+        }
+        await self._script(_CREATE_LUA)(
+            keys=[self._session_key(user_id, digest), self._user_key(user_id)],
+            args=[digest, self._ttl_ms(expires_at), json.dumps(session)],
+            client=self.redis,
+        )
+
+    async def rotate(
+        self, old_token, new_token, user_agent, expires_at
+    ) -> Optional[str]:
+        user_id = self.owner(old_token)
+        if user_id is not None:
+            old, new = self.digest(old_token), self.digest(new_token)
+            result = await self._script(_ROTATE_LUA)(
+                keys=[
+                    self._session_key(user_id, old),
+                    self._session_key(user_id, new),
+                    self._used_key(user_id, old),
+                    self._user_key(user_id),
+                ],
+                args=[
+                    old,
+                    new,
+                    self._ttl_ms(expires_at),
+                    user_agent or "",
+                    _utcnow().isoformat(),
+                ],
+                client=self.redis,
+            )
+            status = result[0].decode() if isinstance(result[0], bytes) else result[0]
+            if status == "ok":
+                return result[1].decode() if isinstance(result[1], bytes) else result[1]
+            if status == "reused":
+                get_logger().warning(
+                    f"REFRESH SESSION: token reuse detected for user {user_id}"
+                )
+                await self._revoke_sessions(user_id)
+                raise SessionReuseError(user_id)
+
+        if self.legacy is not None:
+            # сесія, видана до переходу на Redis: забираємо з таблиці і переносимо
+            session = await self.legacy.consume(old_token)
+            if session is not None:
+                await self.create(session["user_id"], new_token, user_agent, expires_at)
+                return str(session["user_id"])
+        return None
+
+    async def revoke(self, refresh_token) -> None:
+        user_id = self.owner(refresh_token)
+        if user_id is not None:
+            digest = self.digest(refresh_token)
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.delete(self._session_key(user_id, digest))
+                pipe.srem(self._user_key(user_id), digest)
+                await pipe.execute()
+        if self.legacy is not None:
+            await self.legacy.revoke(refresh_token)
+
+    async def _revoke_sessions(self, user_id) -> None:
+        # повторюємо, доки індекс не порожній: сесію, ротовану між SMEMBERS і DEL, теж прибираємо
+        user_key = self._user_key(user_id)
+        while digests := await self.redis.smembers(user_key):
+            digests = [d.decode() if isinstance(d, bytes) else d for d in digests]
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.delete(*(self._session_key(user_id, d) for d in digests))
+                pipe.srem(user_key, *digests)
+                await pipe.execute()
+
+    async def revoke_all(self, user_id) -> None:
+        await self._revoke_sessions(user_id)
+        if self.legacy is not None:
+            await self.legacy.revoke_all(user_id)
+
+
+async def migrate_sql_sessions(
+    sql: Optional[SqlSessionStore] = None, target: Optional[RedisSessionStore] = None
+) -> int:
+    """Переносить дійсні сесії з таблиці tokens у Redis і видаляє їх (і протерміновані) з таблиці."""
+    sql = sql or SqlSessionStore()
+    target = target or RedisSessionStore()
+    await sql.repo.delete_expired()
+    moved = 0
+    async for row in sql.repo.stream_all(
+        columns=["refresh_token", "user_id", "user_agent", "expires_at"]
+    ):
+        if row["expires_at"] <= _utcnow():
+            continue
+        await target.create(
+            row["user_id"], row["refresh_token"], row["user_agent"], row["expires_at"]
+        )
+        await sql.repo.delete_where(refresh_token=row["refresh_token"])
+        moved += 1
+    get_logger().info(f"REFRESH SESSION: moved {moved} sessions to Redis")
+    return moved
+
+
+async def purge_expired_sessions(
+    interval: float = config_setting.REFRESH_SESSION_CLEANUP_INTERVAL,
+    sql: Optional[SqlSessionStore] = None,
+) -> None:
+    """Фонова задача з lifespan: протерміновані рядки tokens прибираються раз на interval секунд."""
+    sql = sql or SqlSessionStore()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await sql.repo.delete_expired()
+        except Exception as e:
+            get_logger().warning(f"REFRESH SESSION: cleanup failed: {e}")
+
+
+_session_store: Optional[AbstractSessionStore] = None
+
+
+def get_session_store() -> AbstractSessionStore:
+    global _session_store
+    if _session_store is None:
+        if config_setting.REFRESH_SESSION_STORE == "redis":
+            legacy = (
+                SqlSessionStore()
+                if config_setting.REFRESH_SESSION_SQL_FALLBACK
+                else None
+            )
+            _session_store = RedisSessionStore(legacy=legacy)
+        else:
+            _session_store = SqlSessionStore()
+    return _session_store
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate_sql_sessions())
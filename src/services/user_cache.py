@@ -0,0 +1,141 @@
+import uuid
+from datetime import datetime
+from typing import Awaitable, Callable, Optional
+
+from config import config_setting
+from database import current_uow
+from models.user_model import UserModel
+from utils.cache_manager import (
+    AbstractCache,
+    InvalidationBus,
+    RedisManager,
+    TieredCache,
+    invalidation_bus,
+)
+from utils.logging import get_logger
+from utils.single_flight import SingleFlight
+
+
+# поля, які ніколи не кладемо в кеш
+PRIVATE_FIELDS = ("hash_password",)
+
+_DATETIME_FIELDS = tuple(
+    c.key for c in UserModel.__table__.columns if c.type.python_type is datetime
+)
+
+
+class UserCache:
+    """
+    Read-through кеш користувача для get_current_user поверх TieredCache:
+    L1 — TTL LRU в пам'яті воркера, L2 — Redis (спільний для всіх воркерів).
+    Інвалідація з сервісів, що змінюють користувача, доходить до L1 інших
+    воркерів через InvalidationBus.
+    """
+
+    def __init__(
+        self,
+        l2: Optional[AbstractCache] = None,
+        ttl: int = config_setting.USER_CACHE_TTL,
+        local_ttl: float = config_setting.USER_CACHE_LOCAL_TTL,
+        local_maxsize: int = config_setting.USER_CACHE_LOCAL_MAXSIZE,
+        enabled: bool = config_setting.USER_CACHE_ENABLED,
+        bus: Optional[InvalidationBus] = invalidation_bus,
+    ) -> None:
+        self.cache = TieredCache(
+            l2 if l2 is not None else RedisManager(),
+            ttl=local_ttl,
+            maxsize=local_maxsize,
+            bus=bus,
+        )
+        self.ttl = ttl
+        self.enabled = enabled
+        self.flight = SingleFlight()
+
+    @staticmethod
+    def key(user_id) -> str:
+        return f"user:{user_id}"
+
+    @staticmethod
+    def public(user: dict) -> dict:
+        return {k: v for k, v in user.items() if k not in PRIVATE_FIELDS}
+
+    @staticmethod
+    def _restore(data: dict) -> dict:
+        # з Redis uuid/datetime приходять рядками — повертаємо типи як з БД
+        if isinstance(data.get("id"), str):
+            data["id"] = uuid.UUID(data["id"])
+        for field in _DATETIME_FIELDS:
+            if isinstance(data.get(field), str):
+                data[field] = datetime.fromisoformat(data[field])
+        return data
+
+    async def get(self, user_id) -> Optional[dict]:
+        try:
+            data = await self.cache.get(token=self.key(user_id))
+        except Exception as e:
+            get_logger().warning(f"USER CACHE: {e}")
+            return None
+        return self._restore(dict(data)) if data else None
+
+    async def set(self, user: dict) -> None:
+        try:
+            await self.cache.set(token=self.key(user["id"]), data=user, exp=self.ttl)
+        except Exception as e:
+            get_logger().warning(f"USER CACHE: {e}")
+
+    async def get_or_load(
+        self, user_id, loader: Callable[[], Awaitable[Optional[dict]]]
+    ) -> Optional[dict]:
+        if not self.enabled:
+            user = await loader()
+            return self.public(user) if user else user
+
+        user = await self.get(user_id)
+        if user is not None:
+            return user
+
+        async def load() -> Optional[dict]:
+            user = await loader()
+            if not user:
+                return user
+            user = self.public(user)
+            await self.set(user)
+            return user
+
+        # паралельні промахи по одному користувачу — один запит до БД на воркер
+        user = await self.flight.do(self.key(user_id), load)
+        return dict(user) if user else user
+
+    async def _drop(self, key: str) -> None:
+        try:
+            await self.cache.delete(token=key)
+        except Exception as e:
+            self.cache.invalidate_local(key)
+            get_logger().warning(f"USER CACHE: {e}")
+
+    async def invalidate(self, user_id) -> None:
+        """
+        Видаляє користувача з кешу зараз і ще раз після commit поточного
+        UnitOfWork — щоб паралельний запит не встиг закешувати старий рядок
+        між нашим видаленням і commit.
+        """
+        if not self.enabled:
+            return
+        key = self.key(user_id)
+        await self._drop(key)
+        uow = current_uow()
+        if uow is not None:
+            uow.after_commit(lambda: self._drop(key))
+
+    def stats(self) -> dict:
+        return {"enabled": self.enabled, **self.cache.stats()}
+
+
+_user_cache: Optional[UserCache] = None
+
+
+def get_user_cache() -> UserCache:
+    global _user_cache
+    if _user_cache is None:
+        _user_cache = UserCache()
+    return _user_cache
@@ -3,12 +3,40 @@ from typing import Protocol
 from utils.repository import AbstractRepository
 from repositories.user_repo import TokenRepository
 from schemas.user_schema import UserUpdateAvatar
+from services.user_cache import UserCache
+from utils.logging import get_logger
+
+# зміна цих полів робить недійсними вже видані claims-токени
+REVOKING_FIELDS = ("is_locked", "is_activate", "role_id")
 
 class UserService(Protocol):
-    def __init__(self, user_repo, error_handler, token_repo) -> None:
+    def __init__(
+        self,
+        user_repo,
+        error_handler,
+        token_repo,
+        user_cache=None,
+        token_revocations=None,
+        session_store=None,
+    ) -> None:
         self.user_repo: AbstractRepository = user_repo
         self.error_handler = error_handler
         self.token_repo: TokenRepository = token_repo
+        self.user_cache: UserCache = user_cache
+        self.token_revocations = token_revocations
+        self.session_store = session_store
+
+    async def _invalidate(self, user_id) -> None:
+        if self.user_cache is not None:
+            await self.user_cache.invalidate(user_id)
+
+    async def _revoke_tokens(self, user_id) -> None:
+        if self.token_revocations is None:
+            return
+        try:
+            await self.token_revocations.revoke_user(user_id)
+        except Exception as e:
+            get_logger().warning(f"TOKEN REVOCATION: {e}")
 
 
     async def get_one_user(self, user_id: str) -> dict:
@@ -34,10 +62,15 @@ class UserService(Protocol):
                 raise self.error_handler(status_code=404, detail="User does not exist")
 
             # deleting user tokens
-            await self.token_repo.delete(user_id=uuid)
+            if self.session_store is not None:
+                await self.session_store.revoke_all(uuid)
+            else:
+                await self.token_repo.delete_where(user_id=uuid)
 
             # delete user
             await self.user_repo.delete(id=uuid)
+            await self._invalidate(uuid)
+            await self._revoke_tokens(uuid)
             return {"message": "The user was deleted seccesfully"}
 
         except self.error_handler as e:
@@ -55,6 +88,9 @@ class UserService(Protocol):
                 )
 
             updated_user = await self.user_repo.update(id=user_id, data=update_data)
+            await self._invalidate(user_id)
+            if any(field in update_data for field in REVOKING_FIELDS):
+                await self._revoke_tokens(user_id)
             return updated_user
 
         except self.error_handler as e:
@@ -71,6 +107,7 @@ class UserService(Protocol):
             updated_user_avatar = await self.user_repo.update(id=user_id, data={"avatar": avatar_url})
             if not updated_user_avatar:
                 raise self.error_handler(status_code=500, detail="Failed to update user avatar")
+            await self._invalidate(user_id)
 
             return updated_user_avatar
 
@@ -8,3 +8,17 @@ class AbstractStorage(ABC):
         Upload avatar image and return its public URL.
         """
         pass
+
+    @abstractmethod
+    def upload_file(self, file_bytes: bytes, key: str, content_type: str) -> str:
+        """
+        Upload already processed file under the given key and return its public URL.
+        """
+        pass
+
+    @abstractmethod
+    def delete_files(self, keys: list[str]) -> None:
+        """
+        Delete previously uploaded files by their keys.
+        """
+        pass
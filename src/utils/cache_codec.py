@@ -0,0 +1,260 @@
+import json
+import uuid
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Optional
+
+import msgpack
+import orjson
+
+from config import config_setting
+from utils.logging import get_logger
+
+try:
+    import zstandard
+except ImportError:  # опційна залежність
+    zstandard = None
+
+try:
+    import lz4.frame
+except ImportError:  # опційна залежність
+    lz4 = None
+
+
+class Codec(ABC):
+    id: int
+    name: str
+
+    @abstractmethod
+    def encode(self, obj: Any) -> bytes:
+        pass
+
+    @abstractmethod
+    def decode(self, data: bytes) -> Any:
+        pass
+
+
+# тег типу в orjson-payload-і: {"__t": "uuid", "v": "..."}
+_TAG = "__t"
+_TAG_MARKER = b'"__t"'
+
+
+def _orjson_tag(obj: Any) -> Any:
+    # orjson сам перетворює uuid/datetime на рядки без можливості це перехопити,
+    # тож ці типи позначаємо до серіалізації
+    if isinstance(obj, dict):
+        return {key: _orjson_tag(value) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_orjson_tag(value) for value in obj]
+    if isinstance(obj, uuid.UUID):
+        return {_TAG: "uuid", "v": str(obj)}
+    if isinstance(obj, datetime):
+        return {_TAG: "datetime", "v": obj.isoformat()}
+    if isinstance(obj, date):
+        return {_TAG: "date", "v": obj.isoformat()}
+    if isinstance(obj, Decimal):
+        return {_TAG: "decimal", "v": str(obj)}
+    return obj
+
+
+_ORJSON_UNTAG = {
+    "uuid": uuid.UUID,
+    "datetime": datetime.fromisoformat,
+    "date": date.fromisoformat,
+    "decimal": Decimal,
+}
+
+
+def _orjson_untag(obj: Any) -> Any:
+    if isinstance(obj, dict):
+        if len(obj) == 2 and obj.get(_TAG) in _ORJSON_UNTAG and "v" in obj:
+            return _ORJSON_UNTAG[obj[_TAG]](obj["v"])
+        return {key: _orjson_untag(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_orjson_untag(value) for value in obj]
+    return obj
+
+
+class OrjsonCodec(Codec):
+    """
+    JSON через orjson; uuid, datetime, date і Decimal позначаються тегом і
+    повертаються тими ж типами. Позначення — прохід по структурі в Python,
+    тож для значень з такими типами msgpack швидший; orjson має сенс для
+    великих payload-ів із простих JSON-типів (декодування без тегів — без проходу).
+    """
+
+    id = 1
+    name = "orjson"
+
+    def encode(self, obj: Any) -> bytes:
+        return orjson.dumps(_orjson_tag(obj), option=orjson.OPT_NON_STR_KEYS)
+
+    def decode(self, data: bytes) -> Any:
+        obj = orjson.loads(data)
+        return _orjson_untag(obj) if _TAG_MARKER in data else obj
+
+
+_EXT_UUID = 1
+_EXT_DATETIME = 2
+_EXT_DATE = 3
+_EXT_DECIMAL = 4
+
+
+def _msgpack_default(obj: Any) -> msgpack.ExtType:
+    if isinstance(obj, uuid.UUID):
+        return msgpack.ExtType(_EXT_UUID, obj.bytes)
+    if isinstance(obj, datetime):
+        return msgpack.ExtType(_EXT_DATETIME, obj.isoformat().encode())
+    if isinstance(obj, date):
+        return msgpack.ExtType(_EXT_DATE, obj.isoformat().encode())
+    if isinstance(obj, Decimal):
+        return msgpack.ExtType(_EXT_DECIMAL, str(obj).encode())
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+
+def _msgpack_ext_hook(code: int, data: bytes) -> Any:
+    if code == _EXT_UUID:
+        return uuid.UUID(bytes=data)
+    if code == _EXT_DATETIME:
+        return datetime.fromisoformat(data.decode())
+    if code == _EXT_DATE:
+        return date.fromisoformat(data.decode())
+    if code == _EXT_DECIMAL:
+        return Decimal(data.decode())
+    return msgpack.ExtType(code, data)
+
+
+class MsgpackCodec(Codec):
+    """Компактний бінарний формат; uuid, datetime, date і Decimal повертаються тими ж типами."""
+
+    id = 2
+    name = "msgpack"
+
+    def encode(self, obj: Any) -> bytes:
+        return msgpack.packb(obj, default=_msgpack_default, use_bin_type=True)
+
+    def decode(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, ext_hook=_msgpack_ext_hook, raw=False)
+
+
+class Compressor(ABC):
+    id: int
+    name: str
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        pass
+
+    @abstractmethod
+    def decompress(self, data: bytes) -> bytes:
+        pass
+
+
+class ZstdCompressor(Compressor):
+    id = 1
+    name = "zstd"
+
+    def __init__(self, level: int = 3) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level)
+        self._decompressor = zstandard.ZstdDecompressor()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._decompressor.decompress(data)
+
+
+class Lz4Compressor(Compressor):
+    id = 2
+    name = "lz4"
+
+    def compress(self, data: bytes) -> bytes:
+        return lz4.frame.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return lz4.frame.decompress(data)
+
+
+CODECS = {codec.name: codec for codec in (OrjsonCodec(), MsgpackCodec())}
+_CODECS_BY_ID = {codec.id: codec for codec in CODECS.values()}
+
+_NO_COMPRESSION = 0
+
+
+def _available_compressors() -> dict[str, Compressor]:
+    compressors = {}
+    if zstandard is not None:
+        compressors["zstd"] = ZstdCompressor()
+    if lz4 is not None:
+        compressors["lz4"] = Lz4Compressor()
+    return compressors
+
+
+class CacheSerializer:
+    """
+    Формат значення в Redis: 2 байти заголовка (id кодека, id стиснення) + payload.
+    Кодек обирається за префіксом ключа (простором імен), стиснення —
+    лише для payload-ів від `compress_min_bytes`. Значення без заголовка
+    (записані старим RedisManager як JSON-текст) читаються через json.loads.
+    """
+
+    def __init__(
+        self,
+        namespaces: Optional[dict[str, str]] = None,
+        default: str = "msgpack",
+        compression: Optional[str] = None,
+        compress_min_bytes: int = 1024,
+    ) -> None:
+        # довший префікс має пріоритет: "catalog:page:" перед "catalog:"
+        self.namespaces = sorted(
+            ((prefix, CODECS[name]) for prefix, name in (namespaces or {}).items()),
+            key=lambda item: len(item[0]),
+            reverse=True,
+        )
+        self.default = CODECS[default]
+        self.compress_min_bytes = compress_min_bytes
+
+        self.compressors = _available_compressors()
+        self._compressors_by_id = {c.id: c for c in self.compressors.values()}
+        self.compressor = self.compressors.get(compression) if compression else None
+        if compression and self.compressor is None:
+            get_logger().warning(
+                f"CACHE CODEC: {compression} is not installed, values stay uncompressed"
+            )
+
+    def codec_for(self, key: str) -> Codec:
+        for prefix, codec in self.namespaces:
+            if key.startswith(prefix):
+                return codec
+        return self.default
+
+    def dumps(self, key: str, obj: Any) -> bytes:
+        codec = self.codec_for(key)
+        payload = codec.encode(obj)
+        compression = _NO_COMPRESSION
+        if self.compressor is not None and len(payload) >= self.compress_min_bytes:
+            payload = self.compressor.compress(payload)
+            compression = self.compressor.id
+        return bytes((codec.id, compression)) + payload
+
+    def loads(self, data: Optional[bytes]) -> Any:
+        if not data:
+            return None
+        codec = _CODECS_BY_ID.get(data[0])
+        if codec is None:
+            # legacy: JSON-текст без заголовка
+            return json.loads(data)
+        payload = data[2:]
+        if data[1] != _NO_COMPRESSION:
+            payload = self._compressors_by_id[data[1]].decompress(payload)
+        return codec.decode(payload)
+
+
+serializer = CacheSerializer(
+    namespaces=config_setting.CACHE_CODECS,
+    default=config_setting.CACHE_DEFAULT_CODEC,
+    compression=config_setting.CACHE_COMPRESSION,
+    compress_min_bytes=config_setting.CACHE_COMPRESS_MIN_BYTES,
+)
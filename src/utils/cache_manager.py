@@ -1,11 +1,17 @@
+import asyncio
 import uuid
-from datetime import datetime
+import time
+import weakref
+from collections import OrderedDict
 import json
 from abc import ABC, abstractmethod
+from typing import Any, Hashable, Optional
 
-from redis import Redis
+from redis.asyncio import BlockingConnectionPool, ConnectionPool, Redis
 
 from config import config_setting
+from utils.cache_codec import CacheSerializer, serializer as default_serializer
+from utils.logging import get_logger
 
 
 class AbstractCache(ABC):
@@ -24,43 +30,340 @@ class AbstractCache(ABC):
     async def delete(self, token: str) -> bool:
         pass
 
-class RedisManager(AbstractCache):
-    def __init__(self) -> None:
-        self.redis = Redis(
+    # пакетні операції; реалізації з пайплайнами перевизначають їх одним round trip
+    async def set_many(self, items: dict[str, Any], exp: int) -> list[str]:
+        return [await self.set(token=token, data=data, exp=exp) for token, data in items.items()]
+
+    async def get_many(self, tokens: list[str]) -> list[Any]:
+        return [await self.get(token=token) for token in tokens]
+
+    async def delete_many(self, tokens: list[str]) -> None:
+        for token in tokens:
+            await self.delete(token=token)
+
+    async def pop_many(self, tokens: list[str]) -> list[Any]:
+        values = await self.get_many(tokens)
+        await self.delete_many(tokens)
+        return values
+
+
+_pool: Optional[ConnectionPool] = None
+
+
+def init_redis_pool() -> ConnectionPool:
+    """
+    Один async-пул з'єднань на процес; створюється в lifespan, закривається на shutdown.
+    Під час сплеску запити чекають вільного з'єднання до REDIS_POOL_TIMEOUT секунд,
+    а не отримують одразу "Too many connections".
+    """
+    global _pool
+    if _pool is None:
+        _pool = BlockingConnectionPool(
             host=config_setting.REDIS_HOST,
             port=config_setting.REDIS_PORT,
             password=config_setting.REDIS_PASSWORD,  # ДОДАНО
-            decode_responses=True  # байти -> str
+            # значення — бінарні (CacheSerializer), тому без decode_responses
+            max_connections=config_setting.REDIS_MAX_CONNECTIONS,
+            timeout=config_setting.REDIS_POOL_TIMEOUT,
+            socket_timeout=config_setting.REDIS_SOCKET_TIMEOUT,
+            socket_connect_timeout=config_setting.REDIS_CONNECT_TIMEOUT,
+            health_check_interval=config_setting.REDIS_HEALTH_CHECK_INTERVAL,
         )
+    return _pool
+
+
+def get_redis() -> Redis:
+    # клієнт дешевий — дорогі лише з'єднання, а вони спільні в пулі
+    return Redis(connection_pool=init_redis_pool())
+
+
+async def close_redis() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.aclose()
+        _pool = None
+
+
+class RedisManager(AbstractCache):
+    def __init__(self, serializer: Optional[CacheSerializer] = None) -> None:
+        self.redis = get_redis()
+        self.serializer = serializer or default_serializer
 
     async def set(self, token: str, data: dict, exp: int) -> str:
         try:
-            if isinstance(data, dict):
-                data = {
-                    k: str(v) if isinstance(v, (uuid.UUID, datetime)) else v
-                    for k, v in data.items()
-                }
-            self.redis.set(token, json.dumps(data))
-            if exp:
-                self.redis.expire(token, exp)
+            # SET з EX — один атомарний запит замість SET + EXPIRE
+            await self.redis.set(token, self.serializer.dumps(token, data), ex=exp or None)
             return token
         except Exception as e:
             raise Exception(f"Redis Set Error in {self.set.__name__}: {e}")
 
     async def get(self, token: str) -> dict:
         try:
-            data = self.redis.get(token)
-            if data:
-                return json.loads(data)
+            return self.serializer.loads(await self.redis.get(token))
         except Exception as e:
             raise Exception(f"Redis Get Error in {self.get.__name__}: {e}")
 
     async def delete(self, token: str) -> bool:
         try:
-            self.redis.delete(token)
+            await self.redis.delete(token)
         except Exception as e:
             raise Exception(f"Redis Delete Error in {self.delete.__name__}: {e}")
 
+    async def set_many(self, items: dict[str, Any], exp: int) -> list[str]:
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                for token, data in items.items():
+                    pipe.set(token, self.serializer.dumps(token, data), ex=exp or None)
+                await pipe.execute()
+            return list(items)
+        except Exception as e:
+            raise Exception(f"Redis Set Error in {self.set_many.__name__}: {e}")
+
+    async def get_many(self, tokens: list[str]) -> list[Any]:
+        if not tokens:
+            return []
+        try:
+            return [self.serializer.loads(value) for value in await self.redis.mget(tokens)]
+        except Exception as e:
+            raise Exception(f"Redis Get Error in {self.get_many.__name__}: {e}")
+
+    async def delete_many(self, tokens: list[str]) -> None:
+        if not tokens:
+            return
+        try:
+            await self.redis.delete(*tokens)
+        except Exception as e:
+            raise Exception(f"Redis Delete Error in {self.delete_many.__name__}: {e}")
+
+    async def pop_many(self, tokens: list[str]) -> list[Any]:
+        if not tokens:
+            return []
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                for token in tokens:
+                    pipe.getdel(token)
+                return [self.serializer.loads(value) for value in await pipe.execute()]
+        except Exception as e:
+            raise Exception(f"Redis Pop Error in {self.pop_many.__name__}: {e}")
+
+class TTLCache:
+    """
+    In-process LRU з TTL на кожен запис. Живе в межах одного воркера,
+    тому використовується лише як короткоживучий перший рівень перед Redis.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class InvalidationBus:
+    """
+    Pub/sub канал інвалідації L1: кожен запис у TieredCache публікує ключі,
+    слухач у кожному воркері викидає їх зі своїх L1. Повідомлення від
+    власного процесу ігноруються — його L1 вже оновлено локально.
+    """
+
+    origin = uuid.uuid4().hex
+
+    def __init__(
+        self,
+        channel: str = config_setting.CACHE_INVALIDATION_CHANNEL,
+        poll_timeout: float = 1.0,
+    ) -> None:
+        self.channel = channel
+        self.poll_timeout = poll_timeout
+        self.caches: "weakref.WeakSet[TieredCache]" = weakref.WeakSet()
+        self.connected = False
+
+    def register(self, cache: "TieredCache") -> None:
+        self.caches.add(cache)
+
+    async def publish(self, keys: list[str]) -> None:
+        if keys:
+            await get_redis().publish(self.channel, json.dumps([self.origin, keys]))
+
+    def _evict(self, keys: list[str]) -> None:
+        for cache in self.caches:
+            for key in keys:
+                cache.l1.pop(key)
+
+    def _clear(self) -> None:
+        for cache in self.caches:
+            cache.l1.clear()
+
+    async def listen(self) -> None:
+        """
+        Фонова задача з lifespan; після обриву з'єднання L1 очищається повністю.
+        Читає через get_message(timeout=...): тиша в каналі — порожня відповідь,
+        а не TimeoutError за REDIS_SOCKET_TIMEOUT пулу з перепідпискою і очищенням L1.
+        """
+        while True:
+            try:
+                async with get_redis().pubsub(ignore_subscribe_messages=True) as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    self._clear()  # могли пропустити інвалідації, поки не були підписані
+                    self.connected = True
+                    while True:
+                        message = await pubsub.get_message(
+                            ignore_subscribe_messages=True, timeout=self.poll_timeout
+                        )
+                        if message is None:
+                            continue
+                        origin, keys = json.loads(message["data"])
+                        if origin != self.origin:
+                            self._evict(keys)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                get_logger().warning(f"CACHE INVALIDATION: {e}")
+            finally:
+                self.connected = False
+            await asyncio.sleep(1)
+
+
+invalidation_bus = InvalidationBus()
+
+
+class TieredCache(AbstractCache):
+    """
+    L1 (TTLCache у пам'яті воркера) перед L2 (зазвичай RedisManager).
+    Записи йдуть в обидва рівні і публікуються в InvalidationBus, тож
+    інші воркери не віддають застарілі значення довше, ніж доходить
+    повідомлення pub/sub (або TTL L1, якщо слухач не запущений).
+    Значення з L1 повертаються без копіювання — не мутуйте їх.
+    """
+
+    def __init__(
+        self,
+        l2: AbstractCache,
+        ttl: float = config_setting.CACHE_L1_TTL,
+        maxsize: int = config_setting.CACHE_L1_MAXSIZE,
+        bus: Optional[InvalidationBus] = invalidation_bus,
+    ) -> None:
+        self.l2 = l2
+        self.l1 = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.bus = bus
+        if bus is not None:
+            bus.register(self)
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+
+    def _l1_ttl(self, exp: Optional[int]) -> float:
+        return min(self.l1.ttl, exp) if exp else self.l1.ttl
+
+    async def _publish(self, keys: list[str]) -> None:
+        if self.bus is None:
+            return
+        try:
+            await self.bus.publish(keys)
+        except Exception as e:
+            get_logger().warning(f"CACHE INVALIDATION: {e}")
+
+    async def set(self, token: str, data: Any, exp: int) -> str:
+        await self.l2.set(token=token, data=data, exp=exp)
+        self.l1.set(token, data, ttl=self._l1_ttl(exp))
+        await self._publish([token])
+        return token
+
+    async def get(self, token: str) -> Any:
+        value = self.l1.get(token)
+        if value is not None:
+            self.l1_hits += 1
+            return value
+        value = await self.l2.get(token=token)
+        if value is None:
+            self.misses += 1
+            return None
+        self.l2_hits += 1
+        self.l1.set(token, value)
+        return value
+
+    async def delete(self, token: str) -> bool:
+        self.l1.pop(token)
+        await self.l2.delete(token=token)
+        await self._publish([token])
+
+    async def set_many(self, items: dict[str, Any], exp: int) -> list[str]:
+        await self.l2.set_many(items, exp=exp)
+        for token, data in items.items():
+            self.l1.set(token, data, ttl=self._l1_ttl(exp))
+        await self._publish(list(items))
+        return list(items)
+
+    async def get_many(self, tokens: list[str]) -> list[Any]:
+        values = [self.l1.get(token) for token in tokens]
+        missing = [token for token, value in zip(tokens, values) if value is None]
+        self.l1_hits += len(tokens) - len(missing)
+        if missing:
+            fetched = dict(zip(missing, await self.l2.get_many(missing)))
+            for i, token in enumerate(tokens):
+                if values[i] is None:
+                    values[i] = fetched[token]
+                    if values[i] is None:
+                        self.misses += 1
+                    else:
+                        self.l2_hits += 1
+                        self.l1.set(token, values[i])
+        return values
+
+    async def delete_many(self, tokens: list[str]) -> None:
+        for token in tokens:
+            self.l1.pop(token)
+        await self.l2.delete_many(tokens)
+        await self._publish(tokens)
+
+    async def pop_many(self, tokens: list[str]) -> list[Any]:
+        for token in tokens:
+            self.l1.pop(token)
+        values = await self.l2.pop_many(tokens)
+        await self._publish(tokens)
+        return values
+
+    def invalidate_local(self, token: str) -> None:
+        self.l1.pop(token)
+
+    def stats(self) -> dict:
+        total = self.l1_hits + self.l2_hits + self.misses
+        return {
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "l1_hit_ratio": self.l1_hits / total if total else 0.0,
+            "l2_hit_ratio": self.l2_hits / total if total else 0.0,
+            "hit_ratio": (self.l1_hits + self.l2_hits) / total if total else 0.0,
+            "l1_size": len(self.l1),
+        }
+
+
 # class RedisManager(AbstractCache):
 #     def __init__(self) -> None:
 #         self.redis = Redis(
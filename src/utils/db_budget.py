@@ -0,0 +1,207 @@
+import asyncio
+import time
+import weakref
+from contextvars import ContextVar
+from typing import Callable, Optional
+
+from fastapi import HTTPException, Request, Response, status
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.orm import Session
+
+from config import config_setting
+from utils.logging import get_logger
+
+
+# SQLSTATE query_canceled — так Postgres завершує запит за statement_timeout
+QUERY_CANCELED = "57014"
+
+
+class DbBudget:
+    """Ліміти одного класу маршрутів (catalog, auth, ...)."""
+
+    def __init__(
+        self,
+        name: str,
+        statement_timeout_ms: Optional[int] = None,
+        deadline_ms: Optional[int] = None,
+        concurrency: Optional[int] = None,
+    ) -> None:
+        self.name = name
+        self.statement_timeout_ms = statement_timeout_ms
+        self.deadline_ms = deadline_ms
+        self.concurrency = concurrency
+        self._semaphores: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self.rejected = 0
+
+    @property
+    def semaphore(self) -> Optional[asyncio.Semaphore]:
+        """Семафор поточного event loop: бюджет створюється під час імпорту і не прив'язаний до циклу."""
+        if not self.concurrency:
+            return None
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.concurrency)
+        return semaphore
+
+    @classmethod
+    def from_config(cls, name: str) -> "DbBudget":
+        return cls(
+            name,
+            statement_timeout_ms=config_setting.DB_STATEMENT_TIMEOUTS_MS.get(name),
+            deadline_ms=config_setting.DB_ROUTE_DEADLINES_MS.get(name),
+            concurrency=config_setting.DB_ROUTE_CONCURRENCY.get(name),
+        )
+
+
+class _BudgetState:
+    __slots__ = ("budget", "timed_out")
+
+    def __init__(self, budget: DbBudget) -> None:
+        self.budget = budget
+        self.timed_out = False
+
+
+_budgets: dict[str, DbBudget] = {}
+_current: ContextVar[Optional[_BudgetState]] = ContextVar("db_budget", default=None)
+
+
+def get_budget(name: str) -> DbBudget:
+    budget = _budgets.get(name)
+    if budget is None:
+        budget = _budgets[name] = DbBudget.from_config(name)
+    return budget
+
+
+def _after_begin(session, transaction, connection) -> None:
+    state = _current.get()
+    if state is not None and state.budget.statement_timeout_ms:
+        connection.exec_driver_sql(
+            f"SET LOCAL statement_timeout = {int(state.budget.statement_timeout_ms)}"
+        )
+
+
+def _handle_error(context) -> None:
+    state = _current.get()
+    if (
+        state is not None
+        and getattr(context.original_exception, "sqlstate", None) == QUERY_CANCELED
+    ):
+        state.timed_out = True
+
+
+# after_begin на Session глобальний, тож слухач тримаємо зареєстрованим лише
+# поки виконується хоч один запит з statement_timeout — решта транзакцій його не бачить
+_timeout_scopes = 0
+
+
+def _enter_timeout_scope() -> None:
+    global _timeout_scopes
+    if _timeout_scopes == 0 and not event.contains(
+        Session, "after_begin", _after_begin
+    ):
+        event.listen(Session, "after_begin", _after_begin)
+    _timeout_scopes += 1
+
+
+def _exit_timeout_scope() -> None:
+    global _timeout_scopes
+    _timeout_scopes -= 1
+    if _timeout_scopes == 0 and event.contains(Session, "after_begin", _after_begin):
+        event.remove(Session, "after_begin", _after_begin)
+
+
+def install_db_budgets(engine: AsyncEngine) -> None:
+    if not event.contains(engine.sync_engine, "handle_error", _handle_error):
+        event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+
+def db_budget(name: Optional[str]):
+    """
+    Перевизначає клас бюджету для окремого ендпоінта; `@db_budget(None)` —
+    без бюджету (напр. імпорт, що ходить у зовнішні сервіси).
+    Ставиться під декоратором роутера.
+    """
+
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.__db_budget__ = name
+        return endpoint
+
+    return decorator
+
+
+def _overloaded(budget: DbBudget, reason: str) -> HTTPException:
+    budget.rejected += 1
+    get_logger().warning(f"DB BUDGET {budget.name}: {reason}")
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Сервіс тимчасово перевантажений. Спробуйте пізніше",
+        headers={"Retry-After": str(config_setting.DB_BUDGET_RETRY_AFTER)},
+    )
+
+
+def budgeted_route(default: str) -> type[APIRoute]:
+    """
+    Клас маршруту для APIRouter(route_class=...): кожен запит отримує бюджет
+    класу `default` — SET LOCAL statement_timeout у кожній транзакції,
+    дедлайн на весь обробник і семафор, що не дає одному класу маршрутів
+    зайняти весь пул з'єднань. Перевищення — 503 з Retry-After.
+    """
+
+    class BudgetedRoute(APIRoute):
+        def get_route_handler(self) -> Callable:
+            handler = super().get_route_handler()
+            name = getattr(self.endpoint, "__db_budget__", default)
+            if name is None:
+                return handler
+            budget = get_budget(name)
+            deadline = budget.deadline_ms / 1000 if budget.deadline_ms else None
+
+            async def budgeted_handler(request: Request) -> Response:
+                started = time.monotonic()
+                semaphore = budget.semaphore
+                if semaphore is not None:
+                    try:
+                        await asyncio.wait_for(semaphore.acquire(), timeout=deadline)
+                    except asyncio.TimeoutError:
+                        raise _overloaded(budget, "no free slot")
+
+                state = _BudgetState(budget)
+                token = _current.set(state)
+                if budget.statement_timeout_ms:
+                    _enter_timeout_scope()
+                try:
+                    if deadline:
+                        remaining = deadline - (time.monotonic() - started)
+                        response = await asyncio.wait_for(
+                            handler(request), timeout=remaining
+                        )
+                    else:
+                        response = await handler(request)
+                except asyncio.TimeoutError:
+                    if state.timed_out:
+                        raise _overloaded(budget, "statement_timeout")
+                    raise _overloaded(
+                        budget, f"deadline {budget.deadline_ms} ms exceeded"
+                    )
+                except Exception as e:
+                    if state.timed_out:
+                        raise _overloaded(budget, "statement_timeout") from e
+                    raise
+                finally:
+                    if budget.statement_timeout_ms:
+                        _exit_timeout_scope()
+                    _current.reset(token)
+                    if semaphore is not None:
+                        semaphore.release()
+
+                if state.timed_out:
+                    raise _overloaded(budget, "statement_timeout")
+                return response
+
+            return budgeted_handler
+
+    BudgetedRoute.__name__ = f"BudgetedRoute[{default}]"
+    return BudgetedRoute
@@ -0,0 +1,115 @@
+import asyncio
+import time
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from config import ConfigSettings
+
+
+class PoolMetrics:
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_wait(self, wait: float) -> None:
+        self.checkouts += 1
+        self.total_wait += wait
+        if wait > self.max_wait:
+            self.max_wait = wait
+
+    def as_dict(self) -> dict:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": (
+                self.total_wait / self.checkouts * 1000 if self.checkouts else 0.0
+            ),
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Пул, який рахує час очікування з'єднання (включно з відкриттям нового)
+    і кількість таймаутів DB_POOL_TIMEOUT.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return conn
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def engine_options(settings: ConfigSettings) -> dict:
+    """kwargs для create_async_engine з налаштувань пулу та asyncpg."""
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+    if make_url(settings.DB_URI).get_driver_name() == "asyncpg":
+        server_settings = dict(settings.DB_SERVER_SETTINGS)
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        connect_args = {"statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE}
+        if server_settings:
+            connect_args["server_settings"] = server_settings
+        options["connect_args"] = connect_args
+
+    return options
+
+
+def pool_status(engine: AsyncEngine) -> dict:
+    pool = engine.pool
+    status = {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        # QueuePool.overflow() від'ємний, поки пул не заповнений до pool_size
+        "overflow": max(pool.overflow(), 0),
+    }
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        status.update(metrics.as_dict())
+    return status
+
+
+async def warmup_engine(engine: AsyncEngine, connections: int) -> None:
+    """
+    Відкриває `connections` з'єднань паралельно і повертає їх у пул,
+    щоб перші запити після деплою не платили за TCP/TLS/auth до Postgres.
+    """
+    pool_size = engine.pool.size() if hasattr(engine.pool, "size") else connections
+    count = min(connections, pool_size)
+
+    async def open_connection():
+        conn = engine.connect()
+        await conn.start()
+        return conn
+
+    conns = await asyncio.gather(*(open_connection() for _ in range(count)))
+    for conn in conns:
+        await conn.close()
@@ -0,0 +1,107 @@
+import time
+from contextvars import ContextVar
+from http.cookies import SimpleCookie
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from config import config_setting
+
+
+STICKY_COOKIE = "db_primary_until"
+
+# без DB_REPLICA_URI усі читання йдуть на primary, маршрутизація вимкнена
+replica_enabled = bool(config_setting.DB_REPLICA_URI)
+
+
+class RoutingState:
+    __slots__ = ("primary_until", "wrote")
+
+    def __init__(self, primary_until: float = 0.0) -> None:
+        self.primary_until = primary_until
+        self.wrote = False
+
+
+_routing: ContextVar[Optional[RoutingState]] = ContextVar("db_routing", default=None)
+
+
+def _state() -> RoutingState:
+    state = _routing.get()
+    if state is None:
+        state = RoutingState()
+        _routing.set(state)
+    return state
+
+
+def mark_write() -> None:
+    """Після запису читання цього клієнта йдуть на primary DB_STICKY_PRIMARY_SECONDS секунд."""
+    state = _state()
+    state.wrote = True
+    state.primary_until = time.time() + config_setting.DB_STICKY_PRIMARY_SECONDS
+
+
+def use_primary() -> bool:
+    if not replica_enabled:
+        return True
+    state = _routing.get()
+    return state is not None and state.primary_until > time.time()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context.isinsert or context.isupdate or context.isdelete:
+        mark_write()
+
+
+def install_write_tracking(engine: AsyncEngine) -> None:
+    if not event.contains(
+        engine.sync_engine, "after_cursor_execute", _after_cursor_execute
+    ):
+        event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _sticky_from_headers(headers) -> float:
+    for name, value in headers:
+        if name == b"cookie":
+            morsel = SimpleCookie(value.decode("latin-1")).get(STICKY_COOKIE)
+            if morsel is not None:
+                try:
+                    return float(morsel.value)
+                except ValueError:
+                    return 0.0
+    return 0.0
+
+
+class ReadRoutingMiddleware:
+    """
+    Read-your-writes між запитами: після запису клієнт отримує cookie
+    з часом, до якого його читання маршрутизуються на primary,
+    тож наступний GET не потрапить на репліку, що ще відстає.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        state = RoutingState(_sticky_from_headers(scope.get("headers", [])))
+        token = _routing.set(state)
+
+        async def send_with_cookie(message):
+            if message["type"] == "http.response.start" and state.wrote:
+                max_age = int(config_setting.DB_STICKY_PRIMARY_SECONDS) + 1
+                cookie = (
+                    f"{STICKY_COOKIE}={state.primary_until:.3f}; Max-Age={max_age}; "
+                    "Path=/; HttpOnly; SameSite=Lax"
+                )
+                headers = list(message.get("headers", []))
+                headers.append((b"set-cookie", cookie.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_cookie)
+        finally:
+            _routing.reset(token)
@@ -0,0 +1,36 @@
+from typing import Any, Generic, List, Type, TypeVar
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+SchemaT = TypeVar("SchemaT", bound=BaseModel)
+
+
+class SchemaSerializer(Generic[SchemaT]):
+    """
+    Попередньо скомпільований серіалізатор схеми.
+
+    Валідує ORM-об'єкт один раз (from_attributes) і одразу пише JSON через
+    pydantic-core. Endpoint повертає готовий `Response`, тому FastAPI не
+    проганяє результат повторно через `response_model` і `jsonable_encoder`.
+    `response_model` у декораторі залишається лише для OpenAPI.
+    """
+
+    def __init__(self, schema: Type[SchemaT], many: bool = False) -> None:
+        self.schema = schema
+        self.many = many
+        self.adapter = TypeAdapter(List[schema] if many else schema)
+
+    def validate(self, obj: Any) -> Any:
+        return self.adapter.validate_python(obj, from_attributes=True)
+
+    def dump(self, obj: Any) -> bytes:
+        return self.adapter.dump_json(self.validate(obj))
+
+    def response(self, obj: Any, status_code: int = 200) -> Response:
+        return Response(
+            content=self.dump(obj),
+            status_code=status_code,
+            media_type="application/json",
+        )
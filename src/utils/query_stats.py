@@ -0,0 +1,173 @@
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from config import config_setting
+from utils.logging import get_logger
+
+
+_PARAM_RE = re.compile(r"\$\d+|%\(\w+\)s|\?")
+_IN_LIST_RE = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """SQL без конкретних параметрів: однакові запити з різними id мають однакову форму."""
+    shape = _PARAM_RE.sub("?", statement)
+    shape = _IN_LIST_RE.sub("(?)", shape)
+    return _SPACE_RE.sub(" ", shape).strip()
+
+
+class QueryStats:
+    def __init__(self, repeat_threshold: Optional[int] = None) -> None:
+        self.count = 0
+        self.total_time = 0.0
+        self.slowest_time = 0.0
+        self.slowest_statement: Optional[str] = None
+        self.shapes: Counter = Counter()
+        self.repeat_threshold = (
+            repeat_threshold
+            if repeat_threshold is not None
+            else config_setting.QUERY_REPEAT_WARN_THRESHOLD
+        )
+        self.label = ""
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.total_time += duration
+        if duration > self.slowest_time:
+            self.slowest_time = duration
+            self.slowest_statement = statement
+
+        shape = statement_shape(statement)
+        self.shapes[shape] += 1
+        if self.repeat_threshold and self.shapes[shape] == self.repeat_threshold + 1:
+            get_logger().warning(
+                f"POSSIBLE N+1 {self.label}: statement repeated more than "
+                f"{self.repeat_threshold} times: {shape[:300]}"
+            )
+
+    def repeated(self) -> dict[str, int]:
+        return {
+            shape: n for shape, n in self.shapes.items() if n > self.repeat_threshold
+        }
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.total_time * 1000:.1f};desc="{self.count} queries"'
+
+    def __repr__(self) -> str:
+        return (
+            f"QueryStats(count={self.count}, total={self.total_time * 1000:.1f}ms, "
+            f"slowest={self.slowest_time * 1000:.1f}ms)"
+        )
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar(
+    "query_stats", default=None
+)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    start = conn.info["query_start"].pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - start)
+
+
+def _handle_error(context) -> None:
+    # для запиту, що впав (зокрема за statement_timeout), after_cursor_execute
+    # не викликається — інакше стек ріс би на з'єднаннях, що повертаються в пул
+    conn = context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+def install_query_stats(engine: AsyncEngine) -> None:
+    if event.contains(
+        engine.sync_engine, "before_cursor_execute", _before_cursor_execute
+    ):
+        return
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine.sync_engine, "handle_error", _handle_error)
+
+
+@contextmanager
+def capture_queries(repeat_threshold: Optional[int] = None):
+    stats = QueryStats(repeat_threshold)
+    token = _current_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _current_stats.reset(token)
+
+
+@contextmanager
+def assert_max_queries(limit: int, max_repeats: Optional[int] = None):
+    """
+    Для тестів:
+        with assert_max_queries(3, max_repeats=1):
+            await service.login_handler(...)
+
+    Падає, якщо запитів більше за limit або один і той самий запит
+    повторився більше за max_repeats разів (за замовчуванням — поріг з конфігу).
+    """
+    with capture_queries(max_repeats) as stats:
+        yield stats
+    assert (
+        stats.count <= limit
+    ), f"Expected at most {limit} queries, got {stats.count}: {dict(stats.shapes)}"
+    assert not stats.repeated(), f"Repeated statements (N+1): {stats.repeated()}"
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware: збирає кількість запитів, сумарний час БД і найповільніший
+    запит на кожен HTTP-запит. Статистика доступна як `request.state.db_stats`
+    і віддається в заголовку `Server-Timing`.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        stats = QueryStats()
+        stats.label = f"{scope['method']} {scope['path']}"
+        scope.setdefault("state", {})["db_stats"] = stats
+        token = _current_stats.set(stats)
+
+        async def send_with_stats(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", stats.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _current_stats.reset(token)
+            if stats.count:
+                get_logger().info(
+                    f"DB STATS {stats.label}: {stats.count} queries, "
+                    f"{stats.total_time * 1000:.1f} ms total, "
+                    f"slowest {stats.slowest_time * 1000:.1f} ms: "
+                    f"{(stats.slowest_statement or '')[:200]}"
+                )
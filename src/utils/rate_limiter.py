@@ -0,0 +1,202 @@
+import ipaddress
+import math
+import time
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+
+from config import config_setting
+from utils.cache_manager import TTLCache, get_redis
+from utils.logging import get_logger
+
+
+# GCRA для кількох ключів одразу: запит проходить, лише якщо його пропускають
+# усі ключі (IP, email, ...), і тоді ж оновлюється TAT кожного з них.
+# Повертає {1, 0} або {0, retry_after_ms}.
+GCRA_LUA = """
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local new_tats = {}
+local retry_after = 0
+for i, key in ipairs(KEYS) do
+    local tat = tonumber(redis.call('GET', key) or now)
+    if tat < now then tat = now end
+    local new_tat = tat + interval
+    if new_tat - now > period then
+        retry_after = math.max(retry_after, new_tat - now - period)
+    end
+    new_tats[i] = new_tat
+end
+if retry_after > 0 then
+    return {0, retry_after}
+end
+for i, key in ipairs(KEYS) do
+    redis.call('SET', key, new_tats[i], 'PX', new_tats[i] - now)
+end
+return {1, 0}
+"""
+
+
+class RateLimitPolicy:
+    """`limit` запитів за `period` секунд, з рівномірним поповненням (GCRA)."""
+
+    def __init__(self, name: str, limit: int, period: float) -> None:
+        self.name = name
+        self.limit = limit
+        self.period = period
+        self.interval = period / limit
+
+    @classmethod
+    def parse(cls, name: str, spec: str) -> "RateLimitPolicy":
+        # "5/60" — 5 запитів за 60 секунд
+        limit, period = spec.split("/")
+        return cls(name, int(limit), float(period))
+
+
+class LocalRateLimiter:
+    """Той самий GCRA в пам'яті воркера — запасний варіант, коли Redis недоступний."""
+
+    def __init__(self, maxsize: int = 10_000) -> None:
+        self.maxsize = maxsize
+        self._tats: dict[float, TTLCache] = {}
+
+    def hit(self, policy: RateLimitPolicy, keys: list[str]) -> float:
+        tats = self._tats.get(policy.period)
+        if tats is None:
+            tats = self._tats[policy.period] = TTLCache(
+                maxsize=self.maxsize, ttl=policy.period
+            )
+        now = time.monotonic()
+        new_tats = []
+        retry_after = 0.0
+        for key in keys:
+            tat = max(tats.get(key) or now, now)
+            new_tat = tat + policy.interval
+            if new_tat - now > policy.period:
+                retry_after = max(retry_after, new_tat - now - policy.period)
+            new_tats.append(new_tat)
+        if retry_after:
+            return retry_after
+        for key, new_tat in zip(keys, new_tats):
+            tats.set(key, new_tat, ttl=new_tat - now)
+        return 0.0
+
+
+class RateLimiter:
+    """
+    GCRA у Redis; після збою Redis `breaker_seconds` секунд ліміт рахується
+    лише локально, без спроб Redis — інакше кожен вхід чекав би таймаут пулу.
+    """
+
+    def __init__(
+        self,
+        local: Optional[LocalRateLimiter] = None,
+        breaker_seconds: float = config_setting.RATE_LIMIT_BREAKER_SECONDS,
+    ) -> None:
+        self.local = local or LocalRateLimiter()
+        self.breaker_seconds = breaker_seconds
+        self.degraded = False
+        self._script = None
+        self._redis_retry_at = 0.0
+
+    async def hit(self, policy: RateLimitPolicy, keys: list[str]) -> float:
+        """Повертає 0, якщо запит дозволено, інакше — через скільки секунд повторити."""
+        keys = [f"ratelimit:{policy.name}:{key}" for key in keys]
+        if time.monotonic() < self._redis_retry_at:
+            return self.local.hit(policy, keys)
+        try:
+            redis = get_redis()
+            if self._script is None:
+                # EVALSHA, а після SCRIPT FLUSH / рестарту Redis — автоматично EVAL
+                self._script = redis.register_script(GCRA_LUA)
+            allowed, retry_after_ms = await self._script(
+                keys=keys,
+                args=[int(policy.interval * 1000), int(policy.period * 1000)],
+                client=redis,
+            )
+        except Exception as e:
+            if not self.degraded:
+                get_logger().warning(
+                    f"RATE LIMIT: Redis unavailable, using in-process limiter: {e}"
+                )
+            self.degraded = True
+            self._redis_retry_at = time.monotonic() + self.breaker_seconds
+            return self.local.hit(policy, keys)
+        self.degraded = False
+        return 0.0 if allowed else retry_after_ms / 1000
+
+
+rate_limiter = RateLimiter()
+
+
+_trusted_proxies = tuple(
+    ipaddress.ip_network(net, strict=False) for net in config_setting.TRUSTED_PROXIES
+)
+
+
+def _is_trusted_proxy(host: Optional[str]) -> bool:
+    try:
+        address = ipaddress.ip_address(host)
+    except (TypeError, ValueError):
+        return False
+    return any(address in network for network in _trusted_proxies)
+
+
+def client_ip(request: Request) -> str:
+    """
+    Адреса клієнта для ліміту. Заголовкам проксі віримо лише тоді, коли
+    з'єднання прийшло від довіреного проксі (TRUSTED_PROXIES): береться
+    найправіший недовірений хоп X-Forwarded-For — nginx і проксі fly.io
+    дописують його праворуч, а все лівіше клієнт міг написати сам.
+    """
+    peer = request.client.host if request.client else None
+    if not _is_trusted_proxy(peer):
+        return peer or "unknown"
+    forwarded = request.headers.get("x-forwarded-for")
+    if forwarded:
+        hops = [hop.strip() for hop in forwarded.split(",") if hop.strip()]
+        for hop in reversed(hops):
+            if not _is_trusted_proxy(hop):
+                return hop
+        if hops:
+            return hops[0]
+    return request.headers.get("x-real-ip") or peer
+
+
+async def _request_keys(request: Request) -> list[str]:
+    keys = [f"ip:{client_ip(request)}"]
+    if "user_id" in request.path_params:
+        keys.append(f"user:{request.path_params['user_id']}")
+    if request.headers.get("content-type", "").startswith("application/json"):
+        try:
+            body = (
+                await request.json()
+            )  # Starlette кешує тіло — ендпоінт прочитає його знову
+        except ValueError:
+            body = None
+        if isinstance(body, dict) and isinstance(body.get("email"), str):
+            keys.append(f"email:{body['email'].strip().lower()}")
+    return keys
+
+
+def rate_limit(policy_name: str):
+    """
+    Залежність для ендпоінта: ліміт з RATE_LIMITS[policy_name] за IP клієнта,
+    а також за email з тіла запиту і user_id зі шляху, якщо вони є.
+    """
+    policy = RateLimitPolicy.parse(policy_name, config_setting.RATE_LIMITS[policy_name])
+
+    async def dependency(request: Request) -> None:
+        if not config_setting.RATE_LIMIT_ENABLED:
+            return
+        retry_after = await rate_limiter.hit(policy, await _request_keys(request))
+        if retry_after:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Забагато запитів. Спробуйте пізніше",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+    return dependency
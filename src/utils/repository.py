@@ -1,8 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import Any
-from sqlalchemy import select
-from database import async_session_maker
+from contextlib import nullcontext
+from typing import Any, AsyncIterator, Optional, Sequence, Union
+from sqlalchemy import select, insert, update, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import async_session_maker, async_read_session_maker, current_uow
+from utils.db_routing import use_primary
 from utils.logging import get_logger
+from utils.row_mapper import get_mapper
 
 
 class AbstractRepository(ABC):
@@ -20,6 +24,10 @@ class AbstractRepository(ABC):
     async def get_all(self, *args: Any, **kwargs: Any) -> list[dict]:
         pass
 
+    @abstractmethod
+    def stream_all(self, *args: Any, **kwargs: Any) -> AsyncIterator[dict]:
+        pass
+
     @abstractmethod
     async def update(self, data: dict, *args: Any, **kwargs: Any) -> dict:
         pass
@@ -28,28 +36,66 @@ class AbstractRepository(ABC):
     async def delete(self, *args: Any, **kwargs: Any) -> bool:
         pass
 
+    @abstractmethod
+    async def insert_many(self, data: list[dict]) -> list[dict]:
+        pass
+
+    @abstractmethod
+    async def update_where(self, data: dict, *args: Any, **kwargs: Any) -> list[dict]:
+        pass
+
+    @abstractmethod
+    async def delete_where(self, *args: Any, **kwargs: Any) -> list[dict]:
+        pass
+
 
 class SqlLayer(AbstractRepository):
     model = None
 
+    @property
+    def _to_dict(self):
+        return get_mapper(self.model)
+
+    def _session(self):
+        uow = current_uow()
+        if uow is not None:
+            return nullcontext(uow.session)
+        return async_session_maker()
+
+    def _read_session(self):
+        # читання йдуть на репліку, крім вікна після запису (read-your-writes)
+        if use_primary():
+            return self._session()
+        return async_read_session_maker()
+
+    async def _commit(self, session: AsyncSession) -> None:
+        if current_uow() is None:
+            await session.commit()
+        else:
+            await session.flush()
+
+    async def _rollback(self, session: AsyncSession) -> None:
+        # у межах UnitOfWork відкат робить сам UnitOfWork
+        if current_uow() is None:
+            await session.rollback()
+
     async def insert(self, data: dict) -> dict:
-        async with async_session_maker() as session:
+        async with self._session() as session:
             try:
-                stmt = self.model(**data)
-                session.add(stmt)
-                await session.commit()
+                stmt = insert(self.model).values(**data).returning(self.model)
+                res = (await session.scalars(stmt)).one()
+                await self._commit(session)
                 get_logger().info(
                     f"DATA INSERTED: {self.model.__name__} with data: {data}"
                 )
-                await session.refresh(stmt)
-                return await stmt.to_dict()
+                return self._to_dict(res)
             except Exception as e:
                 get_logger().error(f"ERROR INSERTING: {self.model.__name__}: {e}")
-                await session.rollback()
+                await self._rollback(session)
                 raise Exception(f"Insert Error in {self.model.__class__.__name__}: {e}")
 
     async def get(self, *args: Any, **kwargs: Any) -> dict:
-        async with async_session_maker() as session:
+        async with self._read_session() as session:
             try:
                 stmt = select(self.model).filter_by(**kwargs)
                 res = await session.execute(stmt)
@@ -59,22 +105,68 @@ class SqlLayer(AbstractRepository):
                 get_logger().info(
                     f"DATA GET: {self.model.__name__} with data: {args}, {kwargs}"
                 )
-                return await res.to_dict()
+                return self._to_dict(res)
             except Exception as e:
                 get_logger().info(
                     f"DATA NOT GET: {self.model.__name__} with data: {args}, {kwargs}"
                 )
                 raise Exception(f"Get Error in {self.model.__class__.__name__}: {e}")
 
-    async def get_all(self, *args: Any, **kwargs: Any) -> list[dict]:
-        async with async_session_maker() as session:
+    def _select(
+        self,
+        columns: Optional[Sequence[str]] = None,
+        order_by: Union[str, Sequence[str], None] = None,
+        limit: Optional[int] = None,
+        after: Any = None,
+        **kwargs: Any,
+    ):
+        """
+        columns  — проєкція: лише ці колонки, результат як легкі row mappings;
+        order_by — назви колонок, "-name" для DESC;
+        after    — keyset-пагінація: значення першої колонки order_by з попередньої сторінки.
+        """
+        if columns:
+            stmt = select(*(getattr(self.model, c) for c in columns))
+            stmt = stmt.select_from(self.model)
+        else:
+            stmt = select(self.model)
+        stmt = stmt.filter_by(**kwargs)
+
+        if isinstance(order_by, str):
+            order_by = [order_by]
+        for i, name in enumerate(order_by or []):
+            desc = name.startswith("-")
+            column = getattr(self.model, name.lstrip("-"))
+            if i == 0 and after is not None:
+                stmt = stmt.where(column < after if desc else column > after)
+            stmt = stmt.order_by(column.desc() if desc else column.asc())
+
+        if after is not None and not order_by:
+            raise ValueError("Keyset pagination (after) requires order_by")
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return stmt
+
+    async def get_all(
+        self,
+        *args: Any,
+        columns: Optional[Sequence[str]] = None,
+        order_by: Union[str, Sequence[str], None] = None,
+        limit: Optional[int] = None,
+        after: Any = None,
+        **kwargs: Any,
+    ) -> list[dict]:
+        async with self._read_session() as session:
             try:
-                stmt = select(self.model).filter_by(**kwargs)
+                stmt = self._select(columns, order_by, limit, after, **kwargs)
                 res = await session.execute(stmt)
                 get_logger().info(
                     f"DATA ALL GET: {self.model.__name__} with data: {args}, {kwargs}"
                 )
-                return [await row.to_dict() for row in res.scalars().all() if row]
+                if columns:
+                    return [dict(row) for row in res.mappings().all()]
+                to_dict = self._to_dict
+                return [to_dict(row) for row in res.scalars().all() if row]
             except Exception as e:
                 get_logger().info(
                     f"DATA NOT ALL GET: {self.model.__name__} with data: {args}, {kwargs}"
@@ -83,61 +175,140 @@ class SqlLayer(AbstractRepository):
                     f"Get-all Error in {self.model.__class__.__name__}: {e}"
                 )
 
+    async def stream_all(
+        self,
+        *args: Any,
+        columns: Optional[Sequence[str]] = None,
+        order_by: Union[str, Sequence[str], None] = None,
+        batch_size: int = 1000,
+        **kwargs: Any,
+    ) -> AsyncIterator[dict]:
+        """
+        Серверний курсор для великих вибірок: у пам'яті одночасно не більше
+        `batch_size` рядків. Сесія тримається відкритою, доки генератор не вичерпано.
+        Без `columns` читаються всі колонки як row mappings, а не ORM-об'єкти:
+        рядки не потрапляють в identity map спільної сесії UnitOfWork.
+        """
+        columns = columns or self.model.__mapper__.column_attrs.keys()
+        async with self._read_session() as session:
+            stmt = self._select(columns, order_by, **kwargs).execution_options(
+                yield_per=batch_size
+            )
+            res = await session.stream(stmt)
+            async for row in res.mappings():
+                yield dict(row)
+            get_logger().info(
+                f"DATA STREAMED: {self.model.__name__} with data: {args}, {kwargs}"
+            )
+
     async def update(
         self,
         data: dict,
         *args: Any,
         **kwargs: Any,
     ) -> dict:
-        async with async_session_maker() as session:
+        async with self._session() as session:
             try:
-                stmt = await session.execute(select(self.model).filter_by(**kwargs))
-                res = stmt.scalar_one_or_none()
+                # як і колишній setattr, ключі, що не є колонками моделі, ігноруються
+                columns = self.model.__mapper__.column_attrs.keys()
+                values = {k: v for k, v in data.items() if k in columns}
+                if not values:
+                    return await self.get(*args, **kwargs) or False
+
+                # populate_existing: об'єкт уже в identity map сесії UnitOfWork
+                # інакше повернувся б зі старими значеннями
+                stmt = (
+                    update(self.model)
+                    .filter_by(**kwargs)
+                    .values(**values)
+                    .returning(self.model)
+                    .execution_options(
+                        synchronize_session=False, populate_existing=True
+                    )
+                )
+                res = (await session.scalars(stmt)).first()
 
                 if not res:
                     return False
 
-                for (
-                    key,
-                    value,
-                ) in data.items():
-                    setattr(res, key, value)
-
-                await session.commit()
-                await session.refresh(res)
+                await self._commit(session)
                 get_logger().info(
                     f"DATA UPDATED: {self.model.__name__} with data: {data}, {args}, {kwargs}"
                 )
-                return await res.to_dict()
+                return self._to_dict(res)
             except Exception as e:
-                await session.rollback()
+                await self._rollback(session)
                 get_logger().info(
                     f"DATA NOT UPDATED: {self.model.__name__} with data: {data}, {args}, {kwargs}"
                 )
                 raise Exception(f"Update Error in {self.model.__class__.__name__}: {e}")
 
     async def delete(self, *args: Any, **kwargs: Any) -> bool:
-        async with async_session_maker() as session:
-            try:
-                stmt = await session.execute(select(self.model).filter_by(**kwargs))
-                res = stmt.scalars().all()  # new libe added
-                # res = stmt.scalar_one_or_none()
+        return bool(await self.delete_where(*args, **kwargs))
 
-                for one_res in res:
-                    await session.delete(one_res)
+    async def insert_many(self, data: list[dict]) -> list[dict]:
+        if not data:
+            return []
+        async with self._session() as session:
+            try:
+                res = await session.scalars(
+                    insert(self.model).returning(self.model), data
+                )
+                rows = res.all()
+                await self._commit(session)
+                get_logger().info(
+                    f"DATA BULK INSERTED: {self.model.__name__} rows: {len(rows)}"
+                )
+                return [self._to_dict(row) for row in rows]
+            except Exception as e:
+                get_logger().error(f"ERROR BULK INSERTING: {self.model.__name__}: {e}")
+                await self._rollback(session)
+                raise Exception(f"Insert-many Error in {self.model.__name__}: {e}")
 
-                if not res:
-                    return False
+    async def update_where(self, data: dict, *args: Any, **kwargs: Any) -> list[dict]:
+        async with self._session() as session:
+            try:
+                stmt = (
+                    update(self.model)
+                    .filter_by(**kwargs)
+                    .values(**data)
+                    .returning(self.model)
+                    .execution_options(
+                        synchronize_session=False, populate_existing=True
+                    )
+                )
+                rows = (await session.scalars(stmt)).all()
+                await self._commit(session)
+                get_logger().info(
+                    f"DATA BULK UPDATED: {self.model.__name__} rows: {len(rows)} with data: {data}, {kwargs}"
+                )
+                return [self._to_dict(row) for row in rows]
+            except Exception as e:
+                await self._rollback(session)
+                get_logger().info(
+                    f"DATA NOT BULK UPDATED: {self.model.__name__} with data: {data}, {args}, {kwargs}"
+                )
+                raise Exception(f"Update-where Error in {self.model.__name__}: {e}")
 
-                # await session.delete(res)
-                await session.commit()
+    async def delete_where(self, *args: Any, **kwargs: Any) -> list[dict]:
+        """Один DELETE ... RETURNING; повертає первинні ключі видалених рядків."""
+        async with self._session() as session:
+            try:
+                stmt = (
+                    delete(self.model)
+                    .filter_by(**kwargs)
+                    .returning(*self.model.__mapper__.primary_key)
+                    .execution_options(synchronize_session=False)
+                )
+                rows = (await session.execute(stmt)).mappings().all()
+                await self._commit(session)
                 get_logger().info(
-                    f"DATA DELETED: {self.model.__name__} with data: {args}, {kwargs}"
+                    f"DATA DELETED: {self.model.__name__} rows: {len(rows)} with data: {args}, {kwargs}"
                 )
-                return True
+                return [dict(row) for row in rows]
             except Exception as e:
-                await session.rollback()
+                await self._rollback(session)
                 get_logger().info(
                     f"DATA NOT DELETED: {self.model.__name__} with data: {args}, {kwargs}"
                 )
-                raise Exception(f"Delete Error in {self.model.__class__.__name__}: {e}")
+                raise Exception(f"Delete Error in {self.model.__name__}: {e}")
@@ -0,0 +1,51 @@
+from typing import Any, Callable
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Mapper
+
+
+RowMapper = Callable[[Any], dict]
+
+_registry: dict[type, RowMapper] = {}
+
+
+def compile_mapper(model: type) -> RowMapper:
+    """
+    Генерує синхронну функцію row -> dict з метаданих колонок моделі:
+    один dict-літерал, без корутини і без дескрипторів на кожен рядок.
+    """
+    keys = list(inspect(model).columns.keys())
+    fast = ", ".join(f"{key!r}: d[{key!r}]" for key in keys)
+    slow = ", ".join(f"{key!r}: row.{key}" for key in keys)
+    # завантажені значення лежать у __dict__ екземпляра — читаємо їх напряму,
+    # оминаючи дескриптори; частково завантажений рядок іде через атрибути
+    source = (
+        "def to_dict(row):\n"
+        "    d = row.__dict__\n"
+        "    try:\n"
+        f"        return {{{fast}}}\n"
+        "    except KeyError:\n"
+        f"        return {{{slow}}}\n"
+    )
+    namespace: dict = {}
+    exec(compile(source, f"<row_mapper {model.__name__}>", "exec"), namespace)
+    to_dict = namespace["to_dict"]
+    to_dict.__qualname__ = f"{model.__name__}.to_dict"
+    return to_dict
+
+
+def get_mapper(model: type) -> RowMapper:
+    mapper = _registry.get(model)
+    if mapper is None:
+        mapper = _registry[model] = compile_mapper(model)
+    return mapper
+
+
+def to_dict(row: Any) -> dict:
+    return get_mapper(type(row))(row)
+
+
+@event.listens_for(Mapper, "after_mapper_constructed")
+def _register(mapper: Mapper, class_: type) -> None:
+    # маппери компілюються один раз під час імпорту моделей
+    _registry[class_] = compile_mapper(class_)
@@ -4,12 +4,21 @@ import boto3
 from PIL import Image
 from config import config_setting  # або settings, якщо потрібно
 
-s3 = boto3.client(
-    "s3",
-    aws_access_key_id=config_setting.ACCESS_KEY,
-    aws_secret_access_key=config_setting.SECRET_ACCESS_KEY,
-    region_name=config_setting.AWS_REGION
-)
+_s3_client = None
+
+
+def get_s3_client():
+    """Один boto3-клієнт на процес: створення клієнта коштує десятки мс, а сам він потокобезпечний."""
+    global _s3_client
+    if _s3_client is None:
+        _s3_client = boto3.client(
+            "s3",
+            aws_access_key_id=config_setting.ACCESS_KEY,
+            aws_secret_access_key=config_setting.SECRET_ACCESS_KEY,
+            region_name=config_setting.AWS_REGION
+        )
+    return _s3_client
+
 
 def upload_avatar(file_bytes: bytes, filename: str, content_type: str) -> str:
     # Відкрити зображення
@@ -26,7 +35,7 @@ def upload_avatar(file_bytes: bytes, filename: str, content_type: str) -> str:
     key = f"avatars/{uuid.uuid4()}.webp"
 
     # Завантажити в S3
-    s3.put_object(
+    get_s3_client().put_object(
         Bucket=config_setting.AWS_BUCKET_NAME,
         Key=key,
         Body=buffer,
@@ -0,0 +1,58 @@
+from typing import Optional
+
+from sqlalchemy import MetaData, inspect, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+def alembic_heads(script_location: str) -> set[str]:
+    """Head-ревізії з файлів міграцій — читається локально, без звернень до БД."""
+    from alembic.script import ScriptDirectory
+
+    return set(ScriptDirectory(script_location).get_heads())
+
+
+async def current_revisions(
+    engine: AsyncEngine, version_table: str = "alembic_version"
+) -> set[str]:
+    async with engine.connect() as conn:
+        rows = await conn.execute(text(f"SELECT version_num FROM {version_table}"))
+        return {row[0] for row in rows}
+
+
+async def missing_tables(engine: AsyncEngine, metadata: MetaData) -> list[str]:
+    async with engine.connect() as conn:
+        existing = await conn.run_sync(
+            lambda sync_conn: set(inspect(sync_conn).get_table_names())
+        )
+    return sorted(set(metadata.tables) - existing)
+
+
+async def verify_alembic_head(
+    engine: AsyncEngine,
+    script_location: str,
+    version_table: str = "alembic_version",
+    heads: Optional[set[str]] = None,
+    metadata: Optional[MetaData] = None,
+) -> None:
+    """
+    Дешеві запити замість metadata.create_all: БД має бути на тій самій
+    ревізії, що й код, і мати всі таблиці моделей (`metadata`) — не кожна з них
+    має міграцію. Інакше застосунок не стартує.
+    """
+    expected = heads if heads is not None else alembic_heads(script_location)
+    try:
+        actual = await current_revisions(engine, version_table)
+    except Exception as e:
+        raise RuntimeError(f"Cannot read alembic revision from {version_table}: {e}")
+    if actual != expected:
+        raise RuntimeError(
+            f"Database schema is at {sorted(actual) or 'no revision'}, "
+            f"code expects {sorted(expected)}; run `alembic upgrade head`"
+        )
+    if metadata is not None:
+        missing = await missing_tables(engine, metadata)
+        if missing:
+            raise RuntimeError(
+                f"Tables {missing} are missing from the database at revision "
+                f"{sorted(actual)}; add a migration for them"
+            )
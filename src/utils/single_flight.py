@@ -0,0 +1,54 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Hashable
+
+
+Loader = Callable[[], Awaitable[Any]]
+
+
+class _LeaderCancelled(Exception):
+    """Лідера скасовано (напр. клієнт відключився) — очікувачі мають спробувати самі."""
+
+
+class SingleFlight:
+    """
+    Дедуплікація в межах воркера: поки для ключа виконується fn, інші
+    виклики з тим самим ключем чекають на той самий future і отримують
+    той самий результат (або виняток).
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        self.deduplicated = 0
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    async def do(self, key: Hashable, fn: Loader) -> Any:
+        while (future := self._calls.get(key)) is not None:
+            self.deduplicated += 1
+            try:
+                return await asyncio.shield(future)
+            except _LeaderCancelled:
+                # скасували лідера, а не нас — пробуємо ще раз; власний CancelledError
+                # очікувача проходить далі як є (без Task.cancelling(), якого немає в 3.10)
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # без очікувачів asyncio не логуватиме "never retrieved"
+            raise
+        except BaseException:
+            # зокрема CancelledError — очікувачі спробують самі
+            future.set_exception(_LeaderCancelled())
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
@@ -1,8 +1,21 @@
+import os
+
 from jinja2 import Environment, FileSystemLoader
 
 
+TEMPLATES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+# одне середовище на процес: jinja кешує скомпільовані шаблони всередині нього
+env = Environment(loader=FileSystemLoader(TEMPLATES_DIR))
+
+
+def prime_templates() -> None:
+    """Компілює всі шаблони листів заздалегідь, щоб перший лист не платив за це."""
+    for name in env.list_templates():
+        env.get_template(name)
+
+
 async def get_template(template_name: str, context: dict) -> str:
-    env = Environment(loader=FileSystemLoader("src/utils/templates"))
     template = env.get_template(template_name)
     # print("Template dir:", template)
 
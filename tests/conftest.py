@@ -0,0 +1,101 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Mapped, declarative_base, mapped_column
+from sqlalchemy.pool import NullPool
+
+from config import config_setting
+from utils import repository
+from utils.repository import SqlLayer
+
+
+ItemBase = declarative_base()
+
+
+class ItemModel(ItemBase):
+    __tablename__ = "test_items"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column()
+    owner: Mapped[str] = mapped_column(nullable=True)
+
+
+class ItemRepository(SqlLayer):
+    model = ItemModel
+
+
+@pytest.fixture(scope="session")
+def pg_engine():
+    """
+    Postgres для інтеграційних тестів репозиторію: БД з DB_URI
+    (у CI — сервіс postgres з run_test.yml). Якщо вона недоступна, тести пропускаються.
+    """
+    engine = create_async_engine(config_setting.DB_URI, poolclass=NullPool)
+
+    async def ping():
+        async with engine.connect() as conn:
+            await conn.exec_driver_sql("SELECT 1")
+
+    try:
+        asyncio.run(ping())
+    except Exception as e:
+        pytest.skip(f"Postgres недоступний: {e}")
+    return engine
+
+
+@pytest.fixture
+def item_repo(pg_engine, monkeypatch):
+    async def recreate():
+        async with pg_engine.begin() as conn:
+            await conn.run_sync(ItemBase.metadata.drop_all)
+            await conn.run_sync(ItemBase.metadata.create_all)
+
+    asyncio.run(recreate())
+    monkeypatch.setattr(
+        repository,
+        "async_session_maker",
+        async_sessionmaker(pg_engine, expire_on_commit=False, class_=AsyncSession),
+    )
+    yield ItemRepository()
+
+    async def drop():
+        async with pg_engine.begin() as conn:
+            await conn.run_sync(ItemBase.metadata.drop_all)
+
+    asyncio.run(drop())
+
+
+@pytest.fixture
+def statements(pg_engine):
+    """Список SQL, відправлених на сервер під час тесту (один елемент = один round trip)."""
+    executed = []
+
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        executed.append(statement)
+
+    event.listen(pg_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    yield executed
+    event.remove(pg_engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture
+def round_trips(pg_engine, statements):
+    """
+    Усі звернення до сервера під час тесту: SQL-запити плюс BEGIN/COMMIT/ROLLBACK,
+    які asyncpg відправляє окремими командами.
+    """
+    executed = statements
+    markers = {
+        "begin": lambda conn: executed.append("BEGIN"),
+        "commit": lambda conn: executed.append("COMMIT"),
+        "rollback": lambda conn: executed.append("ROLLBACK"),
+    }
+    for name, fn in markers.items():
+        event.listen(pg_engine.sync_engine, name, fn)
+    yield executed
+    for name, fn in markers.items():
+        event.remove(pg_engine.sync_engine, name, fn)
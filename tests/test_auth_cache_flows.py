@@ -0,0 +1,88 @@
+import asyncio
+import uuid
+
+from fastapi import HTTPException
+
+from services.auth_service import AuthService
+from utils.cache_manager import AbstractCache
+
+
+class RecordingCache(AbstractCache):
+    """Кеш у пам'яті, де кожен виклик методу — один round trip до Redis."""
+
+    calls: list = []
+    data: dict = {}
+
+    async def set(self, token, data, exp):
+        self.calls.append("set")
+        self.data[token] = data
+        return token
+
+    async def get(self, token):
+        self.calls.append("get")
+        return self.data.get(token)
+
+    async def delete(self, token):
+        self.calls.append("delete")
+        self.data.pop(token, None)
+
+    async def set_many(self, items, exp):
+        self.calls.append("set_many")
+        self.data.update(items)
+        return list(items)
+
+    async def pop_many(self, tokens):
+        self.calls.append("pop_many")
+        return [self.data.pop(token, None) for token in tokens]
+
+
+class SilentEmail:
+    async def send_email(self, recipient, subject, body_text):
+        pass
+
+
+async def render(template_name, context):
+    return ""
+
+
+def make_service() -> AuthService:
+    RecordingCache.calls = []
+    RecordingCache.data = {}
+    return AuthService(
+        user_repo=lambda: None,
+        refresh_repo=lambda: None,
+        cache_manager=RecordingCache,
+        email_manager=SilentEmail,
+        security_layer=lambda: None,
+        error_handler=HTTPException,
+        template_handler=render,
+    )
+
+
+def test_verification_token_is_written_in_one_call():
+    service = make_service()
+    user_id = uuid.uuid4()
+
+    code = asyncio.run(
+        service._generate_verification_token({"id": user_id, "email": "a@b.c"}, exp=180)
+    )
+
+    assert RecordingCache.calls == ["set_many"]
+    assert RecordingCache.data[str(user_id)] == code
+    assert RecordingCache.data[code]["email"] == "a@b.c"
+
+
+def test_resend_email_reads_and_clears_keys_in_two_calls():
+    service = make_service()
+    user_id = uuid.uuid4()
+    old_code = asyncio.run(
+        service._generate_verification_token({"id": user_id, "email": "a@b.c"}, exp=180)
+    )
+    RecordingCache.calls.clear()
+
+    asyncio.run(service.resend_email(user_id))
+
+    assert RecordingCache.calls == ["get", "pop_many", "set_many"]
+    new_code = RecordingCache.data[str(user_id)]
+    assert RecordingCache.data[new_code]["count"] == 1
+    assert old_code == new_code or old_code not in RecordingCache.data
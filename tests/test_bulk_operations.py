@@ -0,0 +1,57 @@
+import asyncio
+
+
+def test_insert_many_is_single_statement(item_repo, statements):
+    rows = asyncio.run(
+        item_repo.insert_many([{"name": f"item{i}", "owner": "a"} for i in range(3)])
+    )
+
+    inserts = [s for s in statements if s.startswith("INSERT")]
+    assert len(inserts) == 1
+    assert "RETURNING" in inserts[0]
+    assert [r["name"] for r in rows] == ["item0", "item1", "item2"]
+    assert all(r["id"] for r in rows)
+
+
+def test_update_where_returns_updated_rows(item_repo, statements):
+    async def run():
+        await item_repo.insert_many(
+            [
+                {"name": "x", "owner": "a"},
+                {"name": "y", "owner": "a"},
+                {"name": "z", "owner": "b"},
+            ]
+        )
+        statements.clear()
+        return await item_repo.update_where(owner="a", data={"name": "renamed"})
+
+    rows = asyncio.run(run())
+
+    updates = [s for s in statements if s.startswith("UPDATE")]
+    assert len(updates) == 1
+    assert "RETURNING" in updates[0]
+    assert sorted(r["name"] for r in rows) == ["renamed", "renamed"]
+    assert {r["owner"] for r in rows} == {"a"}
+
+
+def test_delete_where_is_single_statement(item_repo, statements):
+    async def run():
+        inserted = await item_repo.insert_many(
+            [{"name": f"t{i}", "owner": "a"} for i in range(5)]
+            + [{"name": "keep", "owner": "b"}]
+        )
+        statements.clear()
+        deleted = await item_repo.delete_where(owner="a")
+        remaining = await item_repo.get_all()
+        return inserted, deleted, remaining
+
+    inserted, deleted, remaining = asyncio.run(run())
+
+    deletes = [s for s in statements if s.startswith("DELETE")]
+    assert len(deletes) == 1
+    assert sorted(d["id"] for d in deleted) == sorted(r["id"] for r in inserted[:5])
+    assert [r["name"] for r in remaining] == ["keep"]
+
+
+def test_delete_returns_false_when_nothing_matched(item_repo):
+    assert asyncio.run(item_repo.delete(owner="nobody")) is False
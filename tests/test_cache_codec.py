@@ -0,0 +1,85 @@
+import json
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from utils.cache_codec import CacheSerializer
+
+
+def test_msgpack_round_trips_types_losslessly():
+    serializer = CacheSerializer(default="msgpack")
+    value = {
+        "id": uuid.uuid4(),
+        "created_at": datetime(2025, 5, 15, 11, 49, 33, 344240),
+        "birth_date": date(2000, 1, 2),
+        "price": Decimal("199.99"),
+        "count": 0,
+        "tags": ["a", "b"],
+    }
+
+    assert serializer.loads(serializer.dumps("code:1234", value)) == value
+
+
+def test_orjson_namespace_round_trips_types_losslessly():
+    serializer = CacheSerializer(namespaces={"catalog:": "orjson"}, default="msgpack")
+    value = {
+        "id": uuid.uuid4(),
+        "created_at": datetime(2025, 5, 15, 11, 49, 33, 344240),
+        "birth_date": date(2000, 1, 2),
+        "price": Decimal("199.99"),
+        "products": [{"product_id": 1, "owner": uuid.uuid4()}],
+        "tags": ["a", "b"],
+    }
+
+    data = serializer.dumps("catalog:page:1", value)
+    assert serializer.codec_for("catalog:page:1").name == "orjson"
+    assert serializer.loads(data) == value
+
+
+def test_cached_catalog_reads_back_with_cold_read_types():
+    from utils.cache_codec import serializer
+
+    value = {"id": uuid.uuid4(), "created_at": datetime(2025, 5, 15, 11, 49, 33)}
+    for key in ("catalog:page:1", "product:1", "user:1"):
+        assert serializer.loads(serializer.dumps(key, value)) == value
+
+
+def test_codec_is_selected_by_longest_namespace():
+    serializer = CacheSerializer(
+        namespaces={"catalog:": "orjson", "catalog:meta:": "msgpack"}, default="msgpack"
+    )
+
+    assert serializer.codec_for("catalog:page:1").name == "orjson"
+    assert serializer.codec_for("catalog:meta:1").name == "msgpack"
+    assert serializer.codec_for("user:1").name == "msgpack"
+    assert serializer.loads(serializer.dumps("catalog:page:1", {"products": [1]})) == {
+        "products": [1]
+    }
+
+
+def test_large_payloads_are_compressed():
+    pytest.importorskip("zstandard")
+    serializer = CacheSerializer(
+        default="orjson", compression="zstd", compress_min_bytes=100
+    )
+    page = {"products": [{"name": "Товар", "description": "Опис " * 20}] * 50}
+
+    small = serializer.dumps("k", {"a": 1})
+    big = serializer.dumps("k", page)
+
+    assert small[1] == 0
+    assert big[1] != 0 and len(big) < len(json.dumps(page).encode())
+    assert serializer.loads(big) == page
+
+
+def test_legacy_json_values_are_still_readable():
+    serializer = CacheSerializer()
+
+    assert serializer.loads(json.dumps({"id": "x", "count": 1}).encode()) == {
+        "id": "x",
+        "count": 1,
+    }
+    assert serializer.loads(b'"1234"') == "1234"
+    assert serializer.loads(None) is None
@@ -0,0 +1,158 @@
+import asyncio
+import time
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from api.v1.dependencies import get_current_user
+from config import ConfigSettings
+from core.security import JWTAuth
+from core.token_cache import VerifiedTokenCache
+from core.token_revocation import TokenRevocations
+
+
+class FakeSortedSetRedis:
+    """Підмножина redis.asyncio для одного sorted set."""
+
+    def __init__(self):
+        self.zset = {}
+        self.zmscore_calls = 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def zmscore(self, key, members):
+        self.zmscore_calls += 1
+        return [self.zset.get(m) for m in members]
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def zadd(self, key, mapping):
+        self.ops.append(lambda: self.redis.zset.update(mapping))
+
+    def zremrangebyscore(self, key, low, high):
+        def trim():
+            for member, score in list(self.redis.zset.items()):
+                if score <= high:
+                    del self.redis.zset[member]
+
+        self.ops.append(trim)
+
+    async def execute(self):
+        for op in self.ops:
+            op()
+
+
+class NoDbRepo:
+    async def get(self, **kwargs):
+        raise AssertionError("claims-токен не повинен читати БД")
+
+
+def make_user():
+    return {
+        "id": uuid.uuid4(),
+        "email": "user@example.com",
+        "username": "user",
+        "first_name": "Ім'я",
+        "last_name": None,
+        "avatar": None,
+        "role_id": 2,
+        "is_activate": True,
+        "is_locked": False,
+        "hash_password": "secret",
+    }
+
+
+@pytest.fixture
+def revocations():
+    return TokenRevocations(
+        key="test:revoked", retention=3600, redis=FakeSortedSetRedis()
+    )
+
+
+@pytest.fixture
+def auth(monkeypatch, revocations):
+    cache = VerifiedTokenCache(
+        maxsize=10, enabled=True, revocation_check=revocations.is_revoked
+    )
+    monkeypatch.setattr(JWTAuth, "token_cache", cache)
+    return JWTAuth(mode="claims")
+
+
+def current_user(auth, token):
+    service = type("Service", (), {"security_layer": auth, "user_repo": NoDbRepo()})()
+    return asyncio.run(get_current_user(token, service))
+
+
+def test_claims_token_resolves_user_without_db(auth):
+    user = make_user()
+    token = asyncio.run(auth.create_access_token(auth.access_claims(user)))
+
+    resolved = current_user(auth, token)
+    assert resolved["id"] == user["id"]
+    assert resolved["email"] == user["email"]
+    assert resolved["is_locked"] is False
+    assert "hash_password" not in resolved
+
+
+def test_id_mode_keeps_token_minimal():
+    claims = JWTAuth(mode="id").access_claims(make_user())
+    assert set(claims) == {"id"}
+
+
+def test_revoke_user_rejects_previously_issued_tokens(auth, revocations):
+    user = make_user()
+    token = asyncio.run(auth.create_access_token(auth.access_claims(user)))
+    assert current_user(auth, token)
+
+    time.sleep(1)  # iat у секундах — новий токен має бути виданий пізніше
+    asyncio.run(revocations.revoke_user(user["id"]))
+    with pytest.raises(HTTPException) as e:
+        current_user(auth, token)
+    assert e.value.status_code == 401
+
+    fresh = asyncio.run(auth.create_access_token(auth.access_claims(user)))
+    assert current_user(auth, fresh)["id"] == user["id"]
+
+
+def test_revoke_token_rejects_only_that_token(auth, revocations):
+    user = make_user()
+    first = asyncio.run(auth.create_access_token(auth.access_claims(user)))
+    second = asyncio.run(auth.create_access_token(auth.access_claims(user)))
+
+    asyncio.run(revocations.revoke_token(asyncio.run(auth.decode_token(first))["jti"]))
+    with pytest.raises(HTTPException):
+        current_user(auth, first)
+    assert current_user(auth, second)
+    # одна перевірка на запит
+    assert revocations.redis.zmscore_calls == 3
+
+
+def test_old_revocations_are_trimmed(revocations):
+    revocations.redis.zset["user:old"] = time.time() - 7200
+    asyncio.run(revocations.revoke_user("new"))
+    assert set(revocations.redis.zset) == {"user:new"}
+
+
+def test_revocation_retention_covers_the_longest_access_token():
+    settings = ConfigSettings(
+        ACCESS_TOKEN_EXPIRE_MINUTES=30, CLAIMS_ACCESS_TOKEN_EXPIRE_MINUTES=5
+    )
+    assert settings.TOKEN_REVOCATION_RETENTION_MINUTES == 30
+
+    with pytest.raises(ValidationError):
+        ConfigSettings(
+            ACCESS_TOKEN_EXPIRE_MINUTES=30, TOKEN_REVOCATION_RETENTION_MINUTES=15
+        )
@@ -0,0 +1,90 @@
+import asyncio
+
+import httpx
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from utils import db_budget
+from utils.db_budget import DbBudget, budgeted_route, install_db_budgets
+
+
+def make_app(budget: DbBudget, endpoint) -> TestClient:
+    db_budget._budgets[budget.name] = budget
+    router = APIRouter(route_class=budgeted_route(budget.name))
+    router.get("/slow")(endpoint)
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app)
+
+
+def test_deadline_returns_503_with_retry_after():
+    async def slow():
+        await asyncio.sleep(1)
+        return {}
+
+    client = make_app(DbBudget("test_deadline", deadline_ms=50), slow)
+    response = client.get("/slow")
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"]
+
+
+def test_concurrency_limit_rejects_when_no_slot():
+    budget = DbBudget("test_slots", deadline_ms=100, concurrency=1)
+    events = {}
+
+    async def hold():
+        events["entered"].set()
+        await events["release"].wait()
+        return {}
+
+    db_budget._budgets[budget.name] = budget
+    router = APIRouter(route_class=budgeted_route(budget.name))
+    router.get("/slow")(hold)
+    app = FastAPI()
+    app.include_router(router)
+
+    async def run():
+        events.update(entered=asyncio.Event(), release=asyncio.Event())
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            first = asyncio.create_task(client.get("/slow"))
+            await events["entered"].wait()  # слот зайнятий першим запитом
+            second = await client.get("/slow")
+            events["release"].set()
+            await first
+            return second
+
+    assert asyncio.run(run()).status_code == 503
+    # новий event loop отримує власний семафор, а не прив'язаний до попереднього
+    assert asyncio.run(run()).status_code == 503
+
+
+def test_statement_timeout_listener_only_while_budget_is_active():
+    seen = []
+
+    async def check():
+        seen.append(event.contains(Session, "after_begin", db_budget._after_begin))
+        return {}
+
+    client = make_app(DbBudget("test_listener", statement_timeout_ms=100), check)
+    assert client.get("/slow").status_code == 200
+    assert seen == [True]
+    assert not event.contains(Session, "after_begin", db_budget._after_begin)
+
+
+def test_statement_timeout_maps_to_503(pg_engine):
+    install_db_budgets(pg_engine)
+
+    async def query():
+        async with AsyncSession(pg_engine) as session:
+            await session.execute(text("SELECT pg_sleep(1)"))
+        return {}
+
+    client = make_app(DbBudget("test_statement", statement_timeout_ms=50), query)
+    assert client.get("/slow").status_code == 503
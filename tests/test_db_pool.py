@@ -0,0 +1,48 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from config import config_setting
+from utils.db_pool import InstrumentedQueuePool, engine_options, pool_status
+
+
+def test_engine_options_pass_asyncpg_settings():
+    settings = config_setting.model_copy(
+        update={
+            "DB_URI": "postgresql+asyncpg://u:p@localhost/db",
+            "DB_POOL_SIZE": 3,
+            "DB_STATEMENT_CACHE_SIZE": 0,
+            "DB_STATEMENT_TIMEOUT_MS": 5000,
+            "DB_SERVER_SETTINGS": {"application_name": "reserve"},
+        }
+    )
+    options = engine_options(settings)
+
+    assert options["poolclass"] is InstrumentedQueuePool
+    assert options["pool_size"] == 3
+    assert options["connect_args"] == {
+        "statement_cache_size": 0,
+        "server_settings": {"application_name": "reserve", "statement_timeout": "5000"},
+    }
+
+
+def test_pool_status_reports_checked_out_connections(pg_engine):
+    engine = create_async_engine(
+        config_setting.DB_URI,
+        **engine_options(config_setting.model_copy(update={"DB_POOL_SIZE": 2})),
+    )
+
+    async def run():
+        async with engine.connect() as conn:
+            await conn.exec_driver_sql("SELECT 1")
+            during = pool_status(engine)
+        after = pool_status(engine)
+        await engine.dispose()
+        return during, after
+
+    during, after = asyncio.run(run())
+
+    assert during["checked_out"] == 1
+    assert after["checked_out"] == 0
+    assert after["checked_in"] == 1
+    assert after["checkouts"] == 1
@@ -0,0 +1,65 @@
+import asyncio
+
+from services.image_pipeline import ImagePipeline, pick_variant
+from utils.abstract_storage import AbstractStorage
+
+
+class MemoryStorage(AbstractStorage):
+    def __init__(self):
+        self.files = {}
+
+    def upload_avatar(self, file_bytes, filename, content_type):
+        raise NotImplementedError
+
+    def upload_file(self, file_bytes, key, content_type):
+        self.files[key] = file_bytes
+        return f"https://bucket/{key}"
+
+    def delete_files(self, keys):
+        for key in keys:
+            del self.files[key]
+
+
+class CountingPipeline(ImagePipeline):
+    """Замість завантаження й ресайзу — лише запис трьох варіантів і облік паралельності."""
+
+    def __init__(self, storage, concurrency):
+        super().__init__(storage, executor=object(), concurrency=concurrency)
+        self.active = 0
+        self.peak = 0
+
+    async def process(self, client, url, prefix):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        urls = {
+            name: await self._upload(b"webp", key=f"{url}-{name}.webp")
+            for name in ("thumb", "card", "full")
+        }
+        self.active -= 1
+        return urls | {"original": url}
+
+
+def test_process_many_is_bounded():
+    pipeline = CountingPipeline(MemoryStorage(), concurrency=3)
+    results = asyncio.run(pipeline.process_many({i: f"img{i}" for i in range(20)}))
+
+    assert len(results) == 20
+    assert pipeline.peak == 3
+    assert pick_variant(results[0], "thumb") == "https://bucket/img0-thumb.webp"
+
+
+def test_discard_removes_uploads_until_kept():
+    storage = MemoryStorage()
+    pipeline = CountingPipeline(storage, concurrency=2)
+
+    asyncio.run(pipeline.process_many({1: "a", 2: "b"}))
+    assert len(storage.files) == 6
+    # транзакція імпорту не вдалася
+    asyncio.run(pipeline.discard_uploads())
+    assert storage.files == {}
+
+    asyncio.run(pipeline.process_many({3: "c"}))
+    pipeline.keep_uploads()
+    asyncio.run(pipeline.discard_uploads())
+    assert len(storage.files) == 3
@@ -0,0 +1,23 @@
+from fastapi.testclient import TestClient
+
+from config import config_setting
+from services import image_pipeline
+from utils import cache_manager
+
+
+def test_ready_only_between_warmup_and_shutdown(monkeypatch):
+    monkeypatch.setattr(config_setting, "DB_STARTUP_MODE", "skip")
+    from main import get_application
+
+    app = get_application()
+    assert TestClient(app).get("/health/ready").status_code == 503
+
+    with TestClient(app) as client:
+        response = client.get("/health/ready")
+        assert response.status_code == 200
+        assert response.json() == {"ready": True}
+        image_pipeline.get_image_executor()
+
+    assert app.state.ready is False
+    assert image_pipeline._executor is None
+    assert cache_manager._pool is None
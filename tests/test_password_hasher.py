@@ -0,0 +1,52 @@
+import asyncio
+import time
+
+from core.password_hasher import PasswordHasher, PasswordHasherBusy
+from core.security import SecurityBase
+
+
+def test_hash_and_verify_round_trip():
+    security = SecurityBase()
+
+    async def run():
+        hashed = await security.hash_password("secret")
+        return (
+            await security.verify_password("secret", hashed),
+            await security.verify_password("wrong", hashed),
+        )
+
+    assert asyncio.run(run()) == (True, False)
+
+
+def test_event_loop_keeps_running_during_hashing():
+    hasher = PasswordHasher(workers=2, queue_limit=4)
+    ticks = []
+
+    async def ticker():
+        for _ in range(10):
+            ticks.append(time.perf_counter())
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(hasher.hash("secret"), hasher.hash("other"), ticker())
+
+    asyncio.run(run())
+    hasher.shutdown()
+    # жоден проміжок між тіками не дорівнює часу bcrypt
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.1
+    assert hasher.stats()["completed"] == 2
+
+
+def test_rejects_when_queue_is_full():
+    hasher = PasswordHasher(workers=1, queue_limit=1)
+
+    async def run():
+        return await asyncio.gather(
+            *(hasher._run(time.sleep, 0.1) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(run())
+    hasher.shutdown()
+    assert sum(isinstance(r, PasswordHasherBusy) for r in results) == 1
+    assert hasher.rejected == 1
+    assert hasher.stats()["peak_in_flight"] == 2
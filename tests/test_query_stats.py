@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from utils.query_stats import (
+    QueryStats,
+    assert_max_queries,
+    capture_queries,
+    install_query_stats,
+    statement_shape,
+)
+
+
+def test_statement_shape_ignores_parameters():
+    a = statement_shape("SELECT * FROM product WHERE product_id = $1")
+    b = statement_shape("SELECT *\n  FROM product WHERE product_id = $2")
+    assert a == b
+    assert statement_shape(
+        "SELECT * FROM t WHERE id IN ($1, $2, $3)"
+    ) == statement_shape("SELECT * FROM t WHERE id IN ($1)")
+
+
+def test_query_stats_tracks_slowest_and_repeats():
+    stats = QueryStats(repeat_threshold=2)
+    for i, duration in enumerate([0.001, 0.005, 0.002]):
+        stats.record(f"SELECT * FROM brand WHERE brand_id = ${i + 1}", duration)
+    stats.record("SELECT 1", 0.0)
+
+    assert stats.count == 4
+    assert stats.slowest_time == 0.005
+    assert stats.repeated() == {"SELECT * FROM brand WHERE brand_id = ?": 3}
+
+
+def test_assert_max_queries_detects_n_plus_one(item_repo, pg_engine):
+    install_query_stats(pg_engine)
+    asyncio.run(item_repo.insert_many([{"name": f"n{i}"} for i in range(3)]))
+
+    async def per_row():
+        for i in range(1, 4):
+            await item_repo.get(id=i)
+
+    with pytest.raises(AssertionError, match="N\\+1"):
+        with assert_max_queries(10, max_repeats=2) as stats:
+            asyncio.run(per_row())
+    assert stats.count == 3
+
+    with capture_queries() as stats:
+        asyncio.run(item_repo.get_all())
+    assert stats.count == 1
+
+
+def test_failed_statement_does_not_leak_start_time(pg_engine):
+    install_query_stats(pg_engine)
+
+    async def fail_then_succeed():
+        async with pg_engine.connect() as conn:
+            for _ in range(3):
+                with pytest.raises(Exception):
+                    await conn.exec_driver_sql("SELECT * FROM no_such_table")
+                await conn.rollback()
+            await conn.exec_driver_sql("SELECT 1")
+            raw = await conn.get_raw_connection()
+            return raw.info.get("query_start")
+
+    assert asyncio.run(fail_then_succeed()) == []
@@ -0,0 +1,138 @@
+import asyncio
+
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+
+from config import config_setting
+from utils import rate_limiter
+from utils.rate_limiter import LocalRateLimiter, RateLimitPolicy, client_ip, rate_limit
+
+
+def test_local_limiter_allows_burst_then_reports_retry_after():
+    limiter = LocalRateLimiter()
+    policy = RateLimitPolicy.parse("test", "3/60")
+
+    assert [limiter.hit(policy, ["ip:1"]) for _ in range(3)] == [0.0, 0.0, 0.0]
+    retry_after = limiter.hit(policy, ["ip:1"])
+    assert 0 < retry_after <= policy.interval
+    assert limiter.hit(policy, ["ip:2"]) == 0.0
+
+
+def test_local_limiter_denies_when_any_key_is_exhausted():
+    limiter = LocalRateLimiter()
+    policy = RateLimitPolicy.parse("test", "1/60")
+
+    assert limiter.hit(policy, ["ip:1", "email:a@b.c"]) == 0.0
+    # інший IP, але той самий email
+    assert limiter.hit(policy, ["ip:2", "email:a@b.c"]) > 0
+    # відхилений запит не витрачає ліміт IP
+    assert limiter.hit(policy, ["ip:2"]) == 0.0
+
+
+def test_dependency_falls_back_to_local_limiter_and_returns_429(monkeypatch):
+    def broken_redis():
+        raise ConnectionError("redis is down")
+
+    monkeypatch.setattr(rate_limiter, "get_redis", broken_redis)
+    monkeypatch.setattr(rate_limiter, "rate_limiter", rate_limiter.RateLimiter())
+    monkeypatch.setitem(config_setting.RATE_LIMITS, "test_login", "2/60")
+
+    app = FastAPI()
+
+    @app.post("/login", dependencies=[Depends(rate_limit("test_login"))])
+    async def login(data: dict):
+        return {"email": data["email"]}
+
+    client = TestClient(app)
+    body = {"email": "User@Example.com", "password": "x"}
+    assert client.post("/login", json=body).status_code == 200
+    assert client.post("/login", json=body).json() == {"email": "User@Example.com"}
+
+    response = client.post("/login", json=body)
+    assert response.status_code == 429
+    assert int(response.headers["retry-after"]) >= 1
+    assert rate_limiter.rate_limiter.degraded
+
+    # той самий email з іншої адреси теж обмежений
+    other_ip = client.post(
+        "/login",
+        json={"email": "user@example.com"},
+        headers={"X-Forwarded-For": "10.0.0.9"},
+    )
+    assert other_ip.status_code == 429
+
+
+def test_redis_failure_opens_the_breaker(monkeypatch):
+    calls = []
+
+    class FailingRedis:
+        def register_script(self, source):
+            async def script(keys, args, client):
+                calls.append(keys)
+                raise TimeoutError("Timeout connecting to server")
+
+            return script
+
+    monkeypatch.setattr(rate_limiter, "get_redis", FailingRedis)
+    limiter = rate_limiter.RateLimiter(breaker_seconds=10)
+    policy = RateLimitPolicy.parse("test", "100/60")
+
+    async def hits(count):
+        return [await limiter.hit(policy, ["ip:1"]) for _ in range(count)]
+
+    assert asyncio.run(hits(5)) == [0.0] * 5
+    # лише перша спроба дійшла до Redis, решта — одразу локально
+    assert len(calls) == 1 and limiter.degraded
+
+    limiter._redis_retry_at -= 10  # минув breaker_seconds
+    asyncio.run(hits(2))
+    assert len(calls) == 2
+
+
+def make_request(peer, headers):
+    return Request(
+        {
+            "type": "http",
+            "client": (peer, 50000),
+            "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        }
+    )
+
+
+def test_client_ip_trusts_headers_only_from_proxies():
+    spoofed = {
+        "X-Forwarded-For": "1.2.3.4",
+        "X-Real-IP": "1.2.3.4",
+        "Fly-Client-IP": "1.2.3.4",
+    }
+    assert client_ip(make_request("203.0.113.7", spoofed)) == "203.0.113.7"
+
+    # nginx дописує адресу клієнта праворуч від того, що той надіслав
+    via_nginx = {"X-Forwarded-For": "1.2.3.4, 203.0.113.7", "X-Real-IP": "203.0.113.7"}
+    assert client_ip(make_request("172.18.0.5", via_nginx)) == "203.0.113.7"
+    assert (
+        client_ip(make_request("172.18.0.5", {"X-Real-IP": "203.0.113.7"}))
+        == "203.0.113.7"
+    )
+
+
+def test_spoofed_forwarded_for_does_not_reset_the_bucket(monkeypatch):
+    monkeypatch.setattr(rate_limiter, "get_redis", lambda: None)
+    monkeypatch.setattr(rate_limiter, "rate_limiter", rate_limiter.RateLimiter())
+    monkeypatch.setitem(config_setting.RATE_LIMITS, "test_spoof", "2/60")
+
+    app = FastAPI()
+
+    @app.post("/forgot", dependencies=[Depends(rate_limit("test_spoof"))])
+    async def forgot():
+        return {}
+
+    client = TestClient(app)
+    statuses = [
+        client.post(
+            "/forgot",
+            headers={"X-Forwarded-For": f"10.0.0.{i}", "X-Real-IP": f"10.0.1.{i}"},
+        ).status_code
+        for i in range(4)
+    ]
+    assert statuses == [200, 200, 429, 429]
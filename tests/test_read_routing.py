@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from config import config_setting
+from utils import db_routing, repository
+from utils.db_routing import (
+    ReadRoutingMiddleware,
+    install_write_tracking,
+    mark_write,
+    use_primary,
+)
+
+
+@pytest.fixture
+def replica(pg_engine, item_repo, monkeypatch):
+    """Та сама БД під другим engine — «репліка» для тестів маршрутизації."""
+    engine = create_async_engine(config_setting.DB_URI, poolclass=NullPool)
+    executed = []
+
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        executed.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", before_cursor_execute)
+    install_write_tracking(pg_engine)
+    monkeypatch.setattr(db_routing, "replica_enabled", True)
+    monkeypatch.setattr(
+        repository,
+        "async_read_session_maker",
+        async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession),
+    )
+    yield executed
+
+
+def test_reads_go_to_replica(item_repo, replica, statements):
+    asyncio.run(item_repo.get_all())
+
+    assert len(replica) == 1 and replica[0].startswith("SELECT")
+    assert statements == []
+
+
+def test_reads_stick_to_primary_after_write(item_repo, replica, statements):
+    async def run():
+        await item_repo.insert({"name": "fresh"})
+        sticky = await item_repo.get(name="fresh")
+        db_routing._routing.get().primary_until = time.time() - 1
+        await item_repo.get_all()
+        return sticky
+
+    assert asyncio.run(run())["name"] == "fresh"
+    assert [s.split()[0] for s in statements] == ["INSERT", "SELECT"]
+    assert len(replica) == 1
+
+
+def test_middleware_sets_and_honours_sticky_cookie(monkeypatch):
+    monkeypatch.setattr(db_routing, "replica_enabled", True)
+    app = FastAPI()
+    app.add_middleware(ReadRoutingMiddleware)
+
+    @app.post("/write")
+    async def write():
+        mark_write()
+        return {}
+
+    @app.get("/read")
+    async def read():
+        return {"primary": use_primary()}
+
+    client = TestClient(app)
+    assert client.get("/read").json() == {"primary": False}
+
+    response = client.post("/write")
+    assert db_routing.STICKY_COOKIE in response.headers["set-cookie"]
+    assert client.get("/read").json() == {"primary": True}
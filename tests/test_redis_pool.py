@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+from redis.asyncio import Connection
+from redis.exceptions import ConnectionError
+
+from config import config_setting
+from utils import cache_manager
+
+
+class IdleConnection(Connection):
+    """З'єднання без сокета — пулу достатньо, що воно «підключене» і порожнє."""
+
+    async def connect(self):
+        pass
+
+    async def can_read_destructive(self):
+        return False
+
+    async def disconnect(self, nowait=False):
+        pass
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(config_setting, "REDIS_MAX_CONNECTIONS", 2)
+    monkeypatch.setattr(config_setting, "REDIS_POOL_TIMEOUT", 0.2)
+    monkeypatch.setattr(cache_manager, "_pool", None)
+    pool = cache_manager.init_redis_pool()
+    pool.connection_class = IdleConnection
+    yield pool
+    monkeypatch.setattr(cache_manager, "_pool", None)
+
+
+def test_saturated_pool_queues_instead_of_failing(pool):
+    async def run():
+        held = [await pool.get_connection("GET") for _ in range(2)]
+        waiting = asyncio.create_task(pool.get_connection("GET"))
+        await asyncio.sleep(0.05)
+        assert not waiting.done()
+        await pool.release(held.pop())
+        return await asyncio.wait_for(waiting, timeout=1)
+
+    assert isinstance(asyncio.run(run()), IdleConnection)
+
+
+def test_saturated_pool_fails_after_timeout(pool):
+    async def run():
+        for _ in range(2):
+            await pool.get_connection("GET")
+        await pool.get_connection("GET")
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(run())
@@ -0,0 +1,85 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+
+@pytest.fixture
+def seeded_repo(item_repo):
+    asyncio.run(
+        item_repo.insert_many(
+            [
+                {"name": f"item{i:02d}", "owner": "a" if i % 2 else "b"}
+                for i in range(10)
+            ]
+        )
+    )
+    return item_repo
+
+
+def test_projection_returns_only_requested_columns(seeded_repo, statements):
+    rows = asyncio.run(seeded_repo.get_all(columns=["id"], owner="a", order_by="id"))
+
+    assert len(rows) == 5
+    assert all(set(row) == {"id"} for row in rows)
+    assert statements[-1].startswith("SELECT test_items.id \nFROM test_items")
+
+
+def test_order_by_and_limit(seeded_repo):
+    rows = asyncio.run(seeded_repo.get_all(order_by="-name", limit=3))
+
+    assert [r["name"] for r in rows] == ["item09", "item08", "item07"]
+
+
+def test_keyset_pagination(seeded_repo):
+    async def pages():
+        result, after = [], None
+        while True:
+            page = await seeded_repo.get_all(
+                columns=["id", "name"], order_by="id", limit=4, after=after
+            )
+            if not page:
+                return result
+            result.append([r["name"] for r in page])
+            after = page[-1]["id"]
+
+    assert asyncio.run(pages()) == [
+        ["item00", "item01", "item02", "item03"],
+        ["item04", "item05", "item06", "item07"],
+        ["item08", "item09"],
+    ]
+
+
+def test_keyset_pagination_requires_order_by(seeded_repo):
+    with pytest.raises(Exception):
+        asyncio.run(seeded_repo.get_all(after=1))
+
+
+def test_stream_all(seeded_repo):
+    async def collect(**kwargs):
+        return [row async for row in seeded_repo.stream_all(batch_size=3, **kwargs)]
+
+    entities = asyncio.run(collect(order_by="id"))
+    projected = asyncio.run(collect(columns=["name"], owner="b", order_by="name"))
+
+    assert [r["name"] for r in entities] == [f"item{i:02d}" for i in range(10)]
+    assert projected == [{"name": f"item{i:02d}"} for i in range(0, 10, 2)]
+
+
+def test_stream_all_leaves_unit_of_work_objects_attached(seeded_repo, monkeypatch):
+    import database
+    from database import UnitOfWork
+    from utils import repository
+
+    monkeypatch.setattr(database, "async_session_maker", repository.async_session_maker)
+
+    async def run():
+        async with UnitOfWork() as uow:
+            item = (await uow.session.scalars(select(seeded_repo.model).limit(1))).one()
+            streamed = [row async for row in seeded_repo.stream_all(batch_size=3)]
+            item.name = "renamed"  # інший репозиторій змінює вже завантажений об'єкт
+        return item.id, len(streamed), await seeded_repo.get(id=item.id)
+
+    item_id, streamed, row = asyncio.run(run())
+    assert streamed == 10
+    assert row["name"] == "renamed"
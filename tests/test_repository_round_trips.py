@@ -0,0 +1,56 @@
+import asyncio
+
+from database import UnitOfWork
+
+
+def test_insert_is_one_statement(item_repo, round_trips):
+    row = asyncio.run(item_repo.insert(data={"name": "token", "owner": "a"}))
+
+    assert row["id"] and row["name"] == "token"
+    assert [s.split()[0] for s in round_trips] == ["BEGIN", "INSERT", "COMMIT"]
+    assert "RETURNING" in round_trips[1]
+
+
+def test_update_is_one_statement(item_repo, round_trips):
+    async def run():
+        row = await item_repo.insert(data={"name": "old", "owner": "a"})
+        round_trips.clear()
+        return await item_repo.update(id=row["id"], data={"name": "new", "unknown": 1})
+
+    row = asyncio.run(run())
+
+    assert row["name"] == "new" and row["owner"] == "a"
+    assert [s.split()[0] for s in round_trips] == ["BEGIN", "UPDATE", "COMMIT"]
+    assert "RETURNING" in round_trips[1]
+
+
+def test_update_missing_row_returns_false(item_repo, round_trips):
+    assert asyncio.run(item_repo.update(id=404, data={"name": "x"})) is False
+    assert "COMMIT" not in round_trips
+
+
+def test_update_after_get_in_unit_of_work_returns_fresh_row(
+    item_repo, round_trips, monkeypatch
+):
+    import database
+    from utils import repository
+
+    monkeypatch.setattr(database, "async_session_maker", repository.async_session_maker)
+
+    async def run():
+        row = await item_repo.insert(data={"name": "old", "owner": "a"})
+        round_trips.clear()
+        async with UnitOfWork():
+            await item_repo.get(id=row["id"])
+            return await item_repo.update(id=row["id"], data={"name": "new"})
+
+    row = asyncio.run(run())
+
+    assert row["name"] == "new"
+    assert [s.split()[0] for s in round_trips] == [
+        "BEGIN",
+        "SELECT",
+        "UPDATE",
+        "COMMIT",
+    ]
+
@@ -0,0 +1,24 @@
+import uuid
+from datetime import datetime
+
+from models.user_model import UserModel
+from utils.row_mapper import to_dict
+
+
+def test_user_dict_uses_column_names():
+    now = datetime(2025, 5, 15, 11, 49, 33)
+    user = UserModel(
+        id=uuid.uuid4(),
+        email="user@example.com",
+        auth_type="local",
+        created_at=now,
+        updated_at=now,
+        role_id=2,
+    )
+
+    row = to_dict(user)
+
+    # колишній to_dict віддавав "update_at" і не мав auth_type / role_id
+    assert set(row) == set(UserModel.__mapper__.column_attrs.keys())
+    assert row["updated_at"] == now and "update_at" not in row
+    assert row["auth_type"] == "local" and row["role_id"] == 2
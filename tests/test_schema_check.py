@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, Table, text
+
+from config import config_setting
+from utils.schema_check import alembic_heads, verify_alembic_head
+
+
+VERSION_TABLE = "test_alembic_version"
+
+
+def test_alembic_heads_reads_migration_scripts():
+    assert alembic_heads(config_setting.ALEMBIC_SCRIPT_LOCATION) == {"d98bad5c71f8"}
+
+
+@pytest.fixture
+def version_table(pg_engine):
+    async def setup():
+        async with pg_engine.begin() as conn:
+            await conn.execute(text(f"DROP TABLE IF EXISTS {VERSION_TABLE}"))
+            await conn.execute(
+                text(f"CREATE TABLE {VERSION_TABLE} (version_num varchar(32))")
+            )
+            await conn.execute(text(f"INSERT INTO {VERSION_TABLE} VALUES ('abc123')"))
+
+    async def drop():
+        async with pg_engine.begin() as conn:
+            await conn.execute(text(f"DROP TABLE IF EXISTS {VERSION_TABLE}"))
+
+    asyncio.run(setup())
+    yield
+    asyncio.run(drop())
+
+
+def test_verify_passes_on_head(pg_engine, version_table):
+    asyncio.run(
+        verify_alembic_head(
+            pg_engine, "", version_table=VERSION_TABLE, heads={"abc123"}
+        )
+    )
+
+
+def test_verify_fails_on_mismatch(pg_engine, version_table):
+    with pytest.raises(RuntimeError, match="alembic upgrade head"):
+        asyncio.run(
+            verify_alembic_head(
+                pg_engine, "", version_table=VERSION_TABLE, heads={"def456"}
+            )
+        )
+
+
+def test_verify_fails_without_version_table(pg_engine):
+    with pytest.raises(RuntimeError, match="Cannot read alembic revision"):
+        asyncio.run(
+            verify_alembic_head(
+                pg_engine, "", version_table="missing_version", heads={"x"}
+            )
+        )
+
+
+def test_verify_fails_when_a_model_table_is_missing(pg_engine, version_table):
+    metadata = MetaData()
+    Table(VERSION_TABLE, metadata, Column("version_num", Integer))
+    Table("table_without_migration", metadata, Column("id", Integer))
+
+    with pytest.raises(RuntimeError, match=r"\['table_without_migration'\]"):
+        asyncio.run(
+            verify_alembic_head(
+                pg_engine,
+                "",
+                version_table=VERSION_TABLE,
+                heads={"abc123"},
+                metadata=metadata,
+            )
+        )
@@ -0,0 +1,289 @@
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+
+import jwt
+import pytest
+from fastapi import HTTPException
+from redis.crc import key_slot
+
+from core.security import JWTAuth
+from core.token_cache import VerifiedTokenCache
+from services.auth_service import AuthService
+from services.session_store import (
+    AbstractSessionStore,
+    RedisSessionStore,
+    SessionReuseError,
+    SqlSessionStore,
+)
+
+
+class MemorySessionStore(AbstractSessionStore):
+    """Та сама семантика, що й у RedisSessionStore, у dict."""
+
+    def __init__(self):
+        self.sessions = {}
+        self.used = {}
+
+    async def create(self, user_id, refresh_token, user_agent, expires_at):
+        self.sessions[refresh_token] = str(user_id)
+
+    async def rotate(self, old_token, new_token, user_agent, expires_at):
+        user_id = self.sessions.pop(old_token, None)
+        if user_id is None:
+            if old_token in self.used:
+                await self.revoke_all(self.used[old_token])
+                raise SessionReuseError(self.used[old_token])
+            return None
+        self.used[old_token] = user_id
+        self.sessions[new_token] = user_id
+        return user_id
+
+    async def revoke(self, refresh_token):
+        self.sessions.pop(refresh_token, None)
+
+    async def revoke_all(self, user_id):
+        self.sessions = {t: u for t, u in self.sessions.items() if u != str(user_id)}
+
+
+class UserRepo:
+    def __init__(self, user):
+        self.user = user
+        self.calls = 0
+
+    async def get(self, **kwargs):
+        self.calls += 1
+        return dict(self.user)
+
+    async def update(self, data, **kwargs):
+        self.user.update(data)
+        return dict(self.user)
+
+
+class ResetCache:
+    """id -> токен скидання -> користувач, як їх лишає forgot_password_handler."""
+
+    def __init__(self, user):
+        self.data = {str(user["id"]): "reset-token", "reset-token": dict(user)}
+
+    async def get(self, token):
+        return self.data.get(token)
+
+
+class RecordingRevocations:
+    def __init__(self):
+        self.users = []
+
+    async def revoke_user(self, user_id):
+        self.users.append(user_id)
+
+
+def make_service(store, user):
+    revocations = RecordingRevocations()
+    service = AuthService(
+        user_repo=lambda: UserRepo(user),
+        refresh_repo=lambda: None,
+        cache_manager=lambda: ResetCache(user),
+        email_manager=lambda: None,
+        security_layer=JWTAuth,
+        error_handler=HTTPException,
+        template_handler=None,
+        token_revocations=revocations,
+        session_store=store,
+    )
+    return service, revocations
+
+
+def refresh(service, token):
+    return asyncio.run(
+        service.recreate_access_handler({"refresh_token": token, "user_agent": "test"})
+    )
+
+
+def test_refresh_rotates_the_session():
+    store = MemorySessionStore()
+    user = {"id": uuid.uuid4(), "email": "a@b.c"}
+    service, _ = make_service(store, user)
+
+    first = asyncio.run(service._generate_token_pair(user, user_agent="test"))[
+        "refresh_token"
+    ]
+    second = refresh(service, first)["refresh_token"]
+
+    assert second != first
+    assert list(store.sessions) == [second]
+
+
+def test_reused_refresh_token_ends_all_sessions():
+    store = MemorySessionStore()
+    user = {"id": uuid.uuid4(), "email": "a@b.c"}
+    service, revocations = make_service(store, user)
+
+    stolen = asyncio.run(service._generate_token_pair(user, user_agent="test"))[
+        "refresh_token"
+    ]
+    asyncio.run(service._generate_token_pair(user, user_agent="other device"))
+    refresh(service, stolen)
+
+    with pytest.raises(HTTPException) as e:
+        refresh(service, stolen)
+    assert e.value.status_code == 401
+    assert store.sessions == {}
+    assert revocations.users == [str(user["id"])]
+
+
+def test_unknown_refresh_token_is_rejected():
+    user = {"id": uuid.uuid4(), "email": "a@b.c"}
+    service, _ = make_service(MemorySessionStore(), user)
+    token, _ = asyncio.run(
+        service.security_layer.create_refresh_token({"id": str(user["id"])})
+    )
+
+    with pytest.raises(HTTPException) as e:
+        refresh(service, token)
+    assert e.value.status_code == 401
+
+
+def test_revoked_refresh_token_is_unauthorized(monkeypatch):
+    user = {"id": uuid.uuid4(), "email": "a@b.c"}
+    service, _ = make_service(MemorySessionStore(), user)
+    token = asyncio.run(service._generate_token_pair(user, user_agent="test"))[
+        "refresh_token"
+    ]
+
+    async def revoked(claims):
+        return True
+
+    monkeypatch.setattr(
+        JWTAuth,
+        "token_cache",
+        VerifiedTokenCache(maxsize=10, enabled=True, revocation_check=revoked),
+    )
+    with pytest.raises(HTTPException) as e:
+        refresh(service, token)
+    # 410 лишається для інших помилок токена; відкликаний — повторний вхід
+    assert e.value.status_code == 401
+
+
+def test_password_change_keeps_only_the_current_device_session():
+    store = MemorySessionStore()
+    user = {"id": uuid.uuid4(), "email": "a@b.c"}
+    service, revocations = make_service(store, user)
+    asyncio.run(service._generate_token_pair(user, user_agent="other device"))
+
+    result = asyncio.run(
+        service.change_password_handler(
+            {
+                "id": user["id"],
+                "hash_password": "new-pass",
+                "repeat_password": "new-pass",
+                "user_agent": "test",
+            }
+        )
+    )
+
+    assert list(store.sessions) == [result["refresh_token"]]
+    assert result["access_token"]
+    assert revocations.users == [user["id"]]
+
+
+class PoppingRepo:
+    def __init__(self, rows):
+        self.rows = rows
+        self.inserted = []
+
+    async def pop(self, refresh_token):
+        return self.rows.pop(refresh_token, None)
+
+    async def insert(self, data):
+        self.inserted.append(data)
+        return data
+
+    async def delete_expired(self, **kwargs):
+        return 0
+
+
+def test_redis_store_migrates_legacy_sql_session(monkeypatch):
+    user_id = uuid.uuid4()
+    legacy = SqlSessionStore(
+        PoppingRepo({"old": {"user_id": user_id, "user_agent": "ua"}})
+    )
+    store = RedisSessionStore(legacy=legacy, redis=object())
+    created = []
+
+    async def not_in_redis(keys, args, client):
+        return [b"invalid"]
+
+    async def create(user_id, refresh_token, user_agent, expires_at):
+        created.append((str(user_id), refresh_token))
+
+    monkeypatch.setattr(store, "_script", lambda source: not_in_redis)
+    monkeypatch.setattr(store, "create", create)
+    expires_at = datetime.utcnow() + timedelta(days=1)
+
+    assert asyncio.run(store.rotate("old", "new", "ua", expires_at)) == str(user_id)
+    assert created == [(str(user_id), "new")]
+    # рядок із таблиці видалено — вдруге токен не приймається
+    assert asyncio.run(store.rotate("old", "newer", "ua", expires_at)) is None
+
+
+def make_refresh_token(user_id):
+    return jwt.encode({"id": str(user_id), "jti": uuid.uuid4().hex}, "secret")
+
+
+@pytest.fixture
+def redis_store():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # Lua-скрипти у fakeredis
+    store = RedisSessionStore(prefix="s:", redis=fakeredis.FakeAsyncRedis())
+    script_keys = []
+    script = store._script
+
+    def recording(source):
+        run = script(source)
+
+        async def call(keys, args, client):
+            script_keys.append(keys)
+            return await run(keys=keys, args=args, client=client)
+
+        return call
+
+    store._script = recording
+    return store, script_keys
+
+
+def test_redis_store_scripts_touch_one_slot_per_user(redis_store):
+    store, script_keys = redis_store
+    user_id = uuid.uuid4()
+    expires_at = datetime.utcnow() + timedelta(days=1)
+    stolen, other = make_refresh_token(user_id), make_refresh_token(user_id)
+
+    async def run():
+        await store.create(user_id, stolen, "ua", expires_at)
+        await store.create(user_id, other, "other", expires_at)
+        await store.rotate(stolen, make_refresh_token(user_id), "ua", expires_at)
+        with pytest.raises(SessionReuseError):
+            await store.rotate(stolen, make_refresh_token(user_id), "ua", expires_at)
+        return await store.redis.keys("s:*")
+
+    remaining = asyncio.run(run())
+    # лишається тільки маркер використання; усі сесії та індекс видалено
+    assert remaining == [store._used_key(user_id, store.digest(stolen)).encode()]
+    for keys in script_keys:
+        assert len({key_slot(key.encode()) for key in keys}) == 1
+
+
+def test_rotation_never_shortens_the_session_index(redis_store):
+    store, _ = redis_store
+    user_id = uuid.uuid4()
+    week = datetime.utcnow() + timedelta(days=7)
+    day = datetime.utcnow() + timedelta(days=1)
+    short = make_refresh_token(user_id)
+
+    async def run():
+        await store.create(user_id, make_refresh_token(user_id), "laptop", week)
+        await store.create(user_id, short, "phone", day)
+        await store.rotate(short, make_refresh_token(user_id), "phone", day)
+        return await store.redis.pttl(store._user_key(user_id))
+
+    assert asyncio.run(run()) > timedelta(days=6).total_seconds() * 1000
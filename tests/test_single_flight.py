@@ -0,0 +1,60 @@
+import asyncio
+
+from utils.single_flight import SingleFlight
+
+
+def counting_loader(value="fresh", delay=0.01):
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return value
+
+    return loader, calls
+
+
+def test_single_flight_shares_result_and_errors():
+    flight = SingleFlight()
+    loader, calls = counting_loader()
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def run():
+        results = await asyncio.gather(*(flight.do("k", loader) for _ in range(20)))
+        errors = await asyncio.gather(
+            *(flight.do("e", failing) for _ in range(5)), return_exceptions=True
+        )
+        return results, errors
+
+    results, errors = asyncio.run(run())
+    assert results == ["fresh"] * 20
+    assert len(calls) == 1
+    assert flight.deduplicated == 19 + 4
+    assert all(isinstance(e, ValueError) for e in errors)
+    assert not flight.in_flight("k")
+
+
+def test_cancelled_leader_lets_waiters_retry():
+    flight = SingleFlight()
+    loader, calls = counting_loader(delay=0.05)
+
+    async def run():
+        leader = asyncio.create_task(flight.do("k", loader))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(flight.do("k", loader)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        # скасований очікувач не зачіпає інших
+        waiters[0].cancel()
+        return await asyncio.gather(leader, *waiters, return_exceptions=True)
+
+    leader, cancelled, *results = asyncio.run(run())
+    assert isinstance(leader, asyncio.CancelledError)
+    assert isinstance(cancelled, asyncio.CancelledError)
+    assert results == ["fresh", "fresh"]
+    assert len(calls) == 2
+    assert not flight.in_flight("k")
+
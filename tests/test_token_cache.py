@@ -0,0 +1,80 @@
+import asyncio
+import time
+
+import jwt
+import pytest
+
+from core.security import JWTAuth
+from core.token_cache import VerifiedTokenCache
+
+
+@pytest.fixture
+def auth(monkeypatch):
+    cache = VerifiedTokenCache(maxsize=10, enabled=True)
+    monkeypatch.setattr(JWTAuth, "token_cache", cache)
+    return JWTAuth()
+
+
+def test_signature_is_verified_once_per_token(auth, monkeypatch):
+    token = asyncio.run(auth.create_access_token({"id": "42"}))
+    decodes = []
+    original = jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        decodes.append(1)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(jwt, "decode", counting_decode)
+
+    async def run():
+        return [await auth.decode_token(token) for _ in range(5)]
+
+    payloads = asyncio.run(run())
+    assert {p["id"] for p in payloads} == {"42"}
+    assert len(decodes) == 1
+    assert auth.token_cache.stats()["hits"] == 4
+
+
+def test_entries_expire_with_the_token(auth):
+    token = jwt.encode(
+        {"id": "42", "exp": int(time.time()) + 1},
+        auth.SECRET_KEY,
+        algorithm=auth.ALGORITHM,
+    )
+    asyncio.run(auth.decode_token(token))
+    assert auth.token_cache.get(token) is not None
+
+    time.sleep(1.1)
+    assert auth.token_cache.get(token) is None
+    with pytest.raises(ValueError):
+        asyncio.run(auth.decode_token(token))
+
+
+def test_revocation_check_applies_to_cached_tokens(auth):
+    token = asyncio.run(auth.create_access_token({"id": "42"}))
+    asyncio.run(auth.decode_token(token))
+
+    revoked = {"42"}
+
+    async def check(claims):
+        return claims["id"] in revoked
+
+    auth.token_cache.revocation_check = check
+    with pytest.raises(ValueError):
+        asyncio.run(auth.decode_token(token))
+
+    revoked.clear()
+    assert asyncio.run(auth.decode_token(token))["id"] == "42"
+
+
+def test_forged_token_is_not_served_from_cache(auth):
+    token = asyncio.run(auth.create_access_token({"id": "42"}))
+    asyncio.run(auth.decode_token(token))
+    forged = jwt.encode(
+        {"id": "42", "exp": int(time.time()) + 60},
+        "other-secret",
+        algorithm=auth.ALGORITHM,
+    )
+
+    with pytest.raises(ValueError):
+        asyncio.run(auth.decode_token(forged))
@@ -0,0 +1,146 @@
+import asyncio
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Mapped, declarative_base, mapped_column
+
+import database
+from database import UnitOfWork, current_uow, no_unit_of_work, unit_of_work
+from utils import repository
+from utils.repository import SqlLayer
+
+
+ItemBase = declarative_base()
+
+
+class ItemModel(ItemBase):
+    __tablename__ = "items"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    name: Mapped[str] = mapped_column()
+
+
+class FakeResult:
+    def __init__(self, item):
+        self.item = item
+
+    def scalar_one_or_none(self):
+        return self.item
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return [self.item] if self.item else []
+
+    def one(self):
+        return self.item
+
+    def first(self):
+        return self.item
+
+
+class FakeSession:
+    """Сесія-заглушка: рахує відкриті сесії (=з'єднання) і commit-и."""
+
+    opened = 0
+    commits = 0
+
+    def __init__(self):
+        FakeSession.opened += 1
+        self.item = ItemModel(id=1, name="first")
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def add(self, obj):
+        self.item = obj
+
+    async def execute(self, stmt):
+        return FakeResult(self.item)
+
+    async def scalars(self, stmt, params=None):
+        return FakeResult(self.item)
+
+    async def commit(self):
+        FakeSession.commits += 1
+
+    async def flush(self):
+        pass
+
+    async def refresh(self, obj):
+        pass
+
+    async def rollback(self):
+        pass
+
+    async def close(self):
+        pass
+
+
+class ItemRepository(SqlLayer):
+    model = ItemModel
+
+
+@pytest.fixture(autouse=True)
+def fake_sessions(monkeypatch):
+    FakeSession.opened = 0
+    FakeSession.commits = 0
+    monkeypatch.setattr(database, "async_session_maker", FakeSession)
+    monkeypatch.setattr(repository, "async_session_maker", FakeSession)
+
+
+async def login_like_flow():
+    repo = ItemRepository()
+    await repo.get(id=1)
+    await repo.insert(data={"id": 2, "name": "token"})
+    await repo.update(id=2, data={"name": "renamed"})
+
+
+def test_without_unit_of_work_each_call_opens_session():
+    asyncio.run(login_like_flow())
+
+    assert FakeSession.opened == 3
+    assert FakeSession.commits == 2
+
+
+def test_unit_of_work_shares_one_session_and_commits_once():
+    async def run():
+        async with UnitOfWork():
+            await login_like_flow()
+
+    asyncio.run(run())
+
+    assert FakeSession.opened == 1
+    assert FakeSession.commits == 1
+
+
+def test_no_unit_of_work_opt_out():
+    async def run():
+        async with UnitOfWork():
+            async with no_unit_of_work():
+                await login_like_flow()
+
+    asyncio.run(run())
+
+    assert FakeSession.opened == 3
+
+
+def test_request_dependency_scopes_unit_of_work():
+    app = FastAPI(dependencies=[Depends(unit_of_work)])
+
+    @app.get("/")
+    async def endpoint():
+        await login_like_flow()
+        return {"uow": current_uow() is not None}
+
+    response = TestClient(app).get("/")
+
+    assert response.json() == {"uow": True}
+    assert FakeSession.opened == 1
+    assert FakeSession.commits == 1
+    assert current_uow() is None
@@ -0,0 +1,227 @@
+import asyncio
+import uuid
+from datetime import datetime
+
+from database import UnitOfWork
+from services.user_cache import UserCache
+from utils import cache_manager
+from utils.cache_manager import (
+    AbstractCache,
+    InvalidationBus,
+    RedisManager,
+    TieredCache,
+)
+
+
+class DictCache(AbstractCache):
+    """L2-заглушка з тією ж серіалізацією, що й RedisManager."""
+
+    def __init__(self):
+        self.data = {}
+
+    async def set(self, token, data, exp):
+        self.data[token] = {
+            k: str(v) if isinstance(v, (uuid.UUID, datetime)) else v
+            for k, v in data.items()
+        }
+        return token
+
+    async def get(self, token):
+        value = self.data.get(token)
+        return dict(value) if value else None
+
+    async def delete(self, token):
+        self.data.pop(token, None)
+
+
+def make_user():
+    return {
+        "id": uuid.uuid4(),
+        "email": "user@example.com",
+        "created_at": datetime(2024, 1, 2, 3, 4, 5),
+        "hash_password": "secret",
+    }
+
+
+def test_read_through_hits_l1_then_l2():
+    l2 = DictCache()
+    cache = UserCache(
+        l2=l2, ttl=60, local_ttl=60, local_maxsize=10, enabled=True, bus=None
+    )
+    user = make_user()
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        return dict(user)
+
+    async def run():
+        first = await cache.get_or_load(user["id"], loader)
+        second = await cache.get_or_load(user["id"], loader)
+        cache.cache.l1.clear()
+        third = await cache.get_or_load(user["id"], loader)
+        return first, second, third
+
+    first, second, third = asyncio.run(run())
+
+    assert len(loads) == 1
+    assert "hash_password" not in first
+    assert "hash_password" not in l2.data[cache.key(user["id"])]
+    assert first == second == third
+    assert third["id"] == user["id"] and third["created_at"] == user["created_at"]
+    assert cache.stats()["l1_hits"] == 1
+    assert cache.stats()["l2_hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_invalidate_drops_both_levels_and_again_after_commit():
+    l2 = DictCache()
+    cache = UserCache(
+        l2=l2, ttl=60, local_ttl=60, local_maxsize=10, enabled=True, bus=None
+    )
+    user = make_user()
+    key = cache.key(user["id"])
+
+    async def run():
+        await cache.set(cache.public(user))
+        async with UnitOfWork(session_factory=lambda: None):
+            await cache.invalidate(user["id"])
+            # паралельний запит встигає закешувати старий рядок до commit
+            await cache.set(cache.public(user))
+        return key in l2.data, cache.cache.l1.get(key)
+
+    assert asyncio.run(run()) == (False, None)
+
+
+def test_disabled_cache_always_loads():
+    cache = UserCache(l2=DictCache(), enabled=False, bus=None)
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        return make_user()
+
+    async def run():
+        for _ in range(3):
+            user = await cache.get_or_load("x", loader)
+        return user
+
+    assert "hash_password" not in asyncio.run(run())
+    assert len(loads) == 3
+
+
+def test_redis_failure_falls_back_to_loader():
+    class BrokenRedis(RedisManager):
+        def __init__(self):
+            pass
+
+        async def get(self, token):
+            raise Exception("Redis Get Error")
+
+        async def set(self, token, data, exp):
+            raise Exception("Redis Set Error")
+
+    cache = UserCache(l2=BrokenRedis(), enabled=True, bus=None)
+    user = make_user()
+
+    async def loader():
+        return dict(user)
+
+    assert asyncio.run(cache.get_or_load(user["id"], loader))["email"] == user["email"]
+
+
+class LocalBus(InvalidationBus):
+    """Шина без Redis: публікація одразу доходить до інших «воркерів»."""
+
+    def __init__(self, peers):
+        super().__init__()
+        self.origin = uuid.uuid4().hex
+        self.peers = peers
+        peers.append(self)
+
+    async def publish(self, keys):
+        for bus in self.peers:
+            if bus is not self:
+                bus._evict(keys)
+
+
+def test_tiered_cache_write_evicts_other_workers_l1():
+    l2, peers = DictCache(), []
+    worker_a = TieredCache(l2, ttl=60, maxsize=10, bus=LocalBus(peers))
+    worker_b = TieredCache(l2, ttl=60, maxsize=10, bus=LocalBus(peers))
+
+    async def run():
+        await worker_a.set("k", {"v": 1}, exp=60)
+        first = await worker_b.get("k")  # L2 -> L1 воркера B
+        await worker_a.set("k", {"v": 2}, exp=60)
+        return first, await worker_b.get("k")
+
+    first, second = asyncio.run(run())
+
+    assert first == {"v": 1} and second == {"v": 2}
+    assert worker_b.stats()["l2_hits"] == 2
+    assert worker_b.stats()["l1_hits"] == 0
+
+
+def test_tiered_cache_get_many_fills_l1():
+    l2 = DictCache()
+    cache = TieredCache(l2, ttl=60, maxsize=10, bus=None)
+
+    async def run():
+        await l2.set("a", {"x": 1}, exp=60)
+        await cache.get("a")
+        return await cache.get_many(["a", "b"])
+
+    assert asyncio.run(run()) == [{"x": 1}, None]
+    assert cache.stats()["l1_hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+class IdlePubSub:
+    """Канал без повідомлень; як і з'єднання пулу, блокуюче читання падає за socket_timeout."""
+
+    socket_timeout = 0.05
+
+    def __init__(self, subscriptions):
+        self.subscriptions = subscriptions
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def subscribe(self, channel):
+        self.subscriptions.append(channel)
+
+    async def get_message(self, ignore_subscribe_messages=False, timeout=0.0):
+        await asyncio.sleep(min(timeout, self.socket_timeout))
+        return None
+
+    async def listen(self):
+        await asyncio.sleep(self.socket_timeout)
+        raise TimeoutError("Timeout reading from redis")
+        yield
+
+
+def test_idle_invalidation_channel_keeps_l1(monkeypatch):
+    subscriptions = []
+    redis = type(
+        "Redis", (), {"pubsub": lambda self, **kw: IdlePubSub(subscriptions)}
+    )()
+    monkeypatch.setattr(cache_manager, "get_redis", lambda: redis)
+    bus = InvalidationBus(poll_timeout=0.01)
+    cache = TieredCache(DictCache(), ttl=60, maxsize=10, bus=bus)
+
+    async def run():
+        listener = asyncio.create_task(bus.listen())
+        await asyncio.sleep(0.02)
+        cache.l1.set("k", {"v": 1})
+        await asyncio.sleep(0.3)  # кілька socket_timeout без повідомлень
+        connected = bus.connected
+        listener.cancel()
+        return connected
+
+    assert asyncio.run(run()) is True
+    assert cache.l1.get("k") == {"v": 1}
+    assert subscriptions == [bus.channel]
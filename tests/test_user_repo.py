@@ -37,24 +37,28 @@ def mock_users():
         mock_user.is_activate = i != 2
         mock_user.is_locked = i == 2
         mock_user.role_id = 1
+        mock_user.auth_type = "local"
         mock_user.hash_password = f"hashed_password_{i+1}"
 
         mock_user.role = MagicMock()
         mock_user.token = MagicMock()
         mock_user.address = MagicMock()
 
+        # ключі — як у utils.row_mapper: назви колонок UserModel
         mock_user.to_dict = MagicMock(
             return_value={
                 "id": user_id,
+                "auth_type": mock_user.auth_type,
                 "username": f"user{i+1}",
                 "email": f"user{i+1}@example.com",
                 "fullname": f"User {i+1}",
                 "phone": f"123456789{i}",
                 "birth_date": mock_user.birth_date,
                 "created_at": mock_user.created_at,
-                "update_at": mock_user.updated_at,
+                "updated_at": mock_user.updated_at,
                 "is_activate": mock_user.is_activate,
                 "is_locked": mock_user.is_locked,
+                "role_id": mock_user.role_id,
             }
         )
 